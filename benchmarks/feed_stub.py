@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import argparse
+import threading
+import time
+from datetime import date
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.synthetic import article_html, arxiv_abs_html, arxiv_atom_xml, arxiv_id_list_xml, rss_feed_xml
+
+
+class FeedStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int, run_date: date, entries_per_feed: int, latency_ms: float, arxiv_total: int = 60):
+        super().__init__(("127.0.0.1", port), _FeedHandler)
+        self.run_date = run_date
+        self.entries_per_feed = entries_per_feed
+        self.latency_ms = latency_ms
+        self.arxiv_total = arxiv_total
+        self.requests_served = 0
+        self.bytes_served = 0
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def feed_urls(self, n: int) -> list[str]:
+        return [f"{self.base_url}/feeds/{i}.xml" for i in range(n)]
+
+    def article_urls(self, n: int) -> list[str]:
+        return [f"{self.base_url}/articles/{i}.html" for i in range(n)]
+
+    def record(self, size: int) -> None:
+        with self._lock:
+            self.requests_served += 1
+            self.bytes_served += size
+
+
+@lru_cache(maxsize=256)
+def _rss(feed_index: int, entries: int, run_date: date) -> bytes:
+    return rss_feed_xml(feed_index, entries, run_date)
+
+
+@lru_cache(maxsize=256)
+def _arxiv(query: str, start: int, max_results: int, run_date: date, total: int) -> bytes:
+    return arxiv_atom_xml(query, start, max_results, run_date, total=total)
+
+
+class _FeedHandler(BaseHTTPRequestHandler):
+    server: FeedStubServer
+
+    def log_message(self, format: str, *args: object) -> None:
+        return
+
+    def do_GET(self) -> None:
+        parsed = urlparse(self.path)
+        if self.server.latency_ms > 0:
+            time.sleep(self.server.latency_ms / 1000.0)
+        if parsed.path.startswith("/feeds/") and parsed.path.endswith(".xml"):
+            try:
+                idx = int(parsed.path[len("/feeds/") : -len(".xml")])
+            except ValueError:
+                self.send_error(404)
+                return
+            body = _rss(idx, self.server.entries_per_feed, self.server.run_date)
+            content_type = "application/rss+xml; charset=utf-8"
+        elif parsed.path == "/api/query":
+            qs = parse_qs(parsed.query)
+            ids = [x for x in (qs.get("id_list") or [""])[0].split(",") if x]
+            query = (qs.get("search_query") or [""])[0].split(" AND submittedDate:")[0]
+            start = int((qs.get("start") or ["0"])[0])
+            max_results = int((qs.get("max_results") or ["25"])[0])
+            if ids:
+                body = arxiv_id_list_xml(ids, self.server.run_date)
+            else:
+                body = _arxiv(query, start, max_results, self.server.run_date, self.server.arxiv_total)
+            content_type = "application/atom+xml; charset=utf-8"
+        elif parsed.path.startswith("/articles/") and parsed.path.endswith(".html"):
+            try:
+                idx = int(parsed.path[len("/articles/") : -len(".html")])
+            except ValueError:
+                self.send_error(404)
+                return
+            body = article_html(idx)
+            content_type = "text/html; charset=utf-8"
+        elif parsed.path.startswith("/abs/"):
+            body = arxiv_abs_html(parsed.path[len("/abs/") :])
+            content_type = "text/html; charset=utf-8"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.record(len(body))
+
+
+def start_feed_stub(
+    run_date: date,
+    entries_per_feed: int = 30,
+    latency_ms: float = 0.0,
+    port: int = 0,
+    arxiv_total: int = 60,
+) -> FeedStubServer:
+    server = FeedStubServer(port, run_date, entries_per_feed, latency_ms, arxiv_total)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve synthetic RSS and arXiv feeds for ingest benchmarks")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--entries-per-feed", type=int, default=30)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--date", dest="run_date", default=date.today().isoformat())
+    args = parser.parse_args()
+    server = FeedStubServer(args.port, date.fromisoformat(args.run_date), args.entries_per_feed, args.latency_ms)
+    print(
+        f"Serving synthetic feeds at {server.base_url}/feeds/<n>.xml and {server.base_url}/api/query, "
+        f"pages at {server.base_url}/articles/<n>.html and {server.base_url}/abs/<id>"
+    )
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
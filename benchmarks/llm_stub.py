@@ -0,0 +1,389 @@
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+
+STUB_DRAFT = """Most eval dashboards measure the wrong failure surface.
+
+Teams report aggregate benchmark gains while the deployment constraints that matter stay unmeasured.
+
+Technical anchor: the metric definition excludes tool-call failures, so error bars hide regression under distribution shift.
+
+Systems implication: incentives reward launch speed, so governance reviews inherit an optimistic threat model.
+
+Judgment: treat the result as a hypothesis until it reproduces under your own monitoring and boundary conditions.
+
+Prompt question: Which assumption in your eval stack would fail first?
+"""
+
+STUB_SECTIONS = dict(
+    zip(
+        ["hook", "body", "technical_anchor", "systems_implication", "judgment", "prompt_question"],
+        STUB_DRAFT.strip().split("\n\n"),
+    )
+)
+
+STUB_JSON: dict[str, Any] = {
+    "scores": {"systems_strategic": 4, "technical_rigor": 4, "clarity": 4, "novelty": 3},
+    "hard_gates": {
+        "has_technical_anchor": True,
+        "has_systems_implication": True,
+        "has_evaluative_judgment": True,
+        "hype_or_vague": False,
+        "ungrounded_factual_claims": False,
+        "too_academic_summary": False,
+        "too_influencer_style": False,
+    },
+    "classification": {"pillar": "insight_thinking", "hook_type": "contrarian", "themes": ["evaluations"]},
+    "pass_fail": {"passes": True, "reasons": []},
+    "revision_notes": {"top_3_fixes": [], "line_edits": [], "missing_elements": []},
+    "tracking": {
+        "one_sentence_summary": "Eval dashboards miss deployment failure surfaces.",
+        "key_claims": ["Aggregate benchmark gains hide tool-call failures."],
+        "systems_implications": ["Governance inherits optimistic threat models."],
+        "technical_anchors": ["Metric definition excludes tool-call failures."],
+        "repeated_phrases_candidates": [],
+    },
+    "reasoning_trace": [],
+    "sources": [{"title": "Synthetic source", "url": "https://example.test/source", "id": "stub:1"}],
+    "evidence": [{"source_id": "stub:1", "snippet": "Synthetic evidence snippet.", "note": "stub"}],
+    "confidence": "medium",
+    "risk_flags": [],
+}
+
+STUB_REFERENCE_ITEM: dict[str, Any] = {
+    "evidence": [{"snippet": "Synthetic evidence snippet.", "note": "stub"}],
+    "confidence": "medium",
+    "risk_flags": ["eval_unclear"],
+}
+
+
+def _fit_schema(value: Any, schema: dict[str, Any]) -> Any:
+    properties = schema.get("properties")
+    if not isinstance(value, dict) or not properties:
+        return value
+    return {key: _fit_schema(value[key], properties[key]) for key in properties if key in value}
+
+
+class LLMStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        port: int,
+        ttft_ms: float,
+        per_token_ms: float,
+        max_batch: int,
+        batch_penalty: float,
+        fail_every: int = 0,
+        scores: dict[str, int] | None = None,
+        prefill_ms_per_token: float = 0.0,
+        kv_capacity_tokens: int = 0,
+        max_waiting: int = 0,
+        reserve_max_tokens: bool = False,
+    ):
+        super().__init__(("127.0.0.1", port), _LLMHandler)
+        self.reserve_max_tokens = reserve_max_tokens
+        self.prefill_ms_per_token = prefill_ms_per_token
+        self.kv_capacity_tokens = kv_capacity_tokens
+        self.max_waiting = max_waiting
+        self.kv_tokens = 0
+        self.preemptions = 0
+        self.rejected = 0
+        self.ttft_sum = 0.0
+        self.ttft_count = 0
+        self.ttft_ms = ttft_ms
+        self.per_token_ms = per_token_ms
+        self.max_batch = max(1, max_batch)
+        self.batch_penalty = batch_penalty
+        self.fail_every = fail_every
+        self.stub_json = {**STUB_JSON, "scores": {**STUB_JSON["scores"], **(scores or {})}}
+        self.slots = threading.BoundedSemaphore(self.max_batch)
+        self._lock = threading.Lock()
+        self._kv_free = threading.Condition(self._lock)
+        self.active = 0
+        self.waiting = 0
+        self.received = 0
+        self.requests_served = 0
+        self.completion_tokens = 0
+        self.peak_active = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "requests_served": self.requests_served,
+                "completion_tokens": self.completion_tokens,
+                "active": self.active,
+                "waiting": self.waiting,
+                "peak_active": self.peak_active,
+                "preemptions": self.preemptions,
+                "rejected": self.rejected,
+                "mean_ttft_ms": round(1000.0 * self.ttft_sum / self.ttft_count, 3) if self.ttft_count else 0.0,
+            }
+
+    def prometheus(self) -> str:
+        with self._lock:
+            rows = {
+                "vllm:num_requests_running": self.active,
+                "vllm:num_requests_waiting": self.waiting,
+                "vllm:num_preemptions_total": self.preemptions,
+                "vllm:gpu_cache_usage_perc": (
+                    self.kv_tokens / self.kv_capacity_tokens if self.kv_capacity_tokens else 0.0
+                ),
+                "vllm:time_to_first_token_seconds_sum": self.ttft_sum,
+                "vllm:time_to_first_token_seconds_count": self.ttft_count,
+            }
+        return "".join(f'{name}{{model_name="stub-model"}} {value}\n' for name, value in rows.items())
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+class _LLMHandler(BaseHTTPRequestHandler):
+    server: LLMStubServer
+
+    def log_message(self, format: str, *args: object) -> None:
+        return
+
+    def _send_json(self, status: int, data: Any) -> None:
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/") == "/v1/models":
+            self._send_json(200, {"object": "list", "data": [{"id": "stub-model", "object": "model"}]})
+        elif self.path.rstrip("/") == "/stats":
+            self._send_json(200, self.server.stats())
+        elif self.path.rstrip("/") == "/metrics":
+            body = self.server.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self.send_error(404)
+
+    def do_POST(self) -> None:
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            self.send_error(404)
+            return
+        length = int(self.headers.get("Content-Length", "0"))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        server = self.server
+        arrived = time.perf_counter()
+
+        with server._lock:
+            server.received += 1
+            seq = server.received
+            overloaded = bool(server.max_waiting) and server.waiting >= server.max_waiting
+            if overloaded:
+                server.rejected += 1
+            else:
+                server.waiting += 1
+        if overloaded or (server.fail_every and seq % server.fail_every == 0):
+            if not overloaded:
+                with server._lock:
+                    server.waiting -= 1
+            self._send_json(503, {"error": "simulated overload"})
+            return
+
+        prompt_tokens = sum(_estimate_tokens(str(m.get("content", ""))) for m in payload.get("messages", []))
+        content = self._content_for(payload)
+        max_tokens = int(payload.get("max_tokens", 256))
+        completion_tokens = min(max_tokens, _estimate_tokens(content))
+        finish_reason = "stop"
+        if completion_tokens < _estimate_tokens(content):
+            content = content[: max_tokens * 4]
+            finish_reason = "length"
+        stream = bool(payload.get("stream"))
+        with server.slots:
+            reserved = prompt_tokens + (max_tokens if server.reserve_max_tokens else completion_tokens)
+            with server._kv_free:
+                while (
+                    server.reserve_max_tokens
+                    and server.active
+                    and server.kv_tokens + reserved > server.kv_capacity_tokens
+                ):
+                    server._kv_free.wait()
+                server.waiting -= 1
+                server.active += 1
+                server.peak_active = max(server.peak_active, server.active)
+                active = server.active
+                server.kv_tokens += reserved
+                preempted = bool(server.kv_capacity_tokens) and server.kv_tokens > server.kv_capacity_tokens
+                if preempted:
+                    server.preemptions += 1
+            try:
+                prefill_ms = server.ttft_ms + server.prefill_ms_per_token * prompt_tokens * (2.0 if preempted else 1.0)
+                time.sleep(prefill_ms / 1000.0)
+                ttft = time.perf_counter() - arrived
+                with server._lock:
+                    server.ttft_sum += ttft
+                    server.ttft_count += 1
+                if stream:
+                    self._start_stream()
+                    self._send_chunk(seq, payload, {"role": "assistant", "content": content[:4]}, None)
+                step_ms = server.per_token_ms * (1.0 + server.batch_penalty * (active - 1))
+                if preempted:
+                    step_ms *= 3.0
+                time.sleep(step_ms * completion_tokens / 1000.0)
+            finally:
+                with server._kv_free:
+                    server.active -= 1
+                    server.kv_tokens -= reserved
+                    server.requests_served += 1
+                    server.completion_tokens += completion_tokens
+                    server._kv_free.notify_all()
+
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        if stream:
+            self._send_chunk(seq, payload, {"content": content[4:]}, finish_reason)
+            self._send_chunk(seq, payload, None, None, usage)
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+            return
+        self._send_json(
+            200,
+            {
+                "id": f"stub-{seq}",
+                "object": "chat.completion",
+                "model": payload.get("model", "stub-model"),
+                "choices": [
+                    {"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": finish_reason}
+                ],
+                "usage": usage,
+            },
+        )
+
+    def _start_stream(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+
+    def _send_chunk(
+        self,
+        seq: int,
+        payload: dict[str, Any],
+        delta: dict[str, Any] | None,
+        finish_reason: str | None,
+        usage: dict[str, int] | None = None,
+    ) -> None:
+        chunk: dict[str, Any] = {
+            "id": f"stub-{seq}",
+            "object": "chat.completion.chunk",
+            "model": payload.get("model", "stub-model"),
+            "choices": [] if delta is None else [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        if usage is not None:
+            chunk["usage"] = usage
+        self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        self.wfile.flush()
+
+    def _content_for(self, payload: dict[str, Any]) -> str:
+        if payload.get("response_format") is not None or payload.get("guided_json") is not None:
+            user = str((payload.get("messages") or [{}])[-1].get("content", ""))
+            keys = re.findall(r"^- key: (\S+)$", user, flags=re.MULTILINE)
+            sections = re.findall(r"^- section: (\S+)$", user, flags=re.MULTILINE)
+            if sections:
+                revised = {name: STUB_SECTIONS.get(name, STUB_SECTIONS["body"]) for name in sections}
+                return json.dumps({"sections": revised})
+            if keys:
+                return json.dumps({"items": [{"key": key, **STUB_REFERENCE_ITEM} for key in keys]})
+            schema = payload.get("guided_json") or ((payload.get("response_format") or {}).get("json_schema") or {})
+            return json.dumps(_fit_schema(self.server.stub_json, schema.get("schema", schema)))
+        return STUB_DRAFT
+
+
+def start_llm_stub(
+    ttft_ms: float = 20.0,
+    per_token_ms: float = 0.2,
+    max_batch: int = 8,
+    batch_penalty: float = 0.02,
+    port: int = 0,
+    fail_every: int = 0,
+    scores: dict[str, int] | None = None,
+    prefill_ms_per_token: float = 0.0,
+    kv_capacity_tokens: int = 0,
+    max_waiting: int = 0,
+    reserve_max_tokens: bool = False,
+) -> LLMStubServer:
+    server = LLMStubServer(
+        port,
+        ttft_ms,
+        per_token_ms,
+        max_batch,
+        batch_penalty,
+        fail_every,
+        scores,
+        prefill_ms_per_token,
+        kv_capacity_tokens,
+        max_waiting,
+        reserve_max_tokens,
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub LLM server with simulated latency/batching")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--ttft-ms", type=float, default=20.0, help="Simulated time to first token.")
+    parser.add_argument("--per-token-ms", type=float, default=0.2, help="Simulated decode time per token.")
+    parser.add_argument("--max-batch", type=int, default=8, help="Concurrent sequences before requests queue.")
+    parser.add_argument("--batch-penalty", type=float, default=0.02, help="Per-extra-sequence decode slowdown.")
+    parser.add_argument("--fail-every", type=int, default=0, help="Return 503 for every Nth request (0 disables).")
+    parser.add_argument(
+        "--prefill-ms-per-token", type=float, default=0.0, help="Simulated prefill time per prompt token."
+    )
+    parser.add_argument(
+        "--kv-capacity-tokens",
+        type=int,
+        default=0,
+        help="Running prompt+completion tokens before sequences get preempted (0 disables).",
+    )
+    parser.add_argument("--max-waiting", type=int, default=0, help="Queue depth that triggers 503s (0 disables).")
+    parser.add_argument(
+        "--reserve-max-tokens",
+        action="store_true",
+        help="Admit sequences only when prompt+max_tokens fits in --kv-capacity-tokens (worst-case reservation).",
+    )
+    args = parser.parse_args()
+    server = LLMStubServer(
+        args.port,
+        args.ttft_ms,
+        args.per_token_ms,
+        args.max_batch,
+        args.batch_penalty,
+        args.fail_every,
+        None,
+        args.prefill_ms_per_token,
+        args.kv_capacity_tokens,
+        args.max_waiting,
+        args.reserve_max_tokens,
+    )
+    print(f"Stub LLM serving at {server.base_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,634 @@
+from __future__ import annotations
+
+import argparse
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable
+
+import yaml
+
+from benchmarks.feed_stub import start_feed_stub
+from benchmarks.llm_stub import STUB_DRAFT, start_llm_stub
+from benchmarks.synthetic import draft_markdown, generate_topics, write_topic_corpus
+from src.common import config as config_layer
+from src.common.budget import TokenBudget, reservation_report
+from src.common.io import read_json, read_jsonl, read_yaml, write_json, write_yaml
+from src.common.llm import LLMClient, LLMRouter
+from src.common.topic import Topic
+from src.draft.references import build_references
+from src.enrich.pipeline import enrich_topics
+from src.common.tracing import reset_tracer
+from src.evaluate.pipeline import (
+    quality_gate,
+    revise_draft_with_llm,
+    revise_sections_with_llm,
+    score_draft_with_llm,
+    score_sections_with_llm,
+)
+from src.memory.archive import ArchiveIndex
+from src.memory.digest import digest_text
+from src.ingest.pipeline import run_ingest
+from src.plan.pipeline import build_week_plan
+from src.rank.pipeline import filter_and_rank
+from src.run_weekly import main as run_weekly_main
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RUN_DATE = date(2026, 2, 16)
+ALL_BENCHMARKS = [
+    "ingest",
+    "enrich",
+    "rank",
+    "plan",
+    "gate",
+    "routing",
+    "concurrency",
+    "max_tokens",
+    "config",
+    "archive",
+    "pipeline",
+]
+
+
+def _measure(fn: Callable[[], Any], repeat: int) -> dict[str, Any]:
+    timings = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000.0)
+    return _summarize(timings)
+
+
+def _summarize(timings: list[float]) -> dict[str, Any]:
+    return {
+        "runs": len(timings),
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "max_ms": round(max(timings), 3),
+    }
+
+
+def _user_cfg() -> dict[str, Any]:
+    return read_yaml(REPO_ROOT / "config" / "user_profile.yaml")
+
+
+def _content_log() -> list[dict[str, Any]]:
+    return read_jsonl(REPO_ROOT / "state" / "content_log.jsonl")
+
+
+def _stub_sources_cfg(feed_base: str, feed_urls: list[str]) -> dict[str, Any]:
+    sources = read_yaml(REPO_ROOT / "config" / "sources.yaml")
+    sources.setdefault("arxiv", {})["api_url"] = f"{feed_base}/api/query"
+    sources["arxiv"]["request_interval_seconds"] = 0
+    sources.setdefault("rss", {})["feeds"] = feed_urls
+    return sources
+
+
+def bench_ingest(args: argparse.Namespace, work: Path) -> dict[str, dict[str, Any]]:
+    server = start_feed_stub(RUN_DATE, entries_per_feed=args.entries_per_feed, latency_ms=args.feed_latency_ms)
+    try:
+        sources = _stub_sources_cfg(server.base_url, server.feed_urls(args.feeds))
+        user_cfg = _user_cfg()
+        raw_dir = work / "ingest_raw"
+        raw_dir.mkdir(parents=True, exist_ok=True)
+        result = _measure(lambda: run_ingest(str(raw_dir), RUN_DATE, sources, user_cfg), args.repeat)
+        result["params"] = {
+            "feeds": args.feeds,
+            "entries_per_feed": args.entries_per_feed,
+            "feed_latency_ms": args.feed_latency_ms,
+        }
+        return {f"ingest[feeds={args.feeds}]": result}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def bench_enrich(args: argparse.Namespace, work: Path) -> dict[str, dict[str, Any]]:
+    server = start_feed_stub(RUN_DATE, entries_per_feed=args.entries_per_feed, latency_ms=args.feed_latency_ms)
+    try:
+        enrich_cfg = dict(read_yaml(REPO_ROOT / "config" / "sources.yaml").get("enrich") or {})
+        enrich_cfg["enabled"] = True
+        enrich_cfg["use_llm"] = False
+        topics = [Topic(id=f"t{i}", url=url) for i, url in enumerate(server.article_urls(enrich_cfg.get("top_k", 10)))]
+        out: dict[str, dict[str, Any]] = {}
+        for label, warm in (("cold", False), ("warm", True)):
+            cache_dir = work / f"enrich_cache_{label}"
+            if warm:
+                enrich_topics(topics, enrich_cfg, cache_dir)
+
+            def run() -> None:
+                if not warm:
+                    shutil.rmtree(cache_dir, ignore_errors=True)
+                enrich_topics(topics, enrich_cfg, cache_dir)
+
+            result = _measure(run, args.repeat)
+            result["params"] = {"topics": len(topics), "feed_latency_ms": args.feed_latency_ms}
+            out[f"enrich[cache={label}]"] = result
+        return out
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def bench_rank(args: argparse.Namespace, work: Path) -> dict[str, dict[str, Any]]:
+    user_cfg = _user_cfg()
+    content_log = _content_log()
+    out: dict[str, dict[str, Any]] = {}
+    for n in args.sizes:
+        corpus_dir = work / f"corpus_{n}"
+        raw_paths = write_topic_corpus(corpus_dir, n, RUN_DATE)
+        result = _measure(
+            lambda: filter_and_rank(
+                raw_paths=raw_paths,
+                content_log=content_log,
+                user_cfg=user_cfg,
+                run_date=RUN_DATE,
+                out_topics_path=work / "rank_out" / "filtered_topics.jsonl",
+                report_path=work / "rank_out" / "filter_report.md",
+            ),
+            args.repeat,
+        )
+        result["params"] = {"entries": n}
+        out[f"rank[n={n}]"] = result
+    return out
+
+
+def bench_plan(args: argparse.Namespace, work: Path) -> dict[str, dict[str, Any]]:
+    user_cfg = _user_cfg()
+    content_log = _content_log()
+    raw_paths = write_topic_corpus(work / "plan_corpus", 5000, RUN_DATE)
+    topics = filter_and_rank(
+        raw_paths=raw_paths,
+        content_log=content_log,
+        user_cfg=user_cfg,
+        run_date=RUN_DATE,
+        out_topics_path=work / "plan_out" / "filtered_topics.jsonl",
+        report_path=work / "plan_out" / "filter_report.md",
+    )
+    result = _measure(
+        lambda: build_week_plan(
+            week_label="2026-W08",
+            run_date=RUN_DATE,
+            topics=topics,
+            user_cfg=user_cfg,
+            content_log=content_log,
+            out_path=work / "plan_out" / "plan.md",
+        ),
+        args.repeat * 10,
+    )
+    result["params"] = {"topics": len(topics), "cadence": int(user_cfg.get("cadence", 2))}
+    return {"plan": result}
+
+
+def bench_gate(args: argparse.Namespace, work: Path) -> dict[str, dict[str, Any]]:
+    rubric_cfg = read_yaml(REPO_ROOT / "config" / "rubric.yaml")
+    references = {"sources": [{"title": "t", "url": "https://example.test", "id": "x"}], "evidence": []}
+    history = [digest_text(STUB_DRAFT)] * 10
+    draft_path = work / "gate" / "post_01.md"
+    draft_path.parent.mkdir(parents=True, exist_ok=True)
+
+    def run(client: LLMClient | None, model_cfg: dict[str, Any] | None) -> None:
+        draft_path.write_text(STUB_DRAFT, encoding="utf-8")
+        quality_gate(draft_path, references, rubric_cfg, ["game-changer"], history, client, model_cfg)
+
+    out = {"gate[heuristic]": _measure(lambda: run(None, None), args.repeat * 10)}
+    rubric_cfg = {**rubric_cfg, "tiered_gate": {**(rubric_cfg.get("tiered_gate") or {}), "enabled": True}}
+    server = start_llm_stub(ttft_ms=args.llm_ttft_ms, per_token_ms=args.llm_per_token_ms, max_batch=args.llm_max_batch)
+    try:
+        model_cfg = read_yaml(REPO_ROOT / "config" / "model.yaml")
+        model_cfg["api_base"] = server.base_url
+        client = LLMClient(model_cfg)
+        result = _measure(lambda: run(client, model_cfg), args.repeat)
+        result["params"] = {"llm_ttft_ms": args.llm_ttft_ms, "llm_per_token_ms": args.llm_per_token_ms}
+        out["gate[llm_stub]"] = result
+        always_judge = {"enabled": True, "heuristic_pass_margin": None, "speculative_revision": True}
+        rubric_cfg = {**rubric_cfg, "tiered_gate": always_judge}
+        result = _measure(lambda: run(client, model_cfg), args.repeat)
+        result["params"] = {"llm_ttft_ms": args.llm_ttft_ms, "llm_per_token_ms": args.llm_per_token_ms}
+        out["gate[llm_stub,always_judge]"] = result
+
+        reasons = ["technical_rigor_below_threshold"]
+        judged = score_draft_with_llm(STUB_DRAFT, references, rubric_cfg, [], history, client, model_cfg)
+
+        def full_cycle() -> None:
+            revised = revise_draft_with_llm(STUB_DRAFT, reasons, client, model_cfg)
+            score_draft_with_llm(revised, references, rubric_cfg, [], history, client, model_cfg)
+
+        def section_cycle() -> None:
+            revised = revise_sections_with_llm(STUB_DRAFT, {"technical_anchor"}, reasons, client, model_cfg)
+            score_sections_with_llm(
+                revised, {"technical_anchor"}, judged, references, rubric_cfg, [], history, client, model_cfg
+            )
+
+        for label, cycle in (("full", full_cycle), ("sections", section_cycle)):
+            tracer = reset_tracer()
+            result = _measure(cycle, args.repeat)
+            cycles = max(1, args.repeat)
+            result["params"] = {
+                "prompt_tokens_per_cycle": round(tracer.counters.get("llm.prompt_tokens", 0) / cycles),
+                "completion_tokens_per_cycle": round(tracer.counters.get("llm.completion_tokens", 0) / cycles),
+            }
+            out[f"gate[revise_rescore,{label}]"] = result
+    finally:
+        server.shutdown()
+        server.server_close()
+    return out
+
+
+def bench_routing(args: argparse.Namespace, work: Path) -> dict[str, dict[str, Any]]:
+    rubric_cfg = read_yaml(REPO_ROOT / "config" / "rubric.yaml")
+    always_judge = {"enabled": True, "heuristic_pass_margin": None, "speculative_revision": False}
+    rubric_cfg = {**rubric_cfg, "tiered_gate": always_judge}
+    references = {"sources": [{"title": "t", "url": "https://example.test", "id": "x"}], "evidence": []}
+    topics = [Topic.from_dict(row) for row in generate_topics(16, RUN_DATE)]
+    draft_path = work / "routing" / "post_01.md"
+    draft_path.parent.mkdir(parents=True, exist_ok=True)
+    large = start_llm_stub(ttft_ms=args.llm_ttft_ms, per_token_ms=args.llm_per_token_ms * 4, max_batch=2)
+    confident = {"systems_strategic": 5, "technical_rigor": 5, "clarity": 5, "novelty": 5}
+    small = [
+        start_llm_stub(ttft_ms=args.llm_ttft_ms / 4, per_token_ms=args.llm_per_token_ms, scores=confident)
+        for _ in range(2)
+    ]
+    servers = [large, *small]
+    model_cfg = read_yaml(REPO_ROOT / "config" / "model.yaml")
+    model_cfg["api_base"] = large.base_url
+
+    def run(client: Any) -> None:
+        build_references(topics, client, model_cfg)
+        for _ in range(4):
+            draft_path.write_text(STUB_DRAFT, encoding="utf-8")
+            quality_gate(draft_path, references, rubric_cfg, ["game-changer"], [], client, model_cfg)
+
+    out = {}
+    try:
+        out["routing[single_large]"] = _measure(lambda: run(LLMClient(model_cfg)), args.repeat)
+        model_cfg["routing"] = {
+            "tiers": {"small": {"endpoints": [s.base_url for s in small]}, "large": {}},
+            "call_types": {"references": "small", "score": "small", "score_sections": "small"},
+        }
+        router = LLMRouter(model_cfg, seed=7)
+        tracer = reset_tracer()
+        result = _measure(lambda: run(router), args.repeat)
+        result["params"] = {
+            "endpoint_requests": [s.stats()["requests_served"] for s in servers],
+            "escalations": int(tracer.counters.get("llm.escalations", 0)),
+        }
+        out["routing[cascade]"] = result
+        small[1].shutdown()
+        small[1].server_close()
+        tracer = reset_tracer()
+        result = _measure(lambda: run(router), args.repeat)
+        result["params"] = {
+            "failovers": int(tracer.counters.get("llm.router.failovers", 0)),
+            "tier_fallbacks": int(tracer.counters.get("llm.router.tier_fallbacks", 0)),
+        }
+        out["routing[cascade,one_small_down]"] = result
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+    return out
+
+
+def bench_concurrency(args: argparse.Namespace, work: Path) -> dict[str, dict[str, Any]]:
+    score_prompt = "Score this draft against the rubric. " + STUB_DRAFT * 12
+    draft_prompt = "Write one post about evaluation drift."
+    calls = [("score", score_prompt, 120) if i % 2 else ("draft", draft_prompt, 400) for i in range(96)]
+    base_cfg = read_yaml(REPO_ROOT / "config" / "model.yaml")
+    variants = {
+        "fixed_32": {"adaptive": False},
+        "fixed_4": {"adaptive": False},
+        "aimd": {"adaptive": True, "initial": 4, "min": 1, "max": 32, "metrics_interval_seconds": 0.2},
+    }
+    out = {}
+    for label, concurrency in variants.items():
+        server = start_llm_stub(
+            ttft_ms=args.llm_ttft_ms,
+            per_token_ms=args.llm_per_token_ms,
+            max_batch=args.llm_max_batch,
+            batch_penalty=0.05,
+            prefill_ms_per_token=0.05,
+            kv_capacity_tokens=args.llm_max_batch * 1200,
+            max_waiting=args.llm_max_batch,
+        )
+        client = LLMClient({**base_cfg, "api_base": server.base_url, "max_retries": 3, "concurrency": concurrency})
+        workers = 4 if label == "fixed_4" else 32
+
+        def call(item: tuple[str, str, int]) -> bool:
+            call_type, prompt, max_tokens = item
+            try:
+                client.chat_completion(
+                    system_prompt="stub",
+                    user_prompt=prompt,
+                    temperature=0.0,
+                    max_tokens=max_tokens,
+                    call_type=call_type,
+                )
+                return True
+            except Exception:
+                return False
+
+        tracer = reset_tracer()
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                ok = sum(pool.map(call, calls))
+            wall_ms = (time.perf_counter() - start) * 1000.0
+            stats = server.stats()
+        finally:
+            server.shutdown()
+            server.server_close()
+        result = _summarize([wall_ms])
+        result["params"] = {
+            "requests": len(calls),
+            "failed": len(calls) - ok,
+            "retries": int(tracer.counters.get("llm.retries", 0)),
+            "rejected_503": stats["rejected"],
+            "preemptions": stats["preemptions"],
+            "server_mean_ttft_ms": stats["mean_ttft_ms"],
+            "peak_active": stats["peak_active"],
+        }
+        if client.controller is not None:
+            result["params"]["final_limit"] = client.controller.summary()["limit"]
+            result["params"]["decisions"] = [
+                {k: e[k] for k in ("action", "reason", "limit")} for e in tracer.events if e["name"] == "llm.aimd"
+            ]
+        out[f"concurrency[{label}]"] = result
+    return out
+
+
+def _make_workspace(work: Path, feed_base: str, feed_urls: list[str], llm_base: str) -> Path:
+    root = work / "workspace"
+    if root.exists():
+        shutil.rmtree(root)
+    (root / "config").mkdir(parents=True)
+    for name in ["user_profile.yaml", "rubric.yaml"]:
+        shutil.copy(REPO_ROOT / "config" / name, root / "config" / name)
+    write_yaml(root / "config" / "sources.yaml", _stub_sources_cfg(feed_base, feed_urls))
+    model_cfg = read_yaml(REPO_ROOT / "config" / "model.yaml")
+    model_cfg.update({"runner_mode": "self_hosted", "backend": "vllm", "api_base": llm_base, "require_live_llm": True})
+    write_yaml(root / "config" / "model.yaml", model_cfg)
+    shutil.copytree(REPO_ROOT / "state", root / "state")
+    return root
+
+
+def bench_archive(args: argparse.Namespace, work: Path) -> dict[str, dict[str, Any]]:
+    weeks, drafts_per_week, topics_per_week = 260, 2, 30
+    topics = generate_topics(weeks * topics_per_week, RUN_DATE)
+    root = work / "archive_index"
+    appends = []
+    with ArchiveIndex(root) as index:
+        for week in range(weeks):
+            label = f"{2021 + week // 52}-W{week % 52 + 1:02d}"
+            docs = [
+                {"key": f"weekly/{label}/drafts/post_{i + 1:02d}.md", "kind": "draft", "week": label,
+                 "text": draft_markdown(week * drafts_per_week + i)}
+                for i in range(drafts_per_week)
+            ]
+            for _ in range(topics_per_week):
+                row = next(topics)
+                docs.append({"key": row["id"], "kind": "topic", "week": label, "title": row["title"],
+                             "text": f"{row['title']} {row['summary']}"})
+            start = time.perf_counter()
+            index.add(docs)
+            appends.append((time.perf_counter() - start) * 1000.0)
+    queries = ["agent security threat model", "evaluation benchmark failure mode", "governance incentive deployment"]
+    draft = draft_markdown(10**6)
+
+    def cold_search() -> None:
+        with ArchiveIndex(root) as fresh:
+            fresh.search(queries[0], kind="draft")
+
+    out = {"archive[append_week]": _summarize(appends), "archive[open+search]": _measure(cold_search, 5)}
+    with ArchiveIndex(root) as index:
+        index.search(queries[0])
+        counter = iter(range(10**9))
+        out["archive[search]"] = _measure(lambda: index.search(queries[next(counter) % len(queries)], k=10), 50)
+        out["archive[coverage]"] = _measure(lambda: index.coverage(queries[next(counter) % len(queries)]), 50)
+        out["archive[overlap]"] = _measure(lambda: index.overlap(draft), 50)
+        out["archive[known_phrases]"] = _measure(lambda: index.known_phrases(draft), 50)
+    for result in out.values():
+        result["params"] = {"weeks": weeks, "drafts": weeks * drafts_per_week, "topics": weeks * topics_per_week}
+    return out
+
+
+def bench_max_tokens(args: argparse.Namespace, work: Path) -> dict[str, dict[str, Any]]:
+    calls = [("draft", 900) if i % 2 else ("revision", 700) for i in range(96)]
+    base_cfg = {**read_yaml(REPO_ROOT / "config" / "model.yaml"), "concurrency": {"adaptive": False}}
+    budget_cfg = {"percentile": 0.95, "margin": 0.15, "min_samples": 20}
+    variants: dict[str, float | None] = {"static": None, "adaptive": 1.0, "adaptive,undersized": 0.05}
+    out = {}
+    for label, seed_fraction in variants.items():
+        server = start_llm_stub(
+            ttft_ms=args.llm_ttft_ms,
+            per_token_ms=args.llm_per_token_ms,
+            max_batch=args.llm_max_batch,
+            kv_capacity_tokens=args.llm_max_batch * 400,
+            reserve_max_tokens=True,
+        )
+        budget = None
+        if seed_fraction is not None:
+            budget = TokenBudget(budget_cfg)
+            client = LLMClient({**base_cfg, "api_base": server.base_url}, budget)
+            for call_type, max_tokens in calls[:40]:
+                if seed_fraction < 1.0:
+                    budget.record(f"{client.model}:{call_type}", max_tokens, int(max_tokens * seed_fraction), False)
+                else:
+                    client.chat_completion("stub", "Write one post.", 0.0, max_tokens, call_type=call_type)
+        client = LLMClient({**base_cfg, "api_base": server.base_url}, budget)
+
+        def call(item: tuple[str, int]) -> None:
+            call_type, max_tokens = item
+            client.chat_completion("stub", "Write one post.", 0.0, max_tokens, call_type=call_type)
+
+        tracer = reset_tracer()
+        try:
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=16) as pool:
+                list(pool.map(call, calls))
+            wall_ms = (time.perf_counter() - start) * 1000.0
+            stats = server.stats()
+        finally:
+            server.shutdown()
+            server.server_close()
+        result = _summarize([wall_ms])
+        result["params"] = {
+            "requests": len(calls),
+            "peak_active": stats["peak_active"],
+            **reservation_report(tracer.counters),
+        }
+        out[f"max_tokens[{label}]"] = result
+    return out
+
+
+def bench_config(args: argparse.Namespace, work: Path) -> dict[str, dict[str, Any]]:
+    root = work / "config_bench"
+    shutil.rmtree(root, ignore_errors=True)
+    shutil.copytree(REPO_ROOT / "config", root / "config")
+    cache = root / "state" / config_layer.CACHE_FILE
+    paths = config_layer.config_paths(root)
+
+    def safe_load() -> None:
+        for path in paths.values():
+            yaml.safe_load(path.read_text(encoding="utf-8"))
+
+    def compile_cold() -> None:
+        config_layer.clear_snapshot_cache()
+        cache.unlink(missing_ok=True)
+        config_layer.load_snapshot(root)
+
+    def cached() -> None:
+        config_layer.clear_snapshot_cache()
+        config_layer.load_snapshot(root)
+
+    repeat = max(1, args.repeat) * 10
+    out = {
+        "config[safe_load]": _measure(safe_load, repeat),
+        "config[compile]": _measure(compile_cold, repeat),
+        "config[cached]": _measure(cached, repeat),
+    }
+    config_layer.clear_snapshot_cache()
+    out["config[cached]"]["params"] = {
+        "files": len(paths),
+        "loader": config_layer.YAML_LOADER.__name__,
+        "fingerprint": config_layer.config_fingerprint(config_layer.load_snapshot(root)),
+    }
+    return out
+
+
+def bench_pipeline(args: argparse.Namespace, work: Path) -> dict[str, dict[str, Any]]:
+    feeds = start_feed_stub(RUN_DATE, entries_per_feed=args.entries_per_feed, latency_ms=args.feed_latency_ms)
+    llm = start_llm_stub(ttft_ms=args.llm_ttft_ms, per_token_ms=args.llm_per_token_ms, max_batch=args.llm_max_batch)
+    try:
+        roots: list[Path] = []
+
+        def run() -> None:
+            root = _make_workspace(work, feeds.base_url, feeds.feed_urls(args.feeds), llm.base_url)
+            roots.append(root)
+            code = run_weekly_main(["--date", RUN_DATE.isoformat(), "--root", str(root)])
+            if code != 0:
+                raise RuntimeError(f"run_weekly exited with {code}")
+
+        result = _measure(run, args.repeat)
+        metrics = read_json(roots[-1] / "weekly" / "2026-W08" / "run_metrics.json")
+        result["params"] = {"feeds": args.feeds, "entries_per_feed": args.entries_per_feed}
+        result["run_metrics"] = {"counters": metrics.get("counters", {}), "stages": metrics.get("stages", {})}
+        result["llm_requests"] = llm.stats()["requests_served"]
+        return {"pipeline": result}
+    finally:
+        for server in (feeds, llm):
+            server.shutdown()
+            server.server_close()
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any]) -> list[dict[str, Any]]:
+    rows = []
+    base = baseline.get("benchmarks", {})
+    for name, result in current.get("benchmarks", {}).items():
+        if name not in base:
+            continue
+        old = float(base[name]["median_ms"])
+        new = float(result["median_ms"])
+        rows.append(
+            {
+                "name": name,
+                "baseline_ms": old,
+                "current_ms": new,
+                "speedup": round(old / new, 3) if new else None,
+            }
+        )
+    return rows
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run reproducible pipeline benchmarks against local stubs")
+    parser.add_argument("--only", default=",".join(ALL_BENCHMARKS), help="Comma-separated benchmark names.")
+    parser.add_argument("--sizes", default="1000,10000", help="Synthetic corpus sizes for rank (up to 1000000).")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--feeds", type=int, default=17)
+    parser.add_argument("--entries-per-feed", type=int, default=30)
+    parser.add_argument("--feed-latency-ms", type=float, default=5.0)
+    parser.add_argument("--llm-ttft-ms", type=float, default=20.0)
+    parser.add_argument("--llm-per-token-ms", type=float, default=0.2)
+    parser.add_argument("--llm-max-batch", type=int, default=8)
+    parser.add_argument("--out", default="bench_output.json", help="Where to write the results JSON.")
+    parser.add_argument("--baseline", help="Previous results JSON to compare against.")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=0.0,
+        help="Exit non-zero if any benchmark is slower than baseline by more than this fraction (0 disables).",
+    )
+    args = parser.parse_args(argv)
+    args.sizes = [int(x) for x in str(args.sizes).split(",") if x.strip()]
+    args.only = [x.strip() for x in str(args.only).split(",") if x.strip()]
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    runners = {
+        "ingest": bench_ingest,
+        "enrich": bench_enrich,
+        "rank": bench_rank,
+        "plan": bench_plan,
+        "gate": bench_gate,
+        "routing": bench_routing,
+        "concurrency": bench_concurrency,
+        "max_tokens": bench_max_tokens,
+        "config": bench_config,
+        "archive": bench_archive,
+        "pipeline": bench_pipeline,
+    }
+    results: dict[str, Any] = {
+        "meta": {
+            "git_rev": _git_rev(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "run_date": RUN_DATE.isoformat(),
+            "created_at": round(time.time(), 3),
+        },
+        "benchmarks": {},
+    }
+    with tempfile.TemporaryDirectory(prefix="lmb-bench-") as tmp:
+        work = Path(tmp)
+        for name in args.only:
+            if name not in runners:
+                print(f"Unknown benchmark: {name}")
+                return 2
+            for key, result in runners[name](args, work).items():
+                results["benchmarks"][key] = result
+                print(f"{key:<28} median {result['median_ms']:>10.3f} ms  (min {result['min_ms']:.3f}, runs {result['runs']})")
+
+    code = 0
+    if args.baseline:
+        rows = compare(results, read_json(Path(args.baseline), default={}))
+        results["comparison"] = rows
+        print("")
+        for row in rows:
+            print(f"{row['name']:<28} {row['baseline_ms']:>10.3f} -> {row['current_ms']:>10.3f} ms  x{row['speedup']}")
+            if args.max_regression and row["current_ms"] > row["baseline_ms"] * (1.0 + args.max_regression):
+                code = 1
+
+    write_json(Path(args.out), results)
+    print(f"Results: {args.out}")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
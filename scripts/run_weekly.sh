@@ -4,35 +4,16 @@ set -euo pipefail
 ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 cd "$ROOT_DIR"
 
-RUNNER_MODE="$(python3 - <<'PY'
-import yaml
-from pathlib import Path
-cfg = yaml.safe_load(Path('config/model.yaml').read_text()) or {}
-print(cfg.get('runner_mode', 'hosted'))
-PY
-)"
-BACKEND="$(python3 - <<'PY'
-import yaml
-from pathlib import Path
-cfg = yaml.safe_load(Path('config/model.yaml').read_text()) or {}
-print(cfg.get('backend', ''))
-PY
-)"
-API_BASE="$(python3 - <<'PY'
-import yaml
-from pathlib import Path
-cfg = yaml.safe_load(Path('config/model.yaml').read_text()) or {}
-print(cfg.get('api_base', 'http://127.0.0.1:8000/v1').rstrip('/'))
-PY
-)"
-STARTUP_TIMEOUT_SECONDS="$(python3 - <<'PY'
-import yaml
-from pathlib import Path
-cfg = yaml.safe_load(Path('config/model.yaml').read_text()) or {}
-print(int(cfg.get('startup_timeout_seconds', 900)))
-PY
-)"
-HEALTH_URL="${API_BASE}/models"
+# One validated load of config/*.yaml; the compiled snapshot is cached in state/config_snapshot.json.
+CONFIG_VALUES="$(python3 -m src.common.config get \
+  model.runner_mode model.backend model.manage_server model.api_base model.startup_timeout_seconds)"
+mapfile -t CONFIG <<<"$CONFIG_VALUES"
+RUNNER_MODE="${CONFIG[0]:-hosted}"
+BACKEND="${CONFIG[1]:-}"
+MANAGE_SERVER="${CONFIG[2]:-False}"
+API_BASE="${CONFIG[3]:-http://127.0.0.1:8000/v1}"
+STARTUP_TIMEOUT_SECONDS="${CONFIG[4]:-900}"
+HEALTH_URL="${API_BASE%/}/models"
 STARTED_VLLM=0
 VLLM_PID=""
 
@@ -59,7 +40,7 @@ ensure_vllm_ready() {
   VLLM_PID="$!"
   STARTED_VLLM=1
 
-  checks=$(( STARTUP_TIMEOUT_SECONDS / 2 ))
+  checks=$(( ${STARTUP_TIMEOUT_SECONDS%.*} / 2 ))
   if [[ "$checks" -lt 1 ]]; then
     checks=1
   fi
@@ -80,7 +61,14 @@ ensure_vllm_ready() {
 }
 
 if [[ "$RUNNER_MODE" == "self_hosted" && "${BACKEND,,}" == "vllm" ]]; then
-  ensure_vllm_ready
+  if [[ "$MANAGE_SERVER" == "True" ]]; then
+    # Reuses a warm server registered in state/vllm/; run_weekly holds a lease while it runs and
+    # the idle watchdog stops the server after idle_shutdown_seconds without leases.
+    python3 -m src.common.vllm_server ensure
+  else
+    # Unmanaged: use a server already on api_base, or start one for this run and stop it on exit.
+    ensure_vllm_ready
+  fi
 fi
 
 python3 -m pip install -r requirements.txt
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Iterable
+
+from src.common.io import read_json
+from src.common.tracing import incr
+
+
+MANIFEST_NAME = "manifest.json"
+_lock = threading.Lock()
+_records: dict[str, dict[str, Any]] = {}
+
+
+def reset_artifacts() -> None:
+    with _lock:
+        _records.clear()
+
+
+def artifact_records() -> dict[str, dict[str, Any]]:
+    with _lock:
+        return {k: dict(v) for k, v in _records.items()}
+
+
+def merge_artifact_records(records: dict[str, dict[str, Any]]) -> None:
+    with _lock:
+        for key, entry in records.items():
+            earlier = _records.get(key)
+            _records[key] = {**entry, "written": entry["written"] or bool(earlier and earlier["written"])}
+
+
+def _artifact_root(path: Path) -> str | None:
+    parts = path.parts
+    for i in range(len(parts) - 2, 0, -1):
+        if parts[i] in ("weekly", "topics", "state"):
+            return str(Path(*parts[:i]))
+    return None
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha1(data).hexdigest()
+
+
+def _same(path: Path, data: bytes, digest: str) -> bool:
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return _digest(path.read_bytes()) == digest
+    except OSError:
+        return False
+
+
+def write_artifact(path: Path, data: bytes, stage: str) -> bool:
+    digest = _digest(data)
+    written = not _same(path, data, digest)
+    if written:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    incr("artifacts.written" if written else "artifacts.unchanged")
+    resolved = path.resolve()
+    key = str(resolved)
+    with _lock:
+        earlier = _records.get(key)
+        _records[key] = {
+            "root": _artifact_root(resolved),
+            "sha1": digest,
+            "bytes": len(data),
+            "stage": stage,
+            "written": written or bool(earlier and earlier["written"]),
+        }
+    return written
+
+
+def write_text_artifact(path: Path, text: str, stage: str) -> bool:
+    return write_artifact(path, text.encode("utf-8"), stage)
+
+
+def write_json_artifact(path: Path, data: Any, stage: str) -> bool:
+    return write_artifact(path, json.dumps(data, ensure_ascii=True, indent=2).encode("utf-8"), stage)
+
+
+def write_jsonl_artifact(path: Path, rows: Iterable[dict[str, Any]], stage: str) -> bool:
+    text = "".join(json.dumps(row, ensure_ascii=True) + "\n" for row in rows)
+    return write_artifact(path, text.encode("utf-8"), stage)
+
+
+def manifest_path(root: Path, week_label: str) -> Path:
+    return root / "weekly" / week_label / MANIFEST_NAME
+
+
+def load_manifest(root: Path, week_label: str) -> dict[str, dict[str, Any]]:
+    try:
+        data = read_json(manifest_path(root, week_label), default={})
+    except (json.JSONDecodeError, OSError):
+        return {}
+    artifacts = data.get("artifacts") if isinstance(data, dict) else None
+    return artifacts if isinstance(artifacts, dict) else {}
+
+
+def _week_key(root: Path, path: Path, week_label: str) -> str | None:
+    try:
+        rel = path.relative_to(root)
+    except ValueError:
+        return None
+    if rel.parts[0] in ("weekly", "topics") and (len(rel.parts) < 3 or rel.parts[1] not in (week_label, "RAW")):
+        return None
+    if rel.name == MANIFEST_NAME:
+        return None
+    return rel.as_posix()
+
+
+def changed_artifacts(root: Path, paths: Iterable[Path], previous: dict[str, dict[str, Any]]) -> list[Path]:
+    root = root.resolve()
+    out = []
+    with _lock:
+        records = dict(_records)
+    for path in paths:
+        resolved = path.resolve()
+        entry = records.get(str(resolved))
+        try:
+            prev = previous.get(resolved.relative_to(root).as_posix())
+        except ValueError:
+            prev = None
+        if entry is None or prev is None or entry["sha1"] != prev.get("sha1"):
+            out.append(path)
+    return out
+
+
+def save_manifest(root: Path, week_label: str, run_date: str) -> dict[str, Any]:
+    root = root.resolve()
+    previous = load_manifest(root, week_label)
+    with _lock:
+        records = dict(_records)
+    current: dict[str, dict[str, Any]] = {}
+    for path, entry in records.items():
+        if entry.get("root") != str(root):
+            continue
+        key = _week_key(root, Path(path), week_label)
+        if key is not None:
+            current[key] = entry
+    changes = {
+        "added": sorted(k for k in current if k not in previous),
+        "changed": sorted(k for k, e in current.items() if k in previous and previous[k].get("sha1") != e["sha1"]),
+        "removed": sorted(k for k in previous if k not in current and not (root / k).exists()),
+    }
+    changes["unchanged"] = len(current) - len(changes["added"]) - len(changes["changed"])
+    artifacts = {k: v for k, v in previous.items() if k not in current and (root / k).exists()}
+    artifacts.update(current)
+    write_json_artifact(
+        manifest_path(root, week_label),
+        {
+            "week": week_label,
+            "run_date": run_date,
+            "changes": changes,
+            "artifacts": {k: {f: v[f] for f in ("sha1", "bytes", "stage")} for k, v in sorted(artifacts.items())},
+        },
+        "manifest",
+    )
+    return changes
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any
+
+from src.common.io import read_json, write_json
+
+
+STATE_FILE = "llm_output_lengths.json"
+DEFAULTS: dict[str, Any] = {
+    "enabled": False,
+    "percentile": 0.95,
+    "margin": 0.15,
+    "min_samples": 20,
+    "window": 200,
+    "min_tokens": 32,
+    "save_interval_seconds": 30,
+}
+
+
+def _quantile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+class TokenBudget:
+    def __init__(self, cfg: dict[str, Any], path: Path | None = None):
+        cfg = {**DEFAULTS, **cfg}
+        self.path = path
+        self.percentile = float(cfg["percentile"])
+        self.margin = float(cfg["margin"])
+        self.min_samples = int(cfg["min_samples"])
+        self.window = max(1, int(cfg["window"]))
+        self.min_tokens = int(cfg["min_tokens"])
+        self.save_interval = float(cfg["save_interval_seconds"])
+        self.samples: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._saved_at = time.monotonic()
+        try:
+            data = read_json(path, default={}) if path is not None else {}
+        except (json.JSONDecodeError, OSError):
+            data = {}
+        for key, values in ((data or {}).get("samples") or {}).items():
+            self.samples[str(key)] = deque((float(v) for v in values), maxlen=self.window)
+
+    def limit(self, key: str, requested: int) -> int:
+        with self._lock:
+            values = list(self.samples.get(key, ()))
+        if len(values) < self.min_samples:
+            return requested
+        fraction = _quantile(values, self.percentile) * (1.0 + self.margin)
+        return max(min(requested, self.min_tokens), min(requested, math.ceil(requested * fraction)))
+
+    def record(self, key: str, requested: int, completion_tokens: int, truncated: bool) -> None:
+        if requested <= 0:
+            return
+        fraction = 1.0 if truncated else min(1.0, completion_tokens / requested)
+        with self._lock:
+            self.samples.setdefault(key, deque(maxlen=self.window)).append(round(fraction, 4))
+            self._dirty = True
+            due = time.monotonic() - self._saved_at >= self.save_interval
+        if due:
+            self.save()
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            data = {"samples": {key: list(values) for key, values in sorted(self.samples.items())}}
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        tmp = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        write_json(tmp, data)
+        os.replace(tmp, self.path)
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            samples = {key: list(values) for key, values in sorted(self.samples.items())}
+        return {
+            key: {
+                "samples": len(values),
+                "p50_fraction": _quantile(values, 0.5),
+                f"p{round(self.percentile * 100)}_fraction": _quantile(values, self.percentile),
+            }
+            for key, values in samples.items()
+            if values
+        }
+
+
+def make_budget(model_cfg: dict[str, Any], state_dir: Path | None) -> TokenBudget | None:
+    cfg = model_cfg.get("max_tokens_adaptive") or {}
+    if not cfg.get("enabled", False):
+        return None
+    return TokenBudget(cfg, state_dir / STATE_FILE if state_dir is not None else None)
+
+
+def reservation_report(counters: dict[str, float]) -> dict[str, Any]:
+    static = int(counters.get("llm.max_tokens.static", 0))
+    reserved = int(counters.get("llm.max_tokens.reserved", 0))
+    completion = int(counters.get("llm.max_tokens.completion", 0))
+    return {
+        "static_tokens": static,
+        "reserved_tokens": reserved,
+        "saved_tokens": static - reserved,
+        "saved_pct": round((static - reserved) / static, 4) if static else 0.0,
+        "unused_static_tokens": static - completion,
+        "unused_reserved_tokens": reserved - completion,
+        "length_retries": int(counters.get("llm.max_tokens.length_retries", 0)),
+    }
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from collections import deque
+from typing import Any
+
+import requests
+
+from src.common.tracing import event, incr
+
+
+METRIC_RE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{[^}]*\})?\s+([-+0-9.eEnaNIif]+)")
+BASELINE_DRIFT = 0.02
+
+
+def parse_prometheus(text: str) -> dict[str, float]:
+    out: dict[str, float] = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        m = METRIC_RE.match(line)
+        if m is None:
+            continue
+        try:
+            value = float(m.group(2))
+        except ValueError:
+            continue
+        out[m.group(1)] = out.get(m.group(1), 0.0) + value
+    return out
+
+
+def metrics_url_for(api_base: str) -> str:
+    root = api_base.rstrip("/")
+    if root.endswith("/v1"):
+        root = root[:-3]
+    return f"{root}/metrics"
+
+
+class AIMDController:
+    def __init__(self, cfg: dict[str, Any], metrics_url: str | None = None, name: str = ""):
+        self.name = name
+        self.min_limit = max(1, int(cfg.get("min", 1)))
+        self.max_limit = max(self.min_limit, int(cfg.get("max", 32)))
+        self.limit = float(min(self.max_limit, max(self.min_limit, int(cfg.get("initial", 4)))))
+        self.increase = float(cfg.get("increase", 1.0))
+        self.decrease_factor = float(cfg.get("decrease_factor", 0.5))
+        self.ttft_tolerance = float(cfg.get("ttft_tolerance", 2.0))
+        self.max_error_rate = float(cfg.get("max_error_rate", 0.1))
+        self.max_queue = float(cfg.get("max_queue", 2))
+        self.metrics_interval = float(cfg.get("metrics_interval_seconds", 2.0))
+        self.metrics_url = metrics_url if cfg.get("use_server_metrics", True) else None
+        self.inflight = 0
+        self.epoch = 0
+        self.baselines: dict[str, float] = {}
+        self.outcomes: deque[bool] = deque(maxlen=max(5, int(cfg.get("error_window", 20))))
+        self.server: dict[str, float] = {}
+        self._cv = threading.Condition()
+        self._metrics_lock = threading.Lock()
+        self._metrics_due = 0.0
+        self._preemptions: float | None = None
+
+    def acquire(self) -> int:
+        with self._cv:
+            while self.inflight >= int(self.limit):
+                self._cv.wait()
+            self.inflight += 1
+            return self.epoch
+
+    def release(self, epoch: int, call_type: str, ttft_ms: float | None, ok: bool, overload: bool) -> None:
+        queue, preempted = self._poll_server()
+        with self._cv:
+            self.inflight -= 1
+            if overload or ok:
+                self.outcomes.append(ok)
+            reason = ""
+            detail: dict[str, Any] = {}
+            if overload:
+                errors = self.outcomes.count(False)
+                if errors / max(5, len(self.outcomes)) > self.max_error_rate:
+                    reason = "errors"
+                    detail["error_rate"] = round(errors / len(self.outcomes), 3)
+            elif ok and ttft_ms is not None:
+                base = self.baselines.get(call_type)
+                if base is None or ttft_ms < base:
+                    base = ttft_ms
+                else:
+                    base += BASELINE_DRIFT * (ttft_ms - base)
+                self.baselines[call_type] = base
+                if base > 0 and ttft_ms / base > self.ttft_tolerance:
+                    reason = "ttft"
+                    detail = {"call_type": call_type, "ttft_ms": round(ttft_ms, 1), "baseline_ms": round(base, 1)}
+            if not reason and queue is not None and queue > self.max_queue:
+                reason = "queue"
+                detail["queue"] = queue
+            if not reason and preempted:
+                reason = "preemption"
+                detail["preemptions"] = preempted
+            if reason:
+                if epoch >= self.epoch:
+                    self._set_limit(self.limit * self.decrease_factor, "decrease", reason, detail)
+                    self.epoch += 1
+            elif ok and self.inflight + 1 >= int(self.limit):
+                self._set_limit(self.limit + self.increase / self.limit, "increase", "ok", detail)
+            self._cv.notify_all()
+
+    def _set_limit(self, value: float, action: str, reason: str, detail: dict[str, Any]) -> None:
+        before = int(self.limit)
+        self.limit = min(float(self.max_limit), max(float(self.min_limit), value))
+        incr(f"llm.aimd.{action}s")
+        if int(self.limit) != before:
+            event("llm.aimd", endpoint=self.name, action=action, reason=reason, limit=int(self.limit), **detail)
+
+    def _poll_server(self) -> tuple[float | None, float]:
+        if self.metrics_url is None or time.monotonic() < self._metrics_due:
+            return None, 0.0
+        if not self._metrics_lock.acquire(blocking=False):
+            return None, 0.0
+        try:
+            self._metrics_due = time.monotonic() + self.metrics_interval
+            try:
+                resp = requests.get(self.metrics_url, timeout=2)
+                resp.raise_for_status()
+            except requests.RequestException:
+                self.metrics_url = None
+                incr("llm.aimd.metrics_unavailable")
+                return None, 0.0
+            self.server = parse_prometheus(resp.text)
+            queue = self.server.get("vllm:num_requests_waiting")
+            total = self.server.get("vllm:num_preemptions_total", 0.0)
+            preempted = 0.0 if self._preemptions is None else max(0.0, total - self._preemptions)
+            self._preemptions = total
+            return queue, preempted
+        finally:
+            self._metrics_lock.release()
+
+    def summary(self) -> dict[str, Any]:
+        with self._cv:
+            return {
+                "endpoint": self.name,
+                "limit": int(self.limit),
+                "baselines_ms": {k: round(v, 1) for k, v in sorted(self.baselines.items())},
+                "server_metrics": self.metrics_url is not None,
+            }
@@ -0,0 +1,362 @@
+from __future__ import annotations
+
+import argparse
+import difflib
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Mapping
+
+import yaml
+
+from src.common.io import YAML_LOADER
+from src.common.structured import STRUCTURED_OUTPUT_MODES
+from src.common.tracing import incr
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CONFIG_NAMES = ("user_profile", "sources", "model", "rubric")
+CACHE_FILE = "config_snapshot.json"
+SCHEMA_VERSION = 2
+NUM = (int, float)
+STRS = [str]
+
+MODEL_SCHEMA: dict[str, Any] = {
+    "runner_mode": frozenset({"hosted", "self_hosted"}),
+    "backend": str,
+    "model_name": str,
+    "model_path": str,
+    "api_base": str,
+    "api_key": str,
+    "timeout_seconds": NUM,
+    "max_retries": int,
+    "pool_concurrency": int,
+    "concurrency": {
+        "adaptive": bool,
+        "initial": int,
+        "min": int,
+        "max": int,
+        "increase": NUM,
+        "decrease_factor": NUM,
+        "ttft_tolerance": NUM,
+        "max_error_rate": NUM,
+        "max_queue": NUM,
+        "use_server_metrics": bool,
+        "metrics_interval_seconds": NUM,
+        "error_window": int,
+    },
+    "max_tokens_adaptive": {
+        "enabled": bool,
+        "percentile": NUM,
+        "margin": NUM,
+        "min_samples": int,
+        "window": int,
+        "min_tokens": int,
+        "save_interval_seconds": NUM,
+    },
+    "references_batch_size": int,
+    "jobs": {
+        "enabled": bool,
+        "queue_dir": str,
+        "batch_size": int,
+        "draft_workers": int,
+        "max_attempts": int,
+        "lease_seconds": NUM,
+    },
+    "structured_output": frozenset(STRUCTURED_OUTPUT_MODES),
+    "require_live_llm": bool,
+    "tensor_parallel_size": int,
+    "gpu_memory_utilization": NUM,
+    "auto_select_gpus": bool,
+    "startup_timeout_seconds": NUM,
+    "manage_server": bool,
+    "idle_shutdown_seconds": NUM,
+    "enable_prefix_caching": bool,
+    "context_length": int,
+    "temperature": {"*": NUM},
+    "max_tokens": {"*": int},
+    "server_command": STRS,
+}
+MODEL_SCHEMA["routing"] = {
+    "tiers": {"*": {**MODEL_SCHEMA, "endpoints": STRS}},
+    "call_types": {"*": str},
+    "default_tier": str,
+    "escalate_to": str,
+    "borderline_margin": int,
+}
+
+SCHEMAS: dict[str, dict[str, Any]] = {
+    "user_profile": {
+        "themes": STRS,
+        "subthemes": {"*": STRS},
+        "audience": STRS,
+        "cadence": int,
+        "pillars_allocation": {"*": NUM},
+        "tone": STRS,
+        "banned_moves": STRS,
+        "stance_constraints": {"*": STRS},
+        "freshness_days": int,
+        "min_credibility_tier": frozenset({"A", "B", "C"}),
+        "top_k_topics": int,
+        "history_window_posts": int,
+        "archive_coverage_threshold": NUM,
+        "planning_horizon_weeks": int,
+        "backlog_half_life_days": NUM,
+        "backlog_max_topics": int,
+    },
+    "sources": {
+        "fetch_timeout_seconds": NUM,
+        "fetch_concurrency": int,
+        "parse_workers": int,
+        "parse_queue_size": int,
+        "schedule": {
+            "enabled": bool,
+            "min_interval_hours": NUM,
+            "max_interval_hours": NUM,
+            "due_slack_hours": NUM,
+            "backoff_base_hours": NUM,
+            "backoff_max_hours": NUM,
+            "failing_timeout_seconds": NUM,
+        },
+        "arxiv": {
+            "enabled": bool,
+            "api_url": str,
+            "queries": STRS,
+            "max_results_per_query": int,
+            "page_size": int,
+            "request_interval_seconds": NUM,
+            "overlap_days": int,
+            "refresh_backlog": bool,
+            "refresh_batch_size": int,
+        },
+        "rss": {"enabled": bool, "feeds": STRS},
+        "standards": {
+            "enabled": bool,
+            "items": [{"title": str, "url": str, "credibility_tier": frozenset({"A", "B", "C"})}],
+        },
+        "enrich": {
+            "enabled": bool,
+            "top_k": int,
+            "fetch_concurrency": int,
+            "fetch_timeout_seconds": NUM,
+            "max_chars": int,
+            "cache_max_entries": int,
+            "use_llm": bool,
+        },
+    },
+    "model": MODEL_SCHEMA,
+    "rubric": {
+        "thresholds": {"*": NUM},
+        "weights": {"*": NUM},
+        "reject_rules": STRS,
+        "tiered_gate": {"enabled": bool, "heuristic_pass_margin": int, "speculative_revision": bool},
+    },
+}
+
+_memo: dict[str, FrozenDict] = {}
+
+
+class ConfigError(ValueError):
+    def __init__(self, problems: list[str] | str):
+        self.problems = [problems] if isinstance(problems, str) else list(problems)
+        super().__init__("invalid config:\n" + "\n".join(f"  {p}" for p in self.problems))
+
+
+class FrozenDict(dict):
+    __slots__ = ()
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("config snapshot is read-only; copy it with dict() first")
+
+    __setitem__ = __delitem__ = __ior__ = clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (FrozenDict, (dict(self),))
+
+
+def freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def config_fingerprint(configs: Mapping[str, Any]) -> str:
+    text = json.dumps(configs, sort_keys=True, separators=(",", ":"), ensure_ascii=True, default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def _type_name(spec: Any) -> str:
+    if spec == NUM:
+        return "number"
+    if isinstance(spec, tuple):
+        return " or ".join(t.__name__ for t in spec)
+    return spec.__name__
+
+
+def _check(value: Any, spec: Any, where: str, problems: list[str]) -> None:
+    if value is None:
+        return
+    if isinstance(spec, dict):
+        if not isinstance(value, dict):
+            problems.append(f"{where}: expected a mapping, got {type(value).__name__}")
+            return
+        known = [k for k in spec if k != "*"]
+        for key, item in value.items():
+            path = f"{where}.{key}" if where else str(key)
+            if key in known:
+                _check(item, spec[key], path, problems)
+            elif "*" in spec:
+                _check(item, spec["*"], path, problems)
+            else:
+                hint = difflib.get_close_matches(str(key), known, n=1)
+                problems.append(f"{path}: unknown key" + (f" (did you mean '{hint[0]}'?)" if hint else ""))
+    elif isinstance(spec, list):
+        if not isinstance(value, list):
+            problems.append(f"{where}: expected a list, got {type(value).__name__}")
+            return
+        for i, item in enumerate(value):
+            _check(item, spec[0], f"{where}[{i}]", problems)
+    elif isinstance(spec, frozenset):
+        if value not in spec:
+            problems.append(f"{where}: expected one of {', '.join(sorted(spec))}, got {value!r}")
+    elif (isinstance(value, bool) and spec is not bool) or not isinstance(value, spec):
+        problems.append(f"{where}: expected {_type_name(spec)}, got {type(value).__name__} {value!r}")
+
+
+def _check_routing(model_cfg: dict[str, Any], problems: list[str]) -> None:
+    routing = model_cfg.get("routing") or {}
+    tiers = set((routing.get("tiers") or {}) if isinstance(routing, dict) else ())
+    if not tiers:
+        return
+    used = {
+        "routing.default_tier": routing.get("default_tier", "large"),
+        "routing.escalate_to": routing.get("escalate_to"),
+    }
+    used.update({f"routing.call_types.{k}": v for k, v in (routing.get("call_types") or {}).items()})
+    for where, tier in used.items():
+        if tier is not None and tier not in tiers:
+            problems.append(f"{where}: undefined tier {tier!r} (defined: {', '.join(sorted(tiers))})")
+
+
+def validate(name: str, data: Any) -> list[str]:
+    if not isinstance(data, dict):
+        return [f"expected a mapping at the top level, got {type(data).__name__}"]
+    problems: list[str] = []
+    _check(data, SCHEMAS[name], "", problems)
+    if name == "model":
+        _check_routing(data, problems)
+    return problems
+
+
+def config_paths(repo_root: Path, fallback_root: Path | None = None) -> dict[str, Path]:
+    paths = {}
+    for name in CONFIG_NAMES:
+        path = repo_root / "config" / f"{name}.yaml"
+        if not path.exists() and fallback_root is not None:
+            path = fallback_root / "config" / f"{name}.yaml"
+        paths[name] = path
+    return paths
+
+
+def compile_configs(paths: dict[str, Path], texts: dict[str, bytes]) -> FrozenDict:
+    configs: dict[str, Any] = {}
+    problems: list[str] = []
+    for name, text in texts.items():
+        try:
+            data = yaml.load(text, Loader=YAML_LOADER) if text else None
+        except yaml.YAMLError as exc:
+            problems.append(f"{paths[name]}: {' '.join(str(exc).split())}")
+            continue
+        data = {} if data is None else data
+        problems.extend(f"{paths[name]}: {p}" for p in validate(name, data))
+        configs[name] = data
+    if problems:
+        raise ConfigError(problems)
+    return freeze(configs)
+
+
+def clear_snapshot_cache() -> None:
+    _memo.clear()
+
+
+def _read_cache(path: Path, key: str) -> FrozenDict | None:
+    try:
+        cached = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("key") != key or not isinstance(cached.get("configs"), dict):
+        return None
+    return freeze(cached["configs"])
+
+
+def _write_cache(path: Path, key: str, configs: FrozenDict) -> None:
+    text = json.dumps({"key": key, "configs": configs}, ensure_ascii=True, sort_keys=True)
+    if freeze(json.loads(text)["configs"]) != configs:
+        return
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(text, encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+
+
+def load_snapshot(repo_root: Path, fallback_root: Path | None = None) -> FrozenDict:
+    paths = config_paths(repo_root, fallback_root)
+    texts = {name: path.read_bytes() if path.exists() else b"" for name, path in paths.items()}
+    digest = hashlib.sha1(f"schema:{SCHEMA_VERSION}".encode("utf-8"))
+    for name, text in texts.items():
+        digest.update(f"\0{name}:{len(text)}\0".encode("utf-8"))
+        digest.update(text)
+    key = digest.hexdigest()
+    configs = _memo.get(key)
+    if configs is not None:
+        return configs
+    cache = repo_root / "state" / CACHE_FILE
+    configs = _read_cache(cache, key)
+    if configs is None:
+        incr("config.cache.misses")
+        configs = compile_configs(paths, texts)
+        _write_cache(cache, key, configs)
+    else:
+        incr("config.cache.hits")
+    _memo[key] = configs
+    return configs
+
+
+def lookup(configs: Mapping[str, Any], dotted: str) -> Any:
+    value: Any = configs
+    for part in dotted.split("."):
+        if not isinstance(value, Mapping):
+            return None
+        value = value.get(part)
+    return value
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Validate config/*.yaml and print values from the compiled snapshot")
+    parser.add_argument("action", choices=["check", "get"])
+    parser.add_argument("keys", nargs="*", help="Dotted keys for get, e.g. model.runner_mode model.backend.")
+    parser.add_argument("--root", default=str(REPO_ROOT), help="Workspace root holding config/.")
+    args = parser.parse_args(argv)
+    try:
+        configs = load_snapshot(Path(args.root).resolve())
+    except ConfigError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    if args.action == "check":
+        print(f"config ok: {config_fingerprint(configs)}")
+        return 0
+    for key in args.keys:
+        value = lookup(configs, key)
+        print("" if value is None else json.dumps(value) if isinstance(value, (dict, tuple)) else value)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
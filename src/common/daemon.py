@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from src.common.io import read_json, write_json
+
+
+HEARTBEAT_STALE_SECONDS = 120.0
+
+
+def daemon_dir(repo_root: Path) -> Path:
+    return repo_root / "state" / "daemon"
+
+
+def load_status(repo_root: Path) -> dict[str, Any]:
+    try:
+        data = read_json(daemon_dir(repo_root) / "status.json", default={})
+    except (json.JSONDecodeError, OSError):
+        data = {}
+    status = data if isinstance(data, dict) else {}
+    if not isinstance(status.get("weeks"), dict):
+        status["weeks"] = {}
+    return status
+
+
+def save_status(repo_root: Path, status: dict[str, Any]) -> None:
+    path = daemon_dir(repo_root) / "status.json"
+    tmp = path.with_name(f".status.{os.getpid()}.tmp")
+    write_json(tmp, status)
+    os.replace(tmp, path)
+
+
+def _pid_running(pid: Any) -> bool:
+    try:
+        os.kill(int(pid), 0)
+    except (TypeError, ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def daemon_alive(status: dict[str, Any], now: float | None = None) -> bool:
+    now = time.time() if now is None else now
+    if not _pid_running(status.get("pid")):
+        return False
+    return bool(status.get("busy")) or now - float(status.get("heartbeat_at") or 0) < HEARTBEAT_STALE_SECONDS
+
+
+def request_draft(repo_root: Path, run_date: date) -> Path:
+    path = daemon_dir(repo_root) / "requests" / f"{run_date.isoformat()}.json"
+    write_json(path, {"run_date": run_date.isoformat(), "requested_at": round(time.time(), 3)})
+    return path
+
+
+def pending_requests(repo_root: Path) -> list[date]:
+    out = []
+    for path in sorted((daemon_dir(repo_root) / "requests").glob("*.json")):
+        try:
+            out.append(datetime.strptime(path.stem, "%Y-%m-%d").date())
+        except ValueError:
+            path.unlink(missing_ok=True)
+    return out
+
+
+def clear_request(repo_root: Path, run_date: date) -> None:
+    (daemon_dir(repo_root) / "requests" / f"{run_date.isoformat()}.json").unlink(missing_ok=True)
+
+
+def week_result(status: dict[str, Any], week_label: str) -> dict[str, Any] | None:
+    result = status["weeks"].get(week_label)
+    if isinstance(result, dict) and result.get("exit_code") == 0:
+        return result
+    return None
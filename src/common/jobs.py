@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import socket
+import time
+from pathlib import Path
+from typing import Any
+
+from src.common.io import read_json, write_json
+
+
+JOB_STATES = ("pending", "running", "done", "failed")
+DEFAULTS: dict[str, Any] = {
+    "enabled": False,
+    "queue_dir": "state/jobs",
+    "batch_size": 4,
+    "draft_workers": 4,
+    "max_attempts": 3,
+    "lease_seconds": 3600,
+}
+
+
+def jobs_cfg(model_cfg: dict[str, Any]) -> dict[str, Any]:
+    return {**DEFAULTS, **(model_cfg.get("jobs") or {})}
+
+
+def queue_dir(repo_root: Path, model_cfg: dict[str, Any]) -> Path:
+    path = Path(str(jobs_cfg(model_cfg)["queue_dir"]))
+    return path if path.is_absolute() else repo_root / path
+
+
+def job_id(root: Path, week_label: str) -> str:
+    return f"{week_label}-{hashlib.sha1(str(root.resolve()).encode('utf-8')).hexdigest()[:8]}"
+
+
+def _write(path: Path, job: dict[str, Any]) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    write_json(tmp, job)
+    os.replace(tmp, path)
+
+
+def _read(path: Path) -> dict[str, Any] | None:
+    try:
+        job = read_json(path, default=None)
+    except (json.JSONDecodeError, OSError):
+        return None
+    return job if isinstance(job, dict) else None
+
+
+def _owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_job(qdir: Path, job: dict[str, Any]) -> Path:
+    for state in JOB_STATES:
+        (qdir / state).mkdir(parents=True, exist_ok=True)
+    job = {**job, "enqueued_at": round(time.time(), 3), "attempts": 0}
+    path = qdir / "pending" / f"{job['id']}.json"
+    _write(path, job)
+    for state in ("done", "failed"):
+        (qdir / state / path.name).unlink(missing_ok=True)
+    return path
+
+
+def _stale(job: dict[str, Any], lease_seconds: float, now: float) -> bool:
+    if now - float(job.get("claimed_at") or 0) > lease_seconds:
+        return True
+    host, _, pid = str(job.get("claimed_by", "")).rpartition(":")
+    if host != socket.gethostname():
+        return False
+    try:
+        os.kill(int(pid), 0)
+    except (ValueError, ProcessLookupError):
+        return True
+    except PermissionError:
+        return False
+    return False
+
+
+def requeue_stale(qdir: Path, lease_seconds: float) -> int:
+    now = time.time()
+    requeued = 0
+    for path in sorted((qdir / "running").glob("*.json")):
+        job = _read(path)
+        if job is None or not _stale(job, lease_seconds, now):
+            continue
+        target = qdir / "pending" / path.name
+        if target.exists():
+            path.unlink(missing_ok=True)
+        else:
+            os.replace(path, target)
+        requeued += 1
+    return requeued
+
+
+def claim_jobs(qdir: Path, limit: int, lease_seconds: float = 3600.0) -> list[dict[str, Any]]:
+    if not (qdir / "pending").exists():
+        return []
+    requeue_stale(qdir, lease_seconds)
+    pending = sorted((qdir / "pending").glob("*.json"), key=lambda p: p.stat().st_mtime)
+    claimed: list[dict[str, Any]] = []
+    for path in pending:
+        if len(claimed) >= limit:
+            break
+        running = qdir / "running" / path.name
+        if running.exists():
+            continue
+        try:
+            os.rename(path, running)
+        except FileNotFoundError:
+            continue
+        job = _read(running)
+        if job is None:
+            os.replace(running, qdir / "failed" / path.name)
+            continue
+        job["attempts"] = int(job.get("attempts", 0)) + 1
+        job["claimed_by"] = _owner()
+        job["claimed_at"] = round(time.time(), 3)
+        _write(running, job)
+        claimed.append(job)
+    return claimed
+
+
+def finish_job(qdir: Path, job: dict[str, Any], error: str = "", max_attempts: int = 3) -> str:
+    name = f"{job['id']}.json"
+    running = qdir / "running" / name
+    job = {k: v for k, v in job.items() if k not in ("claimed_by", "claimed_at")}
+    job["finished_at"] = round(time.time(), 3)
+    if not error:
+        state = "done"
+    else:
+        job["last_error"] = error
+        state = "pending" if int(job.get("attempts", 0)) < max_attempts else "failed"
+        if state == "pending" and (qdir / "pending" / name).exists():
+            state = "failed"
+    _write(qdir / state / name, job)
+    running.unlink(missing_ok=True)
+    return state
+
+
+def queue_counts(qdir: Path) -> dict[str, int]:
+    return {state: len(list((qdir / state).glob("*.json"))) for state in JOB_STATES}
@@ -1,17 +1,48 @@
 from __future__ import annotations
 
 import json
-from typing import Any
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Protocol, TypeVar
 
 import requests
 
+from src.common.budget import TokenBudget, make_budget
+from src.common.concurrency import AIMDController, metrics_url_for
+from src.common.structured import response_format_for
+from src.common.tracing import incr, span
+
+
+T = TypeVar("T")
+ENDPOINT_EWMA_ALPHA = 0.3
+ENDPOINT_MAX_COOLDOWN_SECONDS = 60.0
+
+
+class ChatClient(Protocol):
+    def healthcheck(self) -> bool: ...
+
+    def escalates(self, call_type: str) -> bool: ...
+
+    def chat_completion(self, *args: Any, **kwargs: Any) -> str: ...
+
 
 class LLMClient:
-    def __init__(self, model_cfg: dict[str, Any]):
+    def __init__(self, model_cfg: dict[str, Any], budget: TokenBudget | None = None):
         self.model = str(model_cfg.get("model_name", ""))
         self.base_url = str(model_cfg.get("api_base", "http://127.0.0.1:8000/v1")).rstrip("/")
         self.api_key = str(model_cfg.get("api_key", "EMPTY"))
         self.timeout_seconds = int(model_cfg.get("timeout_seconds", 120))
+        self.max_retries = int(model_cfg.get("max_retries", 1))
+        self.structured_output = str(model_cfg.get("structured_output", "json_schema"))
+        concurrency = model_cfg.get("concurrency") or {}
+        self.controller: AIMDController | None = None
+        if concurrency.get("adaptive", False):
+            self.controller = AIMDController(concurrency, metrics_url_for(self.base_url), name=self.base_url)
+        self.budget = budget
 
     def healthcheck(self) -> bool:
         try:
@@ -20,6 +51,9 @@ class LLMClient:
         except Exception:
             return False
 
+    def escalates(self, call_type: str) -> bool:
+        return False
+
     def chat_completion(
         self,
         system_prompt: str,
@@ -27,11 +61,10 @@ class LLMClient:
         temperature: float,
         max_tokens: int,
         response_format: dict[str, Any] | None = None,
+        call_type: str = "chat",
+        json_schema: dict[str, Any] | None = None,
+        escalated: bool = False,
     ) -> str:
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {self.api_key}",
-        }
         payload: dict[str, Any] = {
             "model": self.model,
             "messages": [
@@ -41,22 +74,371 @@ class LLMClient:
             "temperature": temperature,
             "max_tokens": max_tokens,
         }
+        if json_schema is not None:
+            response_format, extra = response_format_for(json_schema, call_type, self.structured_output)
+            payload.update(extra)
         if response_format is not None:
             payload["response_format"] = response_format
+        if self.controller is not None:
+            payload["stream"] = True
+            payload["stream_options"] = {"include_usage": True}
+
+        budget_key = f"{self.model}:{call_type}"
+        limit = self.budget.limit(budget_key, max_tokens) if self.budget is not None else max_tokens
+        with span("llm.chat_completion", call_type=call_type, max_tokens=limit, model=self.model) as attrs:
+            payload["max_tokens"] = limit
+            content, usage, finish_reason, attempts, ttft_ms = self._post(payload, call_type)
+            prompt_tokens = int(usage.get("prompt_tokens", 0) or 0)
+            completion_tokens = int(usage.get("completion_tokens", 0) or 0)
+            reserved = limit
+            if finish_reason == "length" and limit < max_tokens:
+                incr("llm.max_tokens.length_retries")
+                incr("llm.prompt_tokens", prompt_tokens)
+                incr("llm.completion_tokens", completion_tokens)
+                incr("llm.max_tokens.completion", completion_tokens)
+                payload["max_tokens"] = max_tokens
+                content, usage, finish_reason, retried, ttft_ms = self._post(payload, call_type)
+                prompt_tokens = int(usage.get("prompt_tokens", 0) or 0)
+                completion_tokens = int(usage.get("completion_tokens", 0) or 0)
+                reserved += max_tokens
+                attempts += retried
+                attrs["length_retry"] = True
+            if self.budget is not None:
+                self.budget.record(budget_key, max_tokens, completion_tokens, finish_reason == "length")
+            attrs["prompt_tokens"] = prompt_tokens
+            attrs["completion_tokens"] = completion_tokens
+            attrs["attempts"] = attempts
+            if ttft_ms is not None and self.controller is not None:
+                attrs["ttft_ms"] = round(ttft_ms, 3)
+                attrs["limit"] = int(self.controller.limit)
+            incr("llm.calls")
+            incr("llm.prompt_tokens", prompt_tokens)
+            incr("llm.completion_tokens", completion_tokens)
+            incr("llm.max_tokens.static", max_tokens)
+            incr("llm.max_tokens.reserved", reserved)
+            incr("llm.max_tokens.completion", completion_tokens)
+            return content.strip()
+
+    def _post(
+        self, payload: dict[str, Any], call_type: str
+    ) -> tuple[str, dict[str, Any], str | None, int, float | None]:
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}",
+        }
+        controller = self.controller
+        body = json.dumps(payload)
+        attempt = 0
+        while True:
+            epoch = controller.acquire() if controller is not None else 0
+            start = time.perf_counter()
+            ttft_ms: float | None = None
+            error: requests.RequestException | None = None
+            status: int | None = None
+            succeeded = False
+            try:
+                resp = requests.post(
+                    f"{self.base_url}/chat/completions",
+                    headers=headers,
+                    data=body,
+                    timeout=self.timeout_seconds,
+                    stream=controller is not None,
+                )
+                resp.raise_for_status()
+                if controller is not None:
+                    content, usage, finish_reason, first = _read_stream(resp)
+                    ttft_ms = (first - start) * 1000.0 if first is not None else None
+                else:
+                    data = resp.json()
+                    usage = data.get("usage") or {}
+                    choice = data["choices"][0]
+                    content = choice["message"]["content"]
+                    finish_reason = choice.get("finish_reason")
+                succeeded = True
+            except (
+                requests.ConnectionError,
+                requests.Timeout,
+                requests.HTTPError,
+                requests.exceptions.ChunkedEncodingError,
+            ) as exc:
+                error = exc
+                status = getattr(getattr(exc, "response", None), "status_code", None)
+            finally:
+                if controller is not None:
+                    overload = error is not None and (status is None or status >= 500 or status == 429)
+                    controller.release(epoch, call_type, ttft_ms, succeeded, overload)
+            if error is None:
+                return content, usage, finish_reason, attempt + 1, ttft_ms
+            retryable = status is None or status >= 500
+            if not retryable or attempt >= self.max_retries:
+                incr("llm.errors")
+                raise error
+            attempt += 1
+            incr("llm.retries")
+            time.sleep(min(8.0, 0.5 * 2**attempt))
+
+    def flush(self) -> None:
+        if self.budget is not None:
+            self.budget.save()
+
+
+def _read_stream(resp: requests.Response) -> tuple[str, dict[str, Any], str | None, float | None]:
+    parts: list[str] = []
+    usage: dict[str, Any] = {}
+    finish_reason: str | None = None
+    first: float | None = None
+    for line in resp.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if data == "[DONE]":
+            break
+        chunk = json.loads(data)
+        usage = chunk.get("usage") or usage
+        for choice in chunk.get("choices") or []:
+            finish_reason = choice.get("finish_reason") or finish_reason
+            delta = (choice.get("delta") or {}).get("content")
+            if delta:
+                if first is None:
+                    first = time.perf_counter()
+                parts.append(delta)
+    return "".join(parts), usage, finish_reason, first
+
+
+class _Endpoint:
+    def __init__(self, client: LLMClient):
+        self.client = client
+        self.latency_ms = 0.0
+        self.failures = 0
+        self.down_until = 0.0
+        self.inflight = 0
+
+    def weight(self, default_ms: float) -> float:
+        return 1.0 / ((self.latency_ms or default_ms) * (1 + self.inflight))
+
 
-        resp = requests.post(
-            f"{self.base_url}/chat/completions",
-            headers=headers,
-            data=json.dumps(payload),
-            timeout=self.timeout_seconds,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-        return data["choices"][0]["message"]["content"].strip()
+class LLMRouter:
+    def __init__(self, model_cfg: dict[str, Any], seed: int | None = None, budget: TokenBudget | None = None):
+        routing = model_cfg.get("routing") or {}
+        self.default_tier = str(routing.get("default_tier", "large"))
+        self.escalate_tier = str(routing.get("escalate_to", self.default_tier))
+        self.call_types = {str(k): str(v) for k, v in (routing.get("call_types") or {}).items()}
+        self.tiers: dict[str, list[_Endpoint]] = {}
+        tiers_cfg = dict(routing.get("tiers") or {})
+        tiers_cfg.setdefault(self.default_tier, {})
+        for name, tier_cfg in tiers_cfg.items():
+            tier_cfg = tier_cfg or {}
+            urls = tier_cfg.get("endpoints") or [tier_cfg.get("api_base") or model_cfg.get("api_base")]
+            base = {k: v for k, v in model_cfg.items() if k != "routing"}
+            base.update({k: v for k, v in tier_cfg.items() if k != "endpoints"})
+            if len(urls) > 1:
+                base["max_retries"] = 0
+            self.tiers[str(name)] = [_Endpoint(LLMClient({**base, "api_base": url}, budget)) for url in urls]
+        missing = {self.escalate_tier, *self.call_types.values()} - set(self.tiers)
+        if missing:
+            raise ValueError(f"routing refers to undefined model tiers: {sorted(missing)}")
+        self.budget = budget
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
 
+    def tier_for(self, call_type: str, escalated: bool = False) -> str:
+        return self.escalate_tier if escalated else self.call_types.get(call_type, self.default_tier)
 
-def maybe_make_vllm_client(model_cfg: dict[str, Any]) -> LLMClient | None:
+    def escalates(self, call_type: str) -> bool:
+        return self.tier_for(call_type) != self.escalate_tier
+
+    def healthcheck(self) -> bool:
+        healthy = {name: [ep.client.healthcheck() for ep in endpoints] for name, endpoints in self.tiers.items()}
+        now = time.time()
+        with self._lock:
+            for name, endpoints in self.tiers.items():
+                for ep, ok in zip(endpoints, healthy[name]):
+                    if ok:
+                        ep.failures = 0
+                        ep.down_until = 0.0
+                    else:
+                        self._mark_down(ep, now)
+        return any(healthy[self.default_tier])
+
+    def _mark_down(self, ep: _Endpoint, now: float) -> None:
+        ep.failures += 1
+        ep.down_until = now + min(ENDPOINT_MAX_COOLDOWN_SECONDS, 2.0**ep.failures)
+
+    def _pick(self, tier: str, tried: set[int]) -> _Endpoint | None:
+        now = time.time()
+        with self._lock:
+            untried = [ep for ep in self.tiers[tier] if id(ep) not in tried]
+            if not untried:
+                return None
+            up = [ep for ep in untried if ep.down_until <= now] or [min(untried, key=lambda e: e.down_until)]
+            known = [ep.latency_ms for ep in up if ep.latency_ms]
+            default_ms = min(known) if known else 1.0
+            ep = self._rng.choices(up, weights=[e.weight(default_ms) for e in up])[0]
+            ep.inflight += 1
+            return ep
+
+    def chat_completion(self, call_type: str = "chat", escalated: bool = False, **kwargs: Any) -> str:
+        tier = self.tier_for(call_type, escalated)
+        tiers = [tier] if tier == self.default_tier else [tier, self.default_tier]
+        tried: set[int] = set()
+        last_exc: Exception | None = None
+        for name in tiers:
+            while True:
+                ep = self._pick(name, tried)
+                if ep is None:
+                    break
+                tried.add(id(ep))
+                start = time.perf_counter()
+                try:
+                    out = ep.client.chat_completion(call_type=call_type, **kwargs)
+                except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as exc:
+                    status = getattr(getattr(exc, "response", None), "status_code", None)
+                    with self._lock:
+                        ep.inflight -= 1
+                        if status is not None and status < 500:
+                            raise
+                        self._mark_down(ep, time.time())
+                    incr("llm.router.failovers")
+                    last_exc = exc
+                    continue
+                elapsed_ms = (time.perf_counter() - start) * 1000.0
+                with self._lock:
+                    ep.inflight -= 1
+                    ep.failures = 0
+                    ep.latency_ms = (
+                        elapsed_ms
+                        if not ep.latency_ms
+                        else (1 - ENDPOINT_EWMA_ALPHA) * ep.latency_ms + ENDPOINT_EWMA_ALPHA * elapsed_ms
+                    )
+                incr(f"llm.tier.{name}.calls")
+                if name != tier:
+                    incr("llm.router.tier_fallbacks")
+                return out
+        if last_exc is not None:
+            raise last_exc
+        raise requests.ConnectionError(f"no healthy endpoint for model tier {tier!r}")
+
+    def flush(self) -> None:
+        if self.budget is not None:
+            self.budget.save()
+
+    def stats(self) -> dict[str, list[dict[str, Any]]]:
+        with self._lock:
+            return {
+                name: [
+                    {
+                        "api_base": ep.client.base_url,
+                        "model": ep.client.model,
+                        "latency_ms": round(ep.latency_ms, 3),
+                        "failures": ep.failures,
+                        "down": ep.down_until > time.time(),
+                    }
+                    for ep in endpoints
+                ]
+                for name, endpoints in self.tiers.items()
+            }
+
+
+def cascade(llm_client: ChatClient, call_type: str, call: Callable[[bool], T], accept: Callable[[T], bool]) -> T:
+    if not llm_client.escalates(call_type):
+        return call(False)
+    try:
+        result = call(False)
+        if accept(result):
+            return result
+    except Exception:
+        incr("llm.cascade_errors")
+    incr("llm.escalations")
+    incr(f"llm.escalations.{call_type}")
+    return call(True)
+
+
+def maybe_make_vllm_client(model_cfg: dict[str, Any], state_dir: Path | None = None) -> LLMClient | LLMRouter | None:
     backend = str(model_cfg.get("backend", "")).lower()
     if backend != "vllm":
         return None
-    return LLMClient(model_cfg)
+    budget = make_budget(model_cfg, state_dir)
+    if (model_cfg.get("routing") or {}).get("tiers"):
+        return LLMRouter(model_cfg, budget=budget)
+    return LLMClient(model_cfg, budget)
+
+
+class FairLLMPool:
+    def __init__(self, client: LLMClient | LLMRouter, max_concurrency: int = 8):
+        self.client = client
+        self._queues: dict[str, deque[tuple[dict[str, Any], Future]]] = {}
+        self._order: deque[str] = deque()
+        self._cv = threading.Condition()
+        self._closed = False
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"llm-pool-{i}", daemon=True)
+            for i in range(max(1, max_concurrency))
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def client_for(self, tenant: str) -> "TenantLLMClient":
+        return TenantLLMClient(self, tenant)
+
+    def submit(self, tenant: str, kwargs: dict[str, Any]) -> Future:
+        future: Future = Future()
+        with self._cv:
+            if self._closed:
+                raise RuntimeError("LLM pool is closed")
+            if tenant not in self._queues:
+                self._queues[tenant] = deque()
+                self._order.append(tenant)
+            self._queues[tenant].append((kwargs, future))
+            self._cv.notify()
+        return future
+
+    def _next_request(self) -> tuple[dict[str, Any], Future] | None:
+        with self._cv:
+            while True:
+                for _ in range(len(self._order)):
+                    tenant = self._order[0]
+                    self._order.rotate(-1)
+                    queue = self._queues[tenant]
+                    if queue:
+                        return queue.popleft()
+                if self._closed:
+                    return None
+                self._cv.wait()
+
+    def _worker(self) -> None:
+        while True:
+            item = self._next_request()
+            if item is None:
+                return
+            kwargs, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self.client.chat_completion(**kwargs))
+            except BaseException as exc:
+                future.set_exception(exc)
+
+    def close(self) -> None:
+        with self._cv:
+            self._closed = True
+            self._cv.notify_all()
+        for worker in self._workers:
+            worker.join()
+        self.client.flush()
+
+
+class TenantLLMClient:
+    def __init__(self, pool: FairLLMPool, tenant: str):
+        self.pool = pool
+        self.tenant = tenant
+
+    def healthcheck(self) -> bool:
+        return self.pool.client.healthcheck()
+
+    def escalates(self, call_type: str) -> bool:
+        return self.pool.client.escalates(call_type)
+
+    def chat_completion(self, **kwargs: Any) -> str:
+        with span("llm.queue_wait", tenant=self.tenant):
+            future = self.pool.submit(self.tenant, kwargs)
+            return future.result()
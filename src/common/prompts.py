@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+
+DRAFT_SYSTEM_PROMPT = (
+    "You write high-rigor LinkedIn posts for senior technical audiences. "
+    "Avoid hype. Include concrete, falsifiable claims."
+)
+
+REFERENCES_SYSTEM_PROMPT = "Return strict JSON only."
+
+SCORER_SYSTEM_PROMPT = """
+You are a strict LinkedIn-post quality judge. Your job is to score a single draft post for a specific positioning goal:
+- HIGH Systems & Strategic Thinking
+- HIGH Technical Rigor
+The author targets a senior, cross-industry audience.
+You must be brutally honest, consistent, and conservative with high scores.
+Do not reward hype, vagueness, or paper-summary-only content.
+
+You MUST output valid JSON only matching the schema. No markdown. No commentary outside JSON.
+""".strip()
+
+REVISION_SYSTEM_PROMPT = "You revise technical posts with minimal edits. Return markdown only."
+
+WARMUP_SYSTEM_PROMPTS = [
+    DRAFT_SYSTEM_PROMPT,
+    REFERENCES_SYSTEM_PROMPT,
+    SCORER_SYSTEM_PROMPT,
+    REVISION_SYSTEM_PROMPT,
+]
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+from src.common.tracing import incr
+
+
+FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+MAX_REPAIR_ATTEMPTS = 64
+STRUCTURED_OUTPUT_MODES = ("json_schema", "guided_json", "json_object")
+
+
+def response_format_for(schema: dict[str, Any], name: str, mode: str) -> tuple[dict[str, Any] | None, dict[str, Any]]:
+    if mode == "guided_json":
+        return None, {"guided_json": schema}
+    if mode == "json_object":
+        return {"type": "json_object"}, {}
+    return {"type": "json_schema", "json_schema": {"name": name, "schema": schema}}, {}
+
+
+def _scan(text: str) -> tuple[str, list[tuple[int, str]], str, bool]:
+    out: list[str] = []
+    stack: list[str] = []
+    cuts: list[tuple[int, str]] = []
+    in_str = False
+    esc = False
+    for ch in text:
+        if in_str:
+            out.append(ch)
+            if esc:
+                esc = False
+            elif ch == "\\":
+                esc = True
+            elif ch == '"':
+                in_str = False
+            continue
+        if ch == '"':
+            in_str = True
+            out.append(ch)
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+            out.append(ch)
+            cuts.append((len(out), "".join(reversed(stack))))
+        elif ch in "}]":
+            while out and out[-1] in " \t\r\n,":
+                out.pop()
+            if stack and stack[-1] == ch:
+                stack.pop()
+            out.append(ch)
+            if not stack:
+                break
+        elif ch == ",":
+            cuts.append((len(out), "".join(reversed(stack))))
+            out.append(ch)
+        else:
+            out.append(ch)
+    tail = "".join(reversed(stack))
+    return "".join(out), cuts, tail, in_str
+
+
+def repair_json(text: str) -> Any:
+    candidate = FENCE_RE.sub("", text.strip())
+    starts = [i for i in (candidate.find("{"), candidate.find("[")) if i >= 0]
+    if not starts:
+        raise ValueError("no JSON value in model output")
+    cleaned, cuts, tail, in_str = _scan(candidate[min(starts) :])
+    attempts = [cleaned + ('"' if in_str else "") + tail]
+    for pos, closers in reversed(cuts[-MAX_REPAIR_ATTEMPTS:]):
+        attempts.append(cleaned[:pos].rstrip().rstrip(",") + closers)
+    for attempt in attempts:
+        try:
+            return json.loads(attempt)
+        except json.JSONDecodeError:
+            continue
+    raise ValueError("model output is not repairable JSON")
+
+
+def parse_json(text: str, call_type: str) -> Any:
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    try:
+        value = repair_json(text)
+    except ValueError:
+        incr("llm.json_unrepairable")
+        incr(f"llm.json_unrepairable.{call_type}")
+        raise
+    incr("llm.json_repaired")
+    incr(f"llm.json_repaired.{call_type}")
+    return value
+
+
+_TYPES: dict[str, tuple[type, ...]] = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+}
+
+
+def validate(instance: Any, schema: dict[str, Any], path: str = "$") -> list[str]:
+    errors: list[str] = []
+    expected = schema.get("type")
+    if expected:
+        ok = isinstance(instance, _TYPES[expected])
+        if expected in {"integer", "number"} and isinstance(instance, bool):
+            ok = False
+        if not ok:
+            return [f"{path}: expected {expected}"]
+    if "enum" in schema and instance not in schema["enum"]:
+        errors.append(f"{path}: not one of {schema['enum']}")
+    if isinstance(instance, (int, float)) and not isinstance(instance, bool):
+        if "minimum" in schema and instance < schema["minimum"]:
+            errors.append(f"{path}: below {schema['minimum']}")
+        if "maximum" in schema and instance > schema["maximum"]:
+            errors.append(f"{path}: above {schema['maximum']}")
+    if isinstance(instance, str):
+        if "maxLength" in schema and len(instance) > schema["maxLength"]:
+            errors.append(f"{path}: longer than {schema['maxLength']}")
+        if "pattern" in schema and not re.search(schema["pattern"], instance):
+            errors.append(f"{path}: does not match {schema['pattern']}")
+    if isinstance(instance, dict):
+        for key in schema.get("required", []):
+            if key not in instance:
+                errors.append(f"{path}.{key}: missing")
+        for key, sub in (schema.get("properties") or {}).items():
+            if key in instance:
+                errors.extend(validate(instance[key], sub, f"{path}.{key}"))
+    if isinstance(instance, list):
+        if "maxItems" in schema and len(instance) > schema["maxItems"]:
+            errors.append(f"{path}: more than {schema['maxItems']} items")
+        if "items" in schema:
+            for i, item in enumerate(instance):
+                errors.extend(validate(item, schema["items"], f"{path}[{i}]"))
+    return errors
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
-from datetime import date
+import calendar
+from datetime import date, datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Any
 
 
 def iso_week_label(d: date) -> str:
@@ -8,5 +12,43 @@ def iso_week_label(d: date) -> str:
     return f"{year}-W{week:02d}"
 
 
+def resolve_run_date(raw: str | None) -> date:
+    if not raw:
+        return date.today()
+    return datetime.strptime(raw, "%Y-%m-%d").date()
+
+
 def iso_date(d: date) -> str:
     return d.isoformat()
+
+
+def day_start_ts(d: date) -> int:
+    return calendar.timegm(d.timetuple())
+
+
+def ts_date(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).date().isoformat()
+
+
+def struct_ts(parsed: Any) -> int | None:
+    try:
+        return calendar.timegm(parsed)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def parse_timestamp(raw: str) -> int | None:
+    text = raw.strip()
+    if not text:
+        return None
+    try:
+        dt = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            dt = parsedate_to_datetime(text)
+        except (TypeError, ValueError, IndexError):
+            return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return int(dt.timestamp())
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Iterable
+
+from src.common.artifacts import write_jsonl_artifact
+
+
+SNIPPET_CHARS = 300
+
+
+class Tier(str, Enum):
+    A = "A"
+    B = "B"
+    C = "C"
+
+    @classmethod
+    def parse(cls, raw: Any) -> Tier:
+        return _TIERS.get(raw) or _TIERS.get(str(raw).upper(), cls.C)
+
+
+class SourceType(str, Enum):
+    ARXIV = "arxiv"
+    RSS = "rss"
+    STANDARD = "standard"
+    OTHER = "other"
+
+    @classmethod
+    def parse(cls, raw: Any) -> SourceType:
+        return _SOURCE_TYPES.get(raw, cls.OTHER)
+
+
+_TIERS: dict[Any, Tier] = {t.value: t for t in Tier}
+_SOURCE_TYPES: dict[Any, SourceType] = {s.value: s for s in SourceType}
+TIER_RANK = {Tier.A: 3, Tier.B: 2, Tier.C: 1}
+KNOWN_KEYS = frozenset(
+    {
+        "id",
+        "title",
+        "summary",
+        "url",
+        "published_at",
+        "published_ts",
+        "source_type",
+        "credibility_tier",
+        "theme_tags",
+        "key_claims",
+        "why_it_matters",
+        "risk_notes",
+        "raw_text_snippets",
+        "scores",
+    }
+)
+
+
+@dataclass(slots=True, eq=False)
+class Topic:
+    id: str
+    title: str = ""
+    summary: str = ""
+    url: str = ""
+    published_at: str = ""
+    published_ts: int | None = None
+    source_type: SourceType = SourceType.OTHER
+    credibility_tier: Tier = Tier.C
+    theme_tags: tuple[str, ...] = ()
+    key_claims: tuple[str, ...] = ()
+    why_it_matters: str = ""
+    risk_notes: str = ""
+    summary_snippet: bool = True
+    extra_snippets: tuple[str, ...] = ()
+    scores: dict[str, float] | None = None
+    extra: dict[str, Any] | None = field(default=None)
+
+    @property
+    def raw_text_snippets(self) -> list[str]:
+        head = [self.summary[:SNIPPET_CHARS]] if self.summary_snippet else []
+        return head + list(self.extra_snippets)
+
+    @property
+    def composite(self) -> float:
+        return float((self.scores or {}).get("composite", 0.0))
+
+    def add_snippet(self, snippet: str) -> None:
+        self.extra_snippets = self.extra_snippets + (snippet,)
+
+    @classmethod
+    def from_dict(cls, row: dict[str, Any]) -> Topic:
+        get = row.get
+        summary = get("summary") or ""
+        snippets = get("raw_text_snippets") or ()
+        summary_snippet = bool(snippets) and snippets[0] == summary[:SNIPPET_CHARS]
+        scores = get("scores")
+        return cls(
+            get("id") or "",
+            get("title") or "",
+            summary,
+            get("url") or "",
+            get("published_at") or "",
+            get("published_ts"),
+            _SOURCE_TYPES.get(get("source_type"), SourceType.OTHER),
+            Tier.parse(get("credibility_tier", "C")),
+            tuple(map(sys.intern, get("theme_tags") or ())),
+            tuple(get("key_claims") or ()),
+            get("why_it_matters") or "",
+            get("risk_notes") or "",
+            summary_snippet,
+            tuple(snippets[1:] if summary_snippet else snippets),
+            dict(scores) if isinstance(scores, dict) else None,
+            None if row.keys() <= KNOWN_KEYS else {k: v for k, v in row.items() if k not in KNOWN_KEYS},
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        row: dict[str, Any] = {
+            "id": self.id,
+            "title": self.title,
+            "summary": self.summary,
+            "url": self.url,
+            "published_at": self.published_at,
+            "published_ts": self.published_ts,
+            "source_type": self.source_type.value,
+            "credibility_tier": self.credibility_tier.value,
+            "theme_tags": list(self.theme_tags),
+            "key_claims": list(self.key_claims),
+            "why_it_matters": self.why_it_matters,
+            "risk_notes": self.risk_notes,
+            "raw_text_snippets": self.raw_text_snippets,
+        }
+        if self.scores is not None:
+            row["scores"] = dict(self.scores)
+        if self.extra:
+            row.update(self.extra)
+        return row
+
+
+def write_topics(path: Path, topics: Iterable[Topic], stage: str = "rank") -> bool:
+    return write_jsonl_artifact(path, (t.to_dict() for t in topics), stage)
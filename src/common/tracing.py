@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+from src.common.io import write_json
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self.started_at = time.time()
+        self.spans: list[dict[str, Any]] = []
+        self.counters: dict[str, float] = {}
+        self.events: list[dict[str, Any]] = []
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[dict[str, Any]]:
+        start = time.perf_counter()
+        record: dict[str, Any] = {"name": name, "attrs": dict(attrs)}
+        try:
+            yield record["attrs"]
+        except BaseException as exc:
+            record["attrs"]["error"] = type(exc).__name__
+            raise
+        finally:
+            end = time.perf_counter()
+            record["start_ms"] = round((start - self._origin) * 1000.0, 3)
+            record["duration_ms"] = round((end - start) * 1000.0, 3)
+            record["tid"] = threading.get_ident()
+            with self._lock:
+                self.spans.append(record)
+
+    def incr(self, name: str, value: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def event(self, name: str, **attrs: Any) -> None:
+        record = {"name": name, "at_ms": round((time.perf_counter() - self._origin) * 1000.0, 3), **attrs}
+        with self._lock:
+            self.events.append(record)
+
+    def stage_summary(self) -> dict[str, dict[str, float]]:
+        stages: dict[str, dict[str, float]] = {}
+        with self._lock:
+            spans = list(self.spans)
+        for s in spans:
+            agg = stages.setdefault(s["name"], {"count": 0, "total_ms": 0.0, "max_ms": 0.0, "errors": 0})
+            agg["count"] += 1
+            agg["total_ms"] = round(agg["total_ms"] + s["duration_ms"], 3)
+            agg["max_ms"] = max(agg["max_ms"], s["duration_ms"])
+            if "error" in s["attrs"]:
+                agg["errors"] += 1
+        return stages
+
+    def write_metrics(self, path: Path, extra: dict[str, Any] | None = None) -> None:
+        data: dict[str, Any] = dict(extra or {})
+        data["started_at"] = round(self.started_at, 3)
+        data["wall_ms"] = round((time.perf_counter() - self._origin) * 1000.0, 3)
+        data["stages"] = self.stage_summary()
+        with self._lock:
+            data["counters"] = dict(sorted(self.counters.items()))
+            if self.events:
+                data["events"] = list(self.events)
+        write_json(path, data)
+
+    def write_chrome_trace(self, path: Path) -> None:
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+            instants = list(self.events)
+        events: list[dict[str, Any]] = []
+        for s in sorted(spans, key=lambda x: x["start_ms"]):
+            events.append(
+                {
+                    "name": s["name"],
+                    "cat": s["name"].split(".", 1)[0],
+                    "ph": "X",
+                    "ts": round(s["start_ms"] * 1000.0),
+                    "dur": round(s["duration_ms"] * 1000.0),
+                    "pid": pid,
+                    "tid": s["tid"],
+                    "args": {k: v for k, v in s["attrs"].items() if isinstance(v, (str, int, float, bool))},
+                }
+            )
+        for e in instants:
+            args = {k: v for k, v in e.items() if k not in ("name", "at_ms") and isinstance(v, (str, int, float, bool))}
+            events.append(
+                {"name": e["name"], "ph": "i", "s": "p", "ts": round(e["at_ms"] * 1000.0), "pid": pid, "args": args}
+            )
+        end_ts = round((time.perf_counter() - self._origin) * 1_000_000)
+        for name, value in sorted(counters.items()):
+            events.append({"name": name, "ph": "C", "ts": end_ts, "pid": pid, "args": {"value": value}})
+        write_json(path, {"traceEvents": events, "displayTimeUnit": "ms"})
+
+
+_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def reset_tracer() -> Tracer:
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+
+def span(name: str, **attrs: Any):
+    return _tracer.span(name, **attrs)
+
+
+def incr(name: str, value: float = 1) -> None:
+    _tracer.incr(name, value)
+
+
+def event(name: str, **attrs: Any) -> None:
+    _tracer.event(name, **attrs)
@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import argparse
+import fcntl
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+from urllib.parse import urlparse
+
+import requests
+
+from src.common.io import read_json, read_yaml, write_json
+from src.common.prompts import WARMUP_SYSTEM_PROMPTS
+from src.common.tracing import incr, span
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _auto_select_gpus(tp_size: int) -> str | None:
+    try:
+        out = subprocess.check_output(
+            ["nvidia-smi", "--query-gpu=index,memory.used", "--format=csv,noheader,nounits"],
+            text=True,
+            timeout=10,
+        )
+    except Exception:
+        return None
+    rows = []
+    for line in out.strip().splitlines():
+        idx_s, used_s = [x.strip() for x in line.split(",")]
+        rows.append((int(idx_s), int(used_s)))
+    rows.sort(key=lambda x: x[1])
+    return ",".join(str(idx) for idx, _ in rows[:tp_size])
+
+
+class ServerManager:
+    def __init__(self, model_cfg: dict[str, Any], state_dir: Path):
+        self.cfg = model_cfg
+        self.api_base = str(model_cfg.get("api_base", "http://127.0.0.1:8000/v1")).rstrip("/")
+        self.model = str(model_cfg.get("model_name", ""))
+        self.api_key = str(model_cfg.get("api_key", "EMPTY"))
+        self.startup_timeout = int(model_cfg.get("startup_timeout_seconds", 900))
+        self.idle_shutdown = int(model_cfg.get("idle_shutdown_seconds", 1800))
+        self.dir = state_dir / "vllm"
+        self.registry_path = self.dir / "server.json"
+        self.lock_path = self.dir / "server.lock"
+        self.last_used_path = self.dir / "last_used"
+        self.leases_dir = self.dir / "leases"
+        self.log_path = self.dir / "server.log"
+
+    def command(self) -> list[str]:
+        custom = self.cfg.get("server_command")
+        if custom:
+            return [str(x) for x in custom]
+        parsed = urlparse(self.api_base)
+        cmd = [
+            "vllm",
+            "serve",
+            str(self.cfg.get("model_path") or self.model),
+            "--served-model-name",
+            self.model,
+            "--host",
+            parsed.hostname or "127.0.0.1",
+            "--port",
+            str(parsed.port or 8000),
+            "--tensor-parallel-size",
+            str(self.cfg.get("tensor_parallel_size", 2)),
+            "--gpu-memory-utilization",
+            str(self.cfg.get("gpu_memory_utilization", 0.75)),
+            "--max-model-len",
+            str(self.cfg.get("context_length", 8192)),
+        ]
+        if bool(self.cfg.get("enable_prefix_caching", True)):
+            cmd.append("--enable-prefix-caching")
+        return cmd
+
+    def _env(self) -> dict[str, str]:
+        env = dict(os.environ)
+        if not env.get("CUDA_VISIBLE_DEVICES") and bool(self.cfg.get("auto_select_gpus", True)):
+            picked = _auto_select_gpus(int(self.cfg.get("tensor_parallel_size", 2)))
+            if picked:
+                env["CUDA_VISIBLE_DEVICES"] = picked
+        return env
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with self.lock_path.open("a") as f:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    def registry(self) -> dict[str, Any]:
+        data = read_json(self.registry_path, default={})
+        return data if isinstance(data, dict) else {}
+
+    def touch(self) -> None:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.last_used_path.write_text(str(time.time()), encoding="utf-8")
+
+    def idle_seconds(self) -> float:
+        try:
+            return time.time() - float(self.last_used_path.read_text(encoding="utf-8").strip())
+        except Exception:
+            return 0.0
+
+    def probe(self, timeout: float = 10.0) -> bool:
+        payload = {
+            "model": self.model,
+            "messages": [{"role": "user", "content": "ping"}],
+            "max_tokens": 1,
+            "temperature": 0.0,
+        }
+        try:
+            resp = requests.post(
+                f"{self.api_base}/chat/completions",
+                headers={"Content-Type": "application/json", "Authorization": f"Bearer {self.api_key}"},
+                data=json.dumps(payload),
+                timeout=timeout,
+            )
+            return resp.ok and bool(resp.json().get("choices"))
+        except Exception:
+            return False
+
+    def warm_up(self, system_prompts: list[str] | None = None) -> None:
+        with span("server.warm_up"):
+            for prompt in system_prompts or WARMUP_SYSTEM_PROMPTS:
+                payload = {
+                    "model": self.model,
+                    "messages": [{"role": "system", "content": prompt}, {"role": "user", "content": "ready"}],
+                    "max_tokens": 1,
+                    "temperature": 0.0,
+                }
+                try:
+                    requests.post(
+                        f"{self.api_base}/chat/completions",
+                        headers={"Content-Type": "application/json", "Authorization": f"Bearer {self.api_key}"},
+                        data=json.dumps(payload),
+                        timeout=60,
+                    )
+                except Exception:
+                    incr("server.warm_up_errors")
+
+    def _start(self) -> dict[str, Any]:
+        self.dir.mkdir(parents=True, exist_ok=True)
+        cmd = self.command()
+        with self.log_path.open("ab") as log:
+            proc = subprocess.Popen(
+                cmd,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                env=self._env(),
+                cwd=str(REPO_ROOT),
+                start_new_session=True,
+            )
+        record = {
+            "pid": proc.pid,
+            "api_base": self.api_base,
+            "model": self.model,
+            "command": cmd,
+            "started_at": time.time(),
+            "idle_shutdown_seconds": self.idle_shutdown,
+        }
+        write_json(self.registry_path, record)
+        self.touch()
+
+        deadline = time.time() + self.startup_timeout
+        while time.time() < deadline:
+            if proc.poll() is not None:
+                self.registry_path.unlink(missing_ok=True)
+                raise RuntimeError(f"LLM server exited during startup; see {self.log_path}")
+            if self.probe(timeout=5.0):
+                record["ready_at"] = time.time()
+                write_json(self.registry_path, record)
+                return record
+            time.sleep(1.0)
+        self._terminate(proc.pid)
+        self.registry_path.unlink(missing_ok=True)
+        raise RuntimeError(f"LLM server not ready after {self.startup_timeout}s; see {self.log_path}")
+
+    def _spawn_watchdog(self) -> None:
+        if self.idle_shutdown <= 0:
+            return
+        subprocess.Popen(
+            [sys.executable, "-m", "src.common.vllm_server", "watchdog", "--state-dir", str(self.dir.parent)],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            cwd=str(REPO_ROOT),
+            start_new_session=True,
+        )
+
+    def ensure(self, warm_up: bool = True) -> dict[str, Any]:
+        with span("server.ensure") as attrs, self._locked():
+            record = self.registry()
+            if record and _pid_alive(int(record.get("pid", 0))) and self.probe():
+                attrs["reused"] = True
+                incr("server.reused")
+                self.touch()
+                return record
+            if self.probe():
+                attrs["external"] = True
+                return {"external": True, "api_base": self.api_base}
+            attrs["started"] = True
+            incr("server.started")
+            record = self._start()
+            self._spawn_watchdog()
+        if warm_up:
+            self.warm_up()
+        return record
+
+    @contextmanager
+    def lease(self) -> Iterator[None]:
+        self.leases_dir.mkdir(parents=True, exist_ok=True)
+        lease_path = self.leases_dir / f"{os.getpid()}.json"
+        write_json(lease_path, {"pid": os.getpid(), "acquired_at": time.time()})
+        try:
+            yield
+        finally:
+            lease_path.unlink(missing_ok=True)
+            self.touch()
+
+    def active_leases(self) -> int:
+        if not self.leases_dir.exists():
+            return 0
+        active = 0
+        for path in self.leases_dir.glob("*.json"):
+            try:
+                pid = int(path.stem)
+            except ValueError:
+                continue
+            if _pid_alive(pid):
+                active += 1
+            else:
+                path.unlink(missing_ok=True)
+        return active
+
+    def _terminate(self, pid: int, grace_seconds: float = 30.0) -> None:
+        try:
+            os.killpg(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return
+        deadline = time.time() + grace_seconds
+        while time.time() < deadline and _pid_alive(pid):
+            try:
+                os.waitpid(pid, os.WNOHANG)
+            except ChildProcessError:
+                pass
+            time.sleep(0.2)
+        if _pid_alive(pid):
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+
+    def stop(self) -> bool:
+        with self._locked():
+            record = self.registry()
+            pid = int(record.get("pid", 0))
+            if not _pid_alive(pid):
+                self.registry_path.unlink(missing_ok=True)
+                return False
+            self._terminate(pid)
+            self.registry_path.unlink(missing_ok=True)
+            return True
+
+    def watchdog(self, poll_seconds: float = 15.0) -> None:
+        while True:
+            time.sleep(poll_seconds)
+            record = self.registry()
+            if not record or not _pid_alive(int(record.get("pid", 0))):
+                return
+            if self.active_leases() > 0:
+                self.touch()
+                continue
+            if self.idle_seconds() >= float(record.get("idle_shutdown_seconds", self.idle_shutdown)):
+                self.stop()
+                return
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage the shared long-lived LLM server")
+    parser.add_argument("action", choices=["ensure", "status", "stop", "watchdog"])
+    parser.add_argument("--config", default=str(REPO_ROOT / "config" / "model.yaml"))
+    parser.add_argument("--state-dir", default=str(REPO_ROOT / "state"))
+    parser.add_argument("--poll-seconds", type=float, default=15.0)
+    args = parser.parse_args(argv)
+
+    manager = ServerManager(read_yaml(Path(args.config)), Path(args.state_dir))
+    if args.action == "ensure":
+        try:
+            record = manager.ensure()
+        except RuntimeError as exc:
+            print(f"Error: {exc}")
+            return 1
+        print(json.dumps(record))
+        return 0
+    if args.action == "status":
+        record = manager.registry()
+        alive = bool(record) and _pid_alive(int(record.get("pid", 0)))
+        print(
+            json.dumps(
+                {
+                    "running": alive,
+                    "ready": manager.probe() if alive else False,
+                    "active_leases": manager.active_leases(),
+                    "idle_seconds": round(manager.idle_seconds(), 1),
+                    **record,
+                }
+            )
+        )
+        return 0
+    if args.action == "stop":
+        print("stopped" if manager.stop() else "not running")
+        return 0
+    manager.watchdog(poll_seconds=args.poll_seconds)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
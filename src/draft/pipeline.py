@@ -1,22 +1,23 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Any
 
-from src.common.io import write_json
-from src.common.llm import LLMClient
+from src.common.artifacts import write_json_artifact, write_text_artifact
+from src.common.llm import ChatClient
+from src.common.prompts import DRAFT_SYSTEM_PROMPT
+from src.common.topic import Topic
+from src.draft.references import build_references
 
 
-def _first_claim(topic: dict[str, Any]) -> str:
-    claims = topic.get("key_claims") or []
-    if claims:
-        return claims[0]
+def _first_claim(topic: Topic) -> str:
+    if topic.key_claims:
+        return topic.key_claims[0]
     return "The public narrative overstates capability when evaluation scope is narrow."
 
 
-def _technical_anchor(topic: dict[str, Any]) -> str:
-    summary = (topic.get("summary") or "").lower()
+def _technical_anchor(topic: Topic) -> str:
+    summary = " ".join([topic.summary, *topic.key_claims, topic.risk_notes]).lower()
     if "benchmark" in summary or "eval" in summary:
         return "Technical anchor: benchmark choice and metric definition can hide failure transfer to real tasks."
     if "security" in summary or "threat" in summary:
@@ -24,14 +25,14 @@ def _technical_anchor(topic: dict[str, Any]) -> str:
     return "Technical anchor: claims should map to explicit metrics, boundary conditions, and error bars."
 
 
-def _systems_implication(topic: dict[str, Any]) -> str:
+def _systems_implication(topic: Topic) -> str:
     return (
         "Systems implication: organizations that separate model quality from governance quality "
         "will misprice operational risk, especially when incentives reward launch speed over eval depth."
     )
 
 
-def _judgment(topic: dict[str, Any]) -> str:
+def _judgment(topic: Topic) -> str:
     return (
         "Judgment: this is useful progress, but teams should delay broad rollout until they can reproduce "
         "results under their own threat model and monitoring constraints."
@@ -40,9 +41,9 @@ def _judgment(topic: dict[str, Any]) -> str:
 
 def generate_draft(
     post_spec: dict[str, Any],
-    topic: dict[str, Any],
+    topic: Topic,
     tone: list[str],
-    llm_client: LLMClient | None = None,
+    llm_client: ChatClient | None = None,
     model_cfg: dict[str, Any] | None = None,
 ) -> str:
     if llm_client is not None and model_cfg is not None:
@@ -52,7 +53,7 @@ def generate_draft(
             pass
 
     hook = post_spec["hook"]
-    title = topic.get("title", "Topic")
+    title = topic.title or "Topic"
     claim = _first_claim(topic)
     anchor = _technical_anchor(topic)
     systems = _systems_implication(topic)
@@ -79,51 +80,21 @@ def generate_draft(
 
 
 def generate_references(
-    topic: dict[str, Any],
-    llm_client: LLMClient | None = None,
+    topic: Topic,
+    llm_client: ChatClient | None = None,
     model_cfg: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
-    if llm_client is not None and model_cfg is not None:
-        try:
-            return _generate_references_llm(topic, llm_client, model_cfg)
-        except Exception:
-            pass
-
-    topic_id = topic.get("id", "unknown")
-    source = {
-        "title": topic.get("title", ""),
-        "url": topic.get("url", ""),
-        "id": topic_id.replace("source:", "", 1),
-    }
-    snippet = (topic.get("summary") or "").strip()
-    if len(snippet) > 220:
-        snippet = snippet[:220].rstrip() + "..."
-
-    return {
-        "sources": [source],
-        "evidence": [
-            {
-                "source_id": source["id"],
-                "snippet": snippet,
-                "note": "supports the post's central claim",
-            }
-        ],
-        "confidence": "medium",
-        "risk_flags": ["eval_unclear"] if "eval" in snippet.lower() else [],
-    }
+    return build_references([topic], llm_client, model_cfg)[0]
 
 
 def _generate_draft_llm(
     post_spec: dict[str, Any],
-    topic: dict[str, Any],
+    topic: Topic,
     tone: list[str],
-    llm_client: LLMClient,
+    llm_client: ChatClient,
     model_cfg: dict[str, Any],
 ) -> str:
-    system_prompt = (
-        "You write high-rigor LinkedIn posts for senior technical audiences. "
-        "Avoid hype. Include concrete, falsifiable claims."
-    )
+    system_prompt = DRAFT_SYSTEM_PROMPT
     user_prompt = f"""
 Write one LinkedIn post in markdown using this exact section order:
 1) Hook (1-2 lines)
@@ -146,64 +117,31 @@ Plan context:
 - Hook seed: {post_spec.get("hook")}
 
 Topic:
-- Title: {topic.get("title")}
-- Summary: {topic.get("summary")}
-- URL: {topic.get("url")}
-- Theme tags: {topic.get("theme_tags")}
+- Title: {topic.title}
+- Summary: {topic.summary}
+- URL: {topic.url}
+- Theme tags: {list(topic.theme_tags)}
 """.strip()
     out = llm_client.chat_completion(
         system_prompt=system_prompt,
         user_prompt=user_prompt,
         temperature=float((model_cfg.get("temperature") or {}).get("draft", 0.5)),
         max_tokens=int((model_cfg.get("max_tokens") or {}).get("draft", 900)),
+        call_type="draft",
     )
     return out.strip() + "\n"
 
 
-def _generate_references_llm(topic: dict[str, Any], llm_client: LLMClient, model_cfg: dict[str, Any]) -> dict[str, Any]:
-    system_prompt = "Return strict JSON only."
-    user_prompt = f"""
-Produce references JSON with schema:
-{{
-  "sources": [{{"title":"...","url":"...","id":"..."}}],
-  "evidence": [{{"source_id":"...","snippet":"...","note":"..."}}],
-  "confidence": "low|medium|high",
-  "risk_flags": ["..."]
-}}
-
-Use only this topic data:
-- id: {topic.get("id")}
-- title: {topic.get("title")}
-- summary: {topic.get("summary")}
-- url: {topic.get("url")}
-""".strip()
-    out = llm_client.chat_completion(
-        system_prompt=system_prompt,
-        user_prompt=user_prompt,
-        temperature=float((model_cfg.get("temperature") or {}).get("evaluation", 0.1)),
-        max_tokens=int((model_cfg.get("max_tokens") or {}).get("evaluation", 300)),
-        response_format={"type": "json_object"},
-    )
-    parsed = json.loads(out)
-    return {
-        "sources": parsed.get("sources", []),
-        "evidence": parsed.get("evidence", []),
-        "confidence": parsed.get("confidence", "medium"),
-        "risk_flags": parsed.get("risk_flags", []),
-    }
-
-
 def write_draft_bundle(
     out_dir: Path,
     post_index: int,
     draft_text: str,
     references: dict[str, Any],
 ) -> tuple[Path, Path]:
-    out_dir.mkdir(parents=True, exist_ok=True)
     draft_path = out_dir / f"post_{post_index:02d}.md"
     ref_path = out_dir / f"post_{post_index:02d}.references.json"
 
-    draft_path.write_text(draft_text, encoding="utf-8")
-    write_json(ref_path, references)
+    write_text_artifact(draft_path, draft_text, "draft")
+    write_json_artifact(ref_path, references, "draft")
 
     return draft_path, ref_path
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from src.common.llm import ChatClient
+from src.common.prompts import REFERENCES_SYSTEM_PROMPT
+from src.common.structured import parse_json
+from src.common.topic import Topic
+from src.common.tracing import incr, span
+
+
+CONFIDENCE_LEVELS = ("low", "medium", "high")
+SNIPPET_MAX_CHARS = 220
+MAX_EVIDENCE_PER_TOPIC = 3
+MAX_RISK_FLAGS = 5
+RISK_FLAG_RE = re.compile(r"^[a-z][a-z0-9_]{1,40}$")
+
+EXTRACTION_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "key": {"type": "string"},
+                    "evidence": {
+                        "type": "array",
+                        "maxItems": MAX_EVIDENCE_PER_TOPIC,
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "snippet": {"type": "string", "maxLength": SNIPPET_MAX_CHARS + 3},
+                                "note": {"type": "string"},
+                            },
+                            "required": ["snippet", "note"],
+                        },
+                    },
+                    "confidence": {"type": "string", "enum": list(CONFIDENCE_LEVELS)},
+                    "risk_flags": {
+                        "type": "array",
+                        "maxItems": MAX_RISK_FLAGS,
+                        "items": {"type": "string", "pattern": RISK_FLAG_RE.pattern},
+                    },
+                },
+                "required": ["key", "evidence", "confidence", "risk_flags"],
+            },
+        }
+    },
+    "required": ["items"],
+}
+
+
+def source_for(topic: Topic) -> dict[str, str]:
+    return {
+        "title": topic.title,
+        "url": topic.url,
+        "id": (topic.id or "unknown").replace("source:", "", 1),
+    }
+
+
+def _snippet(text: str) -> str:
+    snippet = str(text).strip()
+    if len(snippet) > SNIPPET_MAX_CHARS:
+        snippet = snippet[:SNIPPET_MAX_CHARS].rstrip() + "..."
+    return snippet
+
+
+def heuristic_references(topic: Topic) -> dict[str, Any]:
+    source = source_for(topic)
+    snippet = _snippet(topic.summary)
+    return {
+        "sources": [source],
+        "evidence": [
+            {
+                "source_id": source["id"],
+                "snippet": snippet,
+                "note": "supports the post's central claim",
+            }
+        ],
+        "confidence": "medium",
+        "risk_flags": ["eval_unclear"] if "eval" in snippet.lower() else [],
+    }
+
+
+def validate_extraction(item: Any) -> dict[str, Any] | None:
+    if not isinstance(item, dict):
+        return None
+    evidence = item.get("evidence")
+    flags = item.get("risk_flags")
+    confidence = item.get("confidence")
+    if not isinstance(evidence, list) or not isinstance(flags, list) or confidence not in CONFIDENCE_LEVELS:
+        return None
+    clean_evidence = []
+    for ev in evidence[:MAX_EVIDENCE_PER_TOPIC]:
+        if not isinstance(ev, dict) or not isinstance(ev.get("snippet"), str) or not isinstance(ev.get("note"), str):
+            return None
+        snippet = _snippet(" ".join(ev["snippet"].split()))
+        if snippet:
+            clean_evidence.append({"snippet": snippet, "note": ev["note"].strip()})
+    if not clean_evidence:
+        return None
+    clean_flags = []
+    for flag in flags[:MAX_RISK_FLAGS]:
+        if not isinstance(flag, str) or not RISK_FLAG_RE.match(flag):
+            return None
+        clean_flags.append(flag)
+    return {"evidence": clean_evidence, "confidence": confidence, "risk_flags": clean_flags}
+
+
+def assemble(topic: Topic, extraction: dict[str, Any]) -> dict[str, Any]:
+    source = source_for(topic)
+    return {
+        "sources": [source],
+        "evidence": [{"source_id": source["id"], **ev} for ev in extraction["evidence"]],
+        "confidence": extraction["confidence"],
+        "risk_flags": extraction["risk_flags"],
+    }
+
+
+def _batch_prompt(keyed: list[tuple[str, Topic]]) -> str:
+    lines = [
+        "For each topic below, extract evidence snippets quoted from its summary and flag risks.",
+        'Return JSON: {"items": [{"key": "...", "evidence": [{"snippet": "...", "note": "..."}], '
+        '"confidence": "low|medium|high", "risk_flags": ["snake_case_flag"]}]}',
+        f"One item per key. At most {MAX_EVIDENCE_PER_TOPIC} snippets per topic, each under "
+        f"{SNIPPET_MAX_CHARS} characters. Use only the topic data given.",
+        "",
+        "Topics:",
+    ]
+    for key, topic in keyed:
+        lines.append(f"- key: {key}")
+        lines.append(f"  title: {topic.title}")
+        lines.append(f"  summary: {' '.join(topic.summary.split())}")
+    return "\n".join(lines)
+
+
+def _extract_batch(
+    keyed: list[tuple[str, Topic]],
+    llm_client: ChatClient,
+    model_cfg: dict[str, Any],
+    escalated: bool = False,
+) -> dict[str, dict[str, Any]]:
+    per_topic = int((model_cfg.get("max_tokens") or {}).get("references", 200))
+    with span("references.batch", topics=len(keyed)):
+        out = llm_client.chat_completion(
+            system_prompt=REFERENCES_SYSTEM_PROMPT,
+            user_prompt=_batch_prompt(keyed),
+            temperature=float((model_cfg.get("temperature") or {}).get("evaluation", 0.1)),
+            max_tokens=per_topic * len(keyed),
+            call_type="references",
+            json_schema=EXTRACTION_SCHEMA,
+            escalated=escalated,
+        )
+    incr("references.batch_calls")
+    parsed = parse_json(out, "references")
+    items = parsed.get("items") if isinstance(parsed, dict) else None
+    if not isinstance(items, list):
+        raise ValueError("references batch response has no items list")
+    results: dict[str, dict[str, Any]] = {}
+    for item in items:
+        clean = validate_extraction(item)
+        if clean is not None and isinstance(item.get("key"), str):
+            results[item["key"]] = clean
+    return results
+
+
+def _extract_all(
+    keyed: list[tuple[str, Topic]],
+    llm_client: ChatClient,
+    model_cfg: dict[str, Any],
+    escalated: bool = False,
+) -> dict[str, dict[str, Any]]:
+    extracted: dict[str, dict[str, Any]] = {}
+    batch_size = max(1, int(model_cfg.get("references_batch_size", 8)))
+    batches = [keyed[i : i + batch_size] for i in range(0, len(keyed), batch_size)]
+    with ThreadPoolExecutor(max_workers=len(batches)) as pool:
+        futures = [pool.submit(_extract_batch, batch, llm_client, model_cfg, escalated) for batch in batches]
+        for future in futures:
+            try:
+                extracted.update(future.result())
+            except Exception:
+                incr("references.batch_errors")
+    return extracted
+
+
+def build_references(
+    topics: list[Topic],
+    llm_client: ChatClient | None = None,
+    model_cfg: dict[str, Any] | None = None,
+) -> list[dict[str, Any]]:
+    keyed = [(f"t{i:02d}", topic) for i, topic in enumerate(topics, start=1)]
+    extracted: dict[str, dict[str, Any]] = {}
+    if llm_client is not None and model_cfg is not None and keyed:
+        extracted = _extract_all(keyed, llm_client, model_cfg)
+        if llm_client.escalates("references"):
+            retry = [(k, t) for k, t in keyed if k not in extracted or extracted[k]["confidence"] == "low"]
+            if retry:
+                incr("llm.escalations")
+                incr("llm.escalations.references", len(retry))
+                extracted.update(_extract_all(retry, llm_client, model_cfg, escalated=True))
+
+    refs = []
+    for key, topic in keyed:
+        extraction = extracted.get(key)
+        if extraction is None:
+            if llm_client is not None and model_cfg is not None:
+                incr("references.fallbacks")
+            refs.append(heuristic_references(topic))
+        else:
+            refs.append(assemble(topic, extraction))
+    return refs
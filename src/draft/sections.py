@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import re
+
+
+SECTIONS = ("hook", "body", "technical_anchor", "systems_implication", "judgment", "prompt_question")
+SECTION_LABELS = {
+    "technical_anchor": "Technical anchor",
+    "systems_implication": "Systems implication",
+    "judgment": "Judgment",
+    "prompt_question": "Prompt question",
+}
+_LABEL_RE = re.compile(
+    r"^[#*_>\s]*(?:\d[.)]\s*)?"
+    r"(hook|body|technical anchor|systems implication|judge?ment|recommendation|prompt question)"
+    r"(?=\s*(?:[:*/(\n]|$))",
+    re.IGNORECASE,
+)
+_LABEL_SECTIONS = {
+    "hook": "hook",
+    "body": "body",
+    "technical anchor": "technical_anchor",
+    "systems implication": "systems_implication",
+    "judgment": "judgment",
+    "judgement": "judgment",
+    "recommendation": "judgment",
+    "prompt question": "prompt_question",
+}
+
+
+def _label(paragraph: str) -> str | None:
+    m = _LABEL_RE.match(paragraph)
+    return _LABEL_SECTIONS[m.group(1).lower()] if m else None
+
+
+def split_sections(text: str) -> dict[str, str]:
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text.strip()) if p.strip()]
+    parts: dict[str, list[str]] = {}
+    current = "hook"
+    implicit = True
+    last = len(paragraphs) - 1
+    for i, para in enumerate(paragraphs):
+        name = _label(para)
+        if name is not None:
+            current = name
+            implicit = False
+        elif i and i == last and current != "prompt_question" and para.endswith("?"):
+            current = "prompt_question"
+        elif i and implicit and current == "hook":
+            current = "body"
+        parts.setdefault(current, []).append(para)
+    return {name: "\n\n".join(paras) for name, paras in parts.items()}
+
+
+def join_sections(sections: dict[str, str]) -> str:
+    return "\n\n".join(text for text in sections.values() if text.strip()) + "\n"
+
+
+def with_label(name: str, text: str) -> str:
+    label = SECTION_LABELS.get(name)
+    text = text.strip()
+    if label is None or _label(text) == name:
+        return text
+    return f"{label}: {text}"
+
+
+def set_section(sections: dict[str, str], name: str, text: str) -> dict[str, str]:
+    if name in sections:
+        sections[name] = text
+        return sections
+    rank = SECTIONS.index(name)
+    ordered = list(sections.items())
+    at = next((i for i, (key, _) in enumerate(ordered) if key in SECTIONS and SECTIONS.index(key) > rank), len(ordered))
+    ordered.insert(at, (name, text))
+    sections.clear()
+    sections.update(ordered)
+    return sections
+
+
+def changed_sections(before: dict[str, str], after: dict[str, str]) -> set[str]:
+    return {name for name in set(before) | set(after) if before.get(name) != after.get(name)}
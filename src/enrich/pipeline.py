@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any
+
+from src.common.io import read_json, write_json
+from src.common.llm import ChatClient
+from src.common.prompts import REFERENCES_SYSTEM_PROMPT
+from src.common.structured import parse_json
+from src.common.topic import Topic
+from src.common.tracing import incr, span
+from src.ingest.pipeline import fetch_url
+
+
+EXTRACTOR_VERSION = "1"
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+CLAIM_RE = re.compile(
+    r"\b(\d+(\.\d+)?\s?%|\d+(\.\d+)?x|we (show|find|demonstrate|propose|introduce|report)|outperform\w*|"
+    r"reduc\w+|improv\w+|achiev\w+|increas\w+|decreas\w+|state-of-the-art)\b",
+    re.IGNORECASE,
+)
+RISK_RE = re.compile(
+    r"\b(limitation\w*|risk\w*|fail\w*|vulnerab\w+|attack\w*|misuse|bias\w*|unsafe|jailbreak\w*|leak\w*)\b",
+    re.IGNORECASE,
+)
+WHY_RE = re.compile(
+    r"\b(implication\w*|matters?|enables?|means that|important|deploy\w*|production|practitioners?)\b",
+    re.IGNORECASE,
+)
+MAX_CLAIMS = 3
+MAX_SENTENCE_CHARS = 300
+LLM_TEXT_CHARS = 1500
+
+ENRICHMENT_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "items": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "key": {"type": "string"},
+                    "key_claims": {
+                        "type": "array",
+                        "maxItems": MAX_CLAIMS,
+                        "items": {"type": "string", "maxLength": MAX_SENTENCE_CHARS},
+                    },
+                    "why_it_matters": {"type": "string", "maxLength": MAX_SENTENCE_CHARS},
+                    "risk_notes": {"type": "string", "maxLength": MAX_SENTENCE_CHARS},
+                },
+                "required": ["key", "key_claims", "why_it_matters", "risk_notes"],
+            },
+        }
+    },
+    "required": ["items"],
+}
+
+
+class _TextExtractor(HTMLParser):
+    SKIP = {"script", "style", "nav", "header", "footer", "aside", "form", "noscript", "svg"}
+    BLOCKS = {"p", "li", "blockquote", "h1", "h2", "h3", "pre", "td"}
+    MAIN = {"article", "main"}
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.skip_depth = 0
+        self.main_depth = 0
+        self.abstract_depth = 0
+        self.block_depth = 0
+        self.buf: list[str] = []
+        self.blocks: list[str] = []
+        self.main_blocks: list[str] = []
+        self.abstract: list[str] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        if tag in self.SKIP:
+            self.skip_depth += 1
+        elif tag in self.MAIN:
+            self.main_depth += 1
+        if tag == "blockquote" and "abstract" in (dict(attrs).get("class") or ""):
+            self.abstract_depth += 1
+        if tag in self.BLOCKS:
+            self._flush()
+            self.block_depth += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self.BLOCKS:
+            self._flush()
+            self.block_depth = max(0, self.block_depth - 1)
+        if tag == "blockquote" and self.abstract_depth:
+            self.abstract_depth -= 1
+        if tag in self.SKIP:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag in self.MAIN:
+            self.main_depth = max(0, self.main_depth - 1)
+
+    def handle_data(self, data: str) -> None:
+        if self.skip_depth or not self.block_depth:
+            return
+        self.buf.append(data)
+        if self.abstract_depth:
+            self.abstract.append(data)
+
+    def _flush(self) -> None:
+        text = " ".join("".join(self.buf).split())
+        self.buf = []
+        if len(text) < 40:
+            return
+        self.blocks.append(text)
+        if self.main_depth:
+            self.main_blocks.append(text)
+
+
+def extract_main_text(html: str, max_chars: int) -> str:
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    parser._flush()
+    abstract = " ".join("".join(parser.abstract).split())
+    if abstract:
+        text = re.sub(r"^abstract:\s*", "", abstract, flags=re.IGNORECASE)
+    else:
+        text = " ".join(parser.main_blocks or parser.blocks)
+    return text[:max_chars]
+
+
+def _sentences(text: str) -> list[str]:
+    return [s.strip()[:MAX_SENTENCE_CHARS] for s in SENTENCE_RE.split(text) if len(s.strip()) >= 30]
+
+
+def heuristic_enrichment(text: str) -> dict[str, Any]:
+    sentences = _sentences(text)
+    claims = [s for s in sentences if CLAIM_RE.search(s)][:MAX_CLAIMS]
+    risks = [s for s in sentences if RISK_RE.search(s)]
+    why = [s for s in sentences if WHY_RE.search(s) and s not in claims]
+    return {
+        "key_claims": claims,
+        "why_it_matters": why[0] if why else "",
+        "risk_notes": risks[0] if risks else "",
+    }
+
+
+def _llm_enrichment(
+    texts: dict[str, str],
+    llm_client: ChatClient,
+    model_cfg: dict[str, Any],
+) -> dict[str, dict[str, Any]]:
+    lines = [
+        "For each document below, list up to 3 concrete, checkable claims it makes, one sentence on why it",
+        "matters for teams deploying AI systems, and one sentence on its main risk or limitation.",
+        "Use only the document text. Return one item per key.",
+        "",
+    ]
+    for key, text in texts.items():
+        lines.append(f"- key: {key}")
+        lines.append(f"  text: {text[:LLM_TEXT_CHARS]}")
+    with span("enrich.llm", documents=len(texts)):
+        out = llm_client.chat_completion(
+            system_prompt=REFERENCES_SYSTEM_PROMPT,
+            user_prompt="\n".join(lines),
+            temperature=float((model_cfg.get("temperature") or {}).get("evaluation", 0.1)),
+            max_tokens=int((model_cfg.get("max_tokens") or {}).get("enrichment", 160)) * len(texts),
+            call_type="enrichment",
+            json_schema=ENRICHMENT_SCHEMA,
+        )
+    parsed = parse_json(out, "enrichment")
+    results: dict[str, dict[str, Any]] = {}
+    for item in parsed.get("items", []) if isinstance(parsed, dict) else []:
+        if not isinstance(item, dict) or item.get("key") not in texts:
+            continue
+        claims = [str(c)[:MAX_SENTENCE_CHARS] for c in item.get("key_claims") or [] if str(c).strip()]
+        results[item["key"]] = {
+            "key_claims": claims[:MAX_CLAIMS],
+            "why_it_matters": str(item.get("why_it_matters", ""))[:MAX_SENTENCE_CHARS],
+            "risk_notes": str(item.get("risk_notes", ""))[:MAX_SENTENCE_CHARS],
+        }
+    return results
+
+
+def _cache_get(cache_dir: Path, key: str) -> dict[str, Any] | None:
+    path = cache_dir / f"{key}.json"
+    if not path.exists():
+        return None
+    data = read_json(path, default=None)
+    if not isinstance(data, dict):
+        return None
+    os.utime(path)
+    return data
+
+
+def _cache_evict(cache_dir: Path, max_entries: int) -> int:
+    entries = sorted(cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for path in entries[max_entries:]:
+        path.unlink(missing_ok=True)
+    return max(0, len(entries) - max_entries)
+
+
+def enrich_topics(
+    topics: list[Topic],
+    enrich_cfg: dict[str, Any],
+    cache_dir: Path,
+    llm_client: ChatClient | None = None,
+    model_cfg: dict[str, Any] | None = None,
+) -> list[Topic]:
+    if not enrich_cfg.get("enabled", False) or not topics:
+        return topics
+    top_k = int(enrich_cfg.get("top_k", 10))
+    max_chars = int(enrich_cfg.get("max_chars", 20000))
+    timeout = float(enrich_cfg.get("fetch_timeout_seconds", 20))
+    use_llm = bool(enrich_cfg.get("use_llm", False)) and llm_client is not None and model_cfg is not None
+    mode = "llm" if use_llm else "heuristic"
+
+    head = [t for t in topics[:top_k] if t.url.startswith(("http://", "https://"))]
+    workers = max(1, min(int(enrich_cfg.get("fetch_concurrency", 8)), len(head) or 1))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        bodies = list(pool.map(lambda t: fetch_url(t.url, timeout)[0], head))
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    found: dict[str, dict[str, Any]] = {}
+    texts: dict[str, str] = {}
+    keys: dict[str, str] = {}
+    for topic, body in zip(head, bodies):
+        if not body:
+            continue
+        t_id = topic.id
+        content_hash = hashlib.sha1(body).hexdigest()
+        key = f"{mode}-v{EXTRACTOR_VERSION}-{content_hash}"
+        keys[t_id] = key
+        cached = _cache_get(cache_dir, key)
+        if cached is not None:
+            incr("enrich.cache_hits")
+            found[t_id] = cached
+            continue
+        incr("enrich.cache_misses")
+        with span("enrich.extract", bytes=len(body)):
+            texts[t_id] = extract_main_text(body.decode("utf-8", errors="replace"), max_chars)
+
+    extracted: dict[str, dict[str, Any]] = {}
+    if use_llm and texts:
+        try:
+            extracted = _llm_enrichment(texts, llm_client, model_cfg)
+        except Exception:
+            incr("enrich.llm_fallbacks")
+    for t_id, text in texts.items():
+        result = extracted.get(t_id) or heuristic_enrichment(text)
+        result["chars"] = len(text)
+        result["snippet"] = text[:300]
+        found[t_id] = result
+        if use_llm and t_id not in extracted:
+            continue
+        write_json(cache_dir / f"{keys[t_id]}.json", result)
+    incr("enrich.evicted", _cache_evict(cache_dir, int(enrich_cfg.get("cache_max_entries", 500))))
+
+    enriched = []
+    for topic in topics:
+        result = found.get(topic.id)
+        if result is None:
+            enriched.append(topic)
+            continue
+        t = replace(topic, extra=dict(topic.extra or {}))
+        if result.get("key_claims"):
+            t.key_claims = tuple(result["key_claims"])
+        if result.get("why_it_matters"):
+            t.why_it_matters = result["why_it_matters"]
+        if result.get("risk_notes"):
+            t.risk_notes = result["risk_notes"]
+        if result.get("snippet"):
+            t.add_snippet(result["snippet"])
+        t.extra["enrichment"] = {"content_hash": keys[topic.id].rsplit("-", 1)[-1][:16], "mode": mode}
+        enriched.append(t)
+    incr("enrich.topics", len(found))
+    return enriched
@@ -1,11 +1,121 @@
 from __future__ import annotations
 
 import json
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
-from src.common.io import write_json
-from src.common.llm import LLMClient
+from src.common.artifacts import write_json_artifact, write_text_artifact
+from src.common.llm import ChatClient, cascade
+from src.common.prompts import REVISION_SYSTEM_PROMPT, SCORER_SYSTEM_PROMPT
+from src.common.structured import parse_json, validate
+from src.common.tracing import incr, span
+from src.draft.sections import SECTIONS, changed_sections, join_sections, set_section, split_sections, with_label
+from src.memory.archive import ArchiveIndex
+from src.memory.digest import digest_text, max_similarity, most_similar, repeated_phrases
+
+
+PILLARS = ["insight_thinking", "research_translation", "field_reality", "leadership_mentorship", "personal_texture"]
+HOOK_TYPES = ["contrarian", "framework", "failure_story", "translation", "question", "observation", "announcement"]
+HARD_GATES = [
+    "has_technical_anchor",
+    "has_systems_implication",
+    "has_evaluative_judgment",
+    "hype_or_vague",
+    "ungrounded_factual_claims",
+    "too_academic_summary",
+    "too_influencer_style",
+]
+
+HARD_REJECTS = {"ungrounded_breakthrough_claim", "blacklist_phrase_detected", "missing_citations_for_factual_claims"}
+SPECULATED_REASONS = {"systems_strategic_below_threshold", "technical_rigor_below_threshold"}
+CANONICAL_REASONS = HARD_REJECTS | SPECULATED_REASONS
+REPEAT_RATIO_STEPS = (0.1, 0.3)
+NEAR_DUPLICATE_JACCARD = 0.5
+MAX_REPORTED_PHRASES = 5
+GATE_TIERS = ["heuristic_reject", "heuristic_pass", "heuristic", "llm"]
+SCORE_DIMENSIONS = ["systems_strategic", "technical_rigor", "clarity", "novelty"]
+HYPE_WORDS = ["breakthrough", "revolutionary", "game-changer"]
+REASON_SECTIONS = {
+    "technical_rigor_below_threshold": ("technical_anchor",),
+    "systems_strategic_below_threshold": ("systems_implication",),
+    "missing_citations_for_factual_claims": ("body",),
+}
+REASON_KEYWORDS = [
+    ("technical", "technical_anchor"),
+    ("rigor", "technical_anchor"),
+    ("anchor", "technical_anchor"),
+    ("system", "systems_implication"),
+    ("strategic", "systems_implication"),
+    ("judg", "judgment"),
+    ("evaluative", "judgment"),
+    ("recommend", "judgment"),
+    ("hook", "hook"),
+    ("influencer", "hook"),
+    ("question", "prompt_question"),
+    ("clarity", "body"),
+    ("hype", "body"),
+    ("vague", "body"),
+    ("academic", "body"),
+    ("citation", "body"),
+    ("ground", "body"),
+    ("novel", "body"),
+    ("repeat", "body"),
+]
+SECTION_CHECKS: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {
+    "hook": (("clarity", "novelty"), ("hype_or_vague", "too_influencer_style")),
+    "body": (("clarity", "novelty"), ("hype_or_vague", "ungrounded_factual_claims", "too_academic_summary")),
+    "technical_anchor": (("technical_rigor",), ("has_technical_anchor",)),
+    "systems_implication": (("systems_strategic",), ("has_systems_implication",)),
+    "judgment": ((), ("has_evaluative_judgment",)),
+    "prompt_question": (("clarity",), ()),
+}
+
+
+def _str_list(max_items: int, max_length: int = 200) -> dict[str, Any]:
+    return {"type": "array", "maxItems": max_items, "items": {"type": "string", "maxLength": max_length}}
+
+
+def _object(properties: dict[str, Any]) -> dict[str, Any]:
+    return {"type": "object", "properties": properties, "required": list(properties), "additionalProperties": False}
+
+
+SCORE_SCHEMA: dict[str, Any] = _object(
+    {
+        "scores": _object(
+            {
+                name: {"type": "integer", "minimum": 0, "maximum": 5}
+                for name in ["systems_strategic", "technical_rigor", "clarity", "novelty"]
+            }
+        ),
+        "hard_gates": _object({name: {"type": "boolean"} for name in HARD_GATES}),
+        "classification": _object(
+            {
+                "pillar": {"type": "string", "enum": PILLARS},
+                "hook_type": {"type": "string", "enum": HOOK_TYPES},
+                "themes": _str_list(5, 40),
+            }
+        ),
+        "pass_fail": _object({"passes": {"type": "boolean"}, "reasons": _str_list(6, 80)}),
+        "revision_notes": _object(
+            {
+                "top_3_fixes": _str_list(3),
+                "line_edits": _str_list(5),
+                "missing_elements": _str_list(5, 80),
+            }
+        ),
+        "tracking": _object(
+            {
+                "one_sentence_summary": {"type": "string", "maxLength": 240},
+                "key_claims": _str_list(5),
+                "systems_implications": _str_list(3),
+                "technical_anchors": _str_list(3),
+                "repeated_phrases_candidates": _str_list(5, 80),
+            }
+        ),
+        "reasoning_trace": _str_list(5),
+    }
+)
 
 
 def _contains_any(text: str, phrases: list[str]) -> bool:
@@ -18,7 +128,7 @@ def score_draft(
     references: dict[str, Any],
     rubric_cfg: dict[str, Any],
     blacklist_phrases: list[str],
-    history_texts: list[str],
+    history: list[dict[str, Any]],
 ) -> dict[str, Any]:
     t = draft_text.lower()
 
@@ -42,10 +152,10 @@ def score_draft(
         clarity += 1
 
     novelty = 4
-    recent_joined = "\n".join(history_texts).lower()
-    for marker in ["what evidence would change your deployment decision", "most teams are still optimizing"]:
-        if marker in t and marker in recent_joined:
-            novelty -= 1
+    repeated, repeat_ratio = repeated_phrases(draft_text, history)
+    novelty -= sum(1 for step in REPEAT_RATIO_STEPS if repeat_ratio >= step)
+    if max_similarity(digest_text(draft_text), history) >= NEAR_DUPLICATE_JACCARD:
+        novelty = 0
 
     systems = min(5, systems)
     rigor = min(5, rigor)
@@ -59,7 +169,7 @@ def score_draft(
     if rigor < int(thresholds.get("technical_rigor", 4)):
         fails.append("technical_rigor_below_threshold")
 
-    if _contains_any(t, ["breakthrough", "revolutionary", "game-changer"]):
+    if _contains_any(t, HYPE_WORDS):
         fails.append("ungrounded_breakthrough_claim")
     if _contains_any(t, blacklist_phrases):
         fails.append("blacklist_phrase_detected")
@@ -75,15 +185,25 @@ def score_draft(
         },
         "passed": len(fails) == 0,
         "fail_reasons": fails,
+        "repeated_phrases": repeated[:MAX_REPORTED_PHRASES],
     }
 
 
 def revise_draft_once(draft_text: str, fail_reasons: list[str]) -> str:
-    revised = draft_text
-    if "systems_strategic_below_threshold" in fail_reasons and "Systems implication:" not in revised:
-        revised += "\nSystems implication: incentives and governance structure determine whether technical gains translate safely.\n"
-    if "technical_rigor_below_threshold" in fail_reasons and "Technical anchor:" not in revised:
-        revised += "\nTechnical anchor: define the metric and threat model before claiming reliability improvements.\n"
+    sections = split_sections(draft_text)
+    if "systems_strategic_below_threshold" in fail_reasons and "systems_implication" not in sections:
+        set_section(
+            sections,
+            "systems_implication",
+            "Systems implication: incentives and governance structure determine whether technical gains translate safely.",
+        )
+    if "technical_rigor_below_threshold" in fail_reasons and "technical_anchor" not in sections:
+        set_section(
+            sections,
+            "technical_anchor",
+            "Technical anchor: define the metric and threat model before claiming reliability improvements.",
+        )
+    revised = join_sections(sections)
     if "blacklist_phrase_detected" in fail_reasons:
         for phrase in ["game-changer", "revolutionary", "AI is changing everything"]:
             revised = revised.replace(phrase, "important")
@@ -98,26 +218,26 @@ def score_draft_with_llm(
     references: dict[str, Any],
     rubric_cfg: dict[str, Any],
     blacklist_phrases: list[str],
-    history_texts: list[str],
-    llm_client: LLMClient,
+    history: list[dict[str, Any]],
+    llm_client: ChatClient,
     model_cfg: dict[str, Any],
+    escalated: bool = False,
 ) -> dict[str, Any]:
     thresholds = rubric_cfg.get("thresholds", {})
-    recent_post_summaries = []
-    for text in history_texts[-10:]:
-        lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-        recent_post_summaries.append(" ".join(lines[:3])[:320])
-
-    system_prompt = """
-You are a strict LinkedIn-post quality judge. Your job is to score a single draft post for a specific positioning goal:
-- HIGH Systems & Strategic Thinking
-- HIGH Technical Rigor
-The author targets a senior, cross-industry audience.
-You must be brutally honest, consistent, and conservative with high scores.
-Do not reward hype, vagueness, or paper-summary-only content.
-
-You MUST output valid JSON only matching the schema. No markdown. No commentary outside JSON.
-""".strip()
+    recent_post_summaries = [
+        d["summary"] for d in most_similar(digest_text(draft_text), history, 10) if d.get("summary")
+    ]
+
+    output_spec = (
+        "PASS THRESHOLDS: "
+        f"systems_strategic>={int(thresholds.get('systems_strategic', 4))}, "
+        f"technical_rigor>={int(thresholds.get('technical_rigor', 4))}, "
+        f"clarity>={int(thresholds.get('clarity', 3))}, "
+        f"novelty>={int(thresholds.get('novelty', 3))}"
+    )
+    if str(model_cfg.get("structured_output", "json_schema")) == "json_object":
+        output_spec += "\n\nOUTPUT JSON SCHEMA:\n" + json.dumps(SCORE_SCHEMA, indent=1)
+    system_prompt = SCORER_SYSTEM_PROMPT
     user_prompt = f"""
 TASK
 Score the draft on 0-5 integer dimensions: systems_strategic, technical_rigor, clarity, novelty.
@@ -153,86 +273,32 @@ SOURCES>>>
 RECENT>>>
 BLACKLIST: {blacklist_phrases}
 
-OUTPUT JSON SCHEMA:
-{{
-  "scores": {{
-    "systems_strategic": 0,
-    "technical_rigor": 0,
-    "clarity": 0,
-    "novelty": 0
-  }},
-  "hard_gates": {{
-    "has_technical_anchor": false,
-    "has_systems_implication": false,
-    "has_evaluative_judgment": false,
-    "hype_or_vague": false,
-    "ungrounded_factual_claims": false,
-    "too_academic_summary": false,
-    "too_influencer_style": false
-  }},
-  "classification": {{
-    "pillar": "",
-    "hook_type": "",
-    "themes": []
-  }},
-  "pass_fail": {{
-    "thresholds": {{
-      "systems_strategic_min": {int(thresholds.get("systems_strategic", 4))},
-      "technical_rigor_min": {int(thresholds.get("technical_rigor", 4))},
-      "clarity_min": {int(thresholds.get("clarity", 3))},
-      "novelty_min": {int(thresholds.get("novelty", 3))}
-    }},
-    "passes": false,
-    "reasons": []
-  }},
-  "revision_notes": {{
-    "top_3_fixes": [],
-    "line_edits": [],
-    "missing_elements": []
-  }},
-  "tracking": {{
-    "one_sentence_summary": "",
-    "key_claims": [],
-    "systems_implications": [],
-    "technical_anchors": [],
-    "repeated_phrases_candidates": []
-  }},
-  "reasoning_trace": []
-}}
+{output_spec}
 """.strip()
     raw = llm_client.chat_completion(
         system_prompt=system_prompt,
         user_prompt=user_prompt,
         temperature=float((model_cfg.get("temperature") or {}).get("evaluation", 0.1)),
         max_tokens=max(800, int((model_cfg.get("max_tokens") or {}).get("evaluation", 300))),
-        response_format={"type": "json_object"},
+        call_type="score",
+        json_schema=SCORE_SCHEMA,
+        escalated=escalated,
     )
-    parsed = json.loads(raw)
+    parsed = parse_json(raw, "score")
+    if not isinstance(parsed, dict):
+        raise ValueError("scorer output is not a JSON object")
+    if validate(parsed, SCORE_SCHEMA):
+        incr("gate.schema_violations")
     scores = parsed.get("scores", {})
-    normalized = {
-        "systems_strategic": max(0, min(5, int(scores.get("systems_strategic", 0)))),
-        "technical_rigor": max(0, min(5, int(scores.get("technical_rigor", 0)))),
-        "clarity": max(0, min(5, int(scores.get("clarity", 0)))),
-        "novelty": max(0, min(5, int(scores.get("novelty", 0)))),
-    }
+    normalized = {name: max(0, min(5, int(scores.get(name, 0)))) for name in SCORE_DIMENSIONS}
     pass_fail = parsed.get("pass_fail", {})
     fail_reasons = pass_fail.get("reasons", parsed.get("fail_reasons", []))
     if not isinstance(fail_reasons, list):
         fail_reasons = []
-    passed = bool(pass_fail.get("passes", parsed.get("passed", False)))
-    thresholds = rubric_cfg.get("thresholds", {})
-    if normalized["systems_strategic"] < int(thresholds.get("systems_strategic", 4)):
-        if "systems_strategic_below_threshold" not in fail_reasons:
-            fail_reasons.append("systems_strategic_below_threshold")
-        passed = False
-    if normalized["technical_rigor"] < int(thresholds.get("technical_rigor", 4)):
-        if "technical_rigor_below_threshold" not in fail_reasons:
-            fail_reasons.append("technical_rigor_below_threshold")
-        passed = False
     hard_gates = parsed.get("hard_gates", {})
-    if bool(hard_gates.get("ungrounded_factual_claims")) and "missing_citations_for_factual_claims" not in fail_reasons:
-        fail_reasons.append("missing_citations_for_factual_claims")
-        passed = False
+    forced = _threshold_reasons(normalized, hard_gates if isinstance(hard_gates, dict) else {}, rubric_cfg)
+    fail_reasons.extend(r for r in forced if r not in fail_reasons)
+    passed = bool(pass_fail.get("passes", parsed.get("passed", False))) and not forced
     return {
         "scores": normalized,
         "passed": passed,
@@ -246,13 +312,205 @@ OUTPUT JSON SCHEMA:
     }
 
 
+def _borderline(scores: dict[str, int], rubric_cfg: dict[str, Any], model_cfg: dict[str, Any]) -> bool:
+    margin = int((model_cfg.get("routing") or {}).get("borderline_margin", 0))
+    thresholds = rubric_cfg.get("thresholds", {})
+    return any(
+        int(thresholds[name]) - 1 <= value <= int(thresholds[name]) + margin
+        for name, value in scores.items()
+        if name in thresholds
+    )
+
+
+def _threshold_reasons(scores: dict[str, int], hard_gates: dict[str, Any], rubric_cfg: dict[str, Any]) -> list[str]:
+    thresholds = rubric_cfg.get("thresholds", {})
+    reasons = []
+    if scores["systems_strategic"] < int(thresholds.get("systems_strategic", 4)):
+        reasons.append("systems_strategic_below_threshold")
+    if scores["technical_rigor"] < int(thresholds.get("technical_rigor", 4)):
+        reasons.append("technical_rigor_below_threshold")
+    if bool(hard_gates.get("ungrounded_factual_claims")):
+        reasons.append("missing_citations_for_factual_claims")
+    return reasons
+
+
+def _reason_sections(reason: str, sections: dict[str, str], blacklist_phrases: list[str]) -> set[str]:
+    if reason in ("blacklist_phrase_detected", "ungrounded_breakthrough_claim"):
+        phrases = blacklist_phrases if reason == "blacklist_phrase_detected" else HYPE_WORDS
+        return {name for name, text in sections.items() if _contains_any(text, phrases)}
+    if reason in REASON_SECTIONS:
+        return set(REASON_SECTIONS[reason])
+    lowered = str(reason).lower()
+    return {name for key, name in REASON_KEYWORDS if key in lowered}
+
+
+def sections_for_reasons(
+    fail_reasons: list[str],
+    sections: dict[str, str],
+    blacklist_phrases: list[str],
+) -> set[str] | None:
+    targets: set[str] = set()
+    for reason in fail_reasons:
+        matched = _reason_sections(reason, sections, blacklist_phrases)
+        if not matched:
+            return None
+        targets |= matched
+    if not targets or targets >= set(sections):
+        return None
+    return targets
+
+
+def score_sections_with_llm(
+    draft_text: str,
+    changed: set[str],
+    previous: dict[str, Any],
+    references: dict[str, Any],
+    rubric_cfg: dict[str, Any],
+    blacklist_phrases: list[str],
+    history: list[dict[str, Any]],
+    llm_client: ChatClient,
+    model_cfg: dict[str, Any],
+    escalated: bool = False,
+) -> dict[str, Any]:
+    sections = split_sections(draft_text)
+    dims = [d for d in SCORE_DIMENSIONS if any(d in SECTION_CHECKS[name][0] for name in changed)]
+    gates = [g for g in HARD_GATES if any(g in SECTION_CHECKS[name][1] for name in changed)]
+    properties: dict[str, Any] = {}
+    if dims:
+        properties["scores"] = _object({name: {"type": "integer", "minimum": 0, "maximum": 5} for name in dims})
+    if gates:
+        properties["hard_gates"] = _object({name: {"type": "boolean"} for name in gates})
+    properties["pass_fail"] = _object({"passes": {"type": "boolean"}, "reasons": _str_list(6, 80)})
+    schema = _object(properties)
+
+    thresholds = rubric_cfg.get("thresholds", {})
+    revised = "\n".join(
+        f"<<<{name}\n{sections.get(name, '(missing)')}\n{name}>>>" for name in SECTIONS if name in changed
+    )
+    context = "" if "hook" in changed else f"HOOK (context only): {sections.get('hook', '')}\n"
+    if "ungrounded_factual_claims" in gates:
+        context += f"<<<SOURCES\n{references}\nSOURCES>>>\n"
+    if "novelty" in dims:
+        recent = [d["summary"] for d in most_similar(digest_text(draft_text), history, 5) if d.get("summary")]
+        context += f"<<<RECENT\n{recent}\nRECENT>>>\n"
+    output_spec = "PASS THRESHOLDS: " + ", ".join(f"{d}>={int(thresholds.get(d, 3))}" for d in dims)
+    if str(model_cfg.get("structured_output", "json_schema")) == "json_object":
+        output_spec += "\n\nOUTPUT JSON SCHEMA:\n" + json.dumps(schema, indent=1)
+    user_prompt = f"""
+TASK
+Only the sections below were revised in a draft that was already scored.
+Re-check just these scores: {dims or "none"} and hard gates: {gates or "none"}.
+Judge the revised sections only; report fail reasons for them alone.
+
+{context}INPUTS
+{revised}
+BLACKLIST: {blacklist_phrases}
+
+{output_spec}
+""".strip()
+    raw = llm_client.chat_completion(
+        system_prompt=SCORER_SYSTEM_PROMPT,
+        user_prompt=user_prompt,
+        temperature=float((model_cfg.get("temperature") or {}).get("evaluation", 0.1)),
+        max_tokens=int((model_cfg.get("max_tokens") or {}).get("evaluation", 300)),
+        call_type="score_sections",
+        json_schema=schema,
+        escalated=escalated,
+    )
+    parsed = parse_json(raw, "score_sections")
+    if not isinstance(parsed, dict):
+        raise ValueError("section scorer output is not a JSON object")
+    if validate(parsed, schema):
+        incr("gate.schema_violations")
+
+    new_scores = parsed.get("scores", {}) if dims else {}
+    scores = dict(previous["scores"])
+    for name in dims:
+        scores[name] = max(0, min(5, int(new_scores.get(name, scores.get(name, 0)))))
+    new_gates = parsed.get("hard_gates", {}) if gates else {}
+    hard_gates = dict(previous.get("hard_gates") or {})
+    for name in gates:
+        hard_gates[name] = bool(new_gates.get(name, hard_gates.get(name, False)))
+    pass_fail = parsed.get("pass_fail", {})
+    if not isinstance(pass_fail, dict):
+        pass_fail = {}
+    rechecked = pass_fail.get("reasons", [])
+    if not isinstance(rechecked, list):
+        rechecked = []
+    kept = [
+        r
+        for r in previous["fail_reasons"]
+        if r not in CANONICAL_REASONS and not (_reason_sections(r, sections, blacklist_phrases) or {""}) <= changed
+    ]
+    fail_reasons = kept + [str(r) for r in rechecked if isinstance(r, str) and r not in kept]
+    forced = _threshold_reasons(scores, hard_gates, rubric_cfg)
+    fail_reasons.extend(r for r in forced if r not in fail_reasons)
+    incr("gate.targeted_rescores")
+    return {
+        **previous,
+        "scores": scores,
+        "hard_gates": hard_gates,
+        "passed": bool(pass_fail.get("passes", False)) and not forced and not kept,
+        "fail_reasons": fail_reasons,
+        "rechecked": {"sections": sorted(changed), "scores": dims, "hard_gates": gates},
+    }
+
+
+def revise_sections_with_llm(
+    draft_text: str,
+    targets: set[str],
+    fail_reasons: list[str],
+    llm_client: ChatClient,
+    model_cfg: dict[str, Any],
+) -> str:
+    sections = split_sections(draft_text)
+    ordered = [name for name in SECTIONS if name in targets]
+    schema = _object({"sections": _object({name: {"type": "string", "maxLength": 1200} for name in ordered})})
+    current = "\n".join(f"- section: {name}\n{sections.get(name, '(missing: write it)')}" for name in ordered)
+    output_spec = ""
+    if str(model_cfg.get("structured_output", "json_schema")) == "json_object":
+        output_spec = "\n\nOUTPUT JSON SCHEMA:\n" + json.dumps(schema, indent=1)
+    user_prompt = f"""
+Rewrite only these sections of a LinkedIn draft to address fail reasons:
+{fail_reasons}
+
+Hard constraints:
+- Keep same topic and tone; keep each section's label (e.g. "Technical anchor:").
+- Keep each section under 80 words, concise and non-hype.
+- Return every listed section, nothing else.
+
+Hook (context only):
+{sections.get("hook", "")}
+
+Sections:
+{current}{output_spec}
+""".strip()
+    budget = int((model_cfg.get("max_tokens") or {}).get("revision", 700))
+    raw = llm_client.chat_completion(
+        system_prompt=REVISION_SYSTEM_PROMPT,
+        user_prompt=user_prompt,
+        temperature=float((model_cfg.get("temperature") or {}).get("revision", 0.2)),
+        max_tokens=max(160, budget * len(ordered) // len(SECTIONS)),
+        call_type="revision_sections",
+        json_schema=schema,
+    )
+    parsed = parse_json(raw, "revision_sections")
+    revised = parsed.get("sections") if isinstance(parsed, dict) else None
+    if not isinstance(revised, dict) or not all(str(revised.get(name) or "").strip() for name in ordered):
+        raise ValueError("section revision output is missing sections")
+    for name in ordered:
+        set_section(sections, name, with_label(name, str(revised[name])))
+    incr("gate.sections_revised", len(ordered))
+    return join_sections(sections)
+
+
 def revise_draft_with_llm(
     draft_text: str,
     fail_reasons: list[str],
-    llm_client: LLMClient,
+    llm_client: ChatClient,
     model_cfg: dict[str, Any],
 ) -> str:
-    system_prompt = "You revise technical posts with minimal edits. Return markdown only."
+    system_prompt = REVISION_SYSTEM_PROMPT
     user_prompt = f"""
 Revise this draft to address fail reasons:
 {fail_reasons}
@@ -272,72 +530,232 @@ Draft:
             user_prompt=user_prompt,
             temperature=float((model_cfg.get("temperature") or {}).get("revision", 0.2)),
             max_tokens=int((model_cfg.get("max_tokens") or {}).get("revision", 700)),
+            call_type="revision",
         ).strip()
         + "\n"
     )
 
 
+def _gate_tier(heuristic: dict[str, Any], rubric_cfg: dict[str, Any], llm_available: bool) -> str:
+    tiered = rubric_cfg.get("tiered_gate") or {}
+    if llm_available and not tiered.get("enabled", False):
+        return "llm"
+    if HARD_REJECTS & set(heuristic["fail_reasons"]):
+        return "heuristic_reject"
+    if not llm_available:
+        return "heuristic"
+    margin = tiered.get("heuristic_pass_margin")
+    thresholds = rubric_cfg.get("thresholds", {})
+    if margin is not None and heuristic["passed"]:
+        if all(int(v) >= int(thresholds.get(k, 0)) + int(margin) for k, v in heuristic["scores"].items()):
+            return "heuristic_pass"
+    return "llm"
+
+
+def _revise(
+    draft_text: str,
+    fail_reasons: list[str],
+    llm_client: ChatClient | None,
+    model_cfg: dict[str, Any] | None,
+    blacklist_phrases: list[str] | None = None,
+) -> str:
+    if llm_client is not None and model_cfg is not None:
+        try:
+            targets = sections_for_reasons(fail_reasons, split_sections(draft_text), blacklist_phrases or [])
+            if targets is not None:
+                return revise_sections_with_llm(draft_text, targets, fail_reasons, llm_client, model_cfg)
+            incr("gate.full_revisions")
+            return revise_draft_with_llm(
+                draft_text=draft_text,
+                fail_reasons=fail_reasons,
+                llm_client=llm_client,
+                model_cfg=model_cfg,
+            )
+        except Exception:
+            incr("gate.revision_fallbacks")
+    return revise_draft_once(draft_text, fail_reasons)
+
+
+def _discard_speculation(speculative: Future, counter: str) -> None:
+    incr(counter)
+    if speculative.cancel():
+        return
+    with span("gate.speculative_drain"):
+        try:
+            speculative.result()
+        except Exception:
+            pass
+
+
+def gate_tier_rates(counters: dict[str, float]) -> dict[str, float]:
+    total = sum(counters.get(f"gate.tier.{tier}", 0) for tier in GATE_TIERS)
+    if not total:
+        return {}
+    return {tier: round(counters.get(f"gate.tier.{tier}", 0) / total, 4) for tier in GATE_TIERS}
+
+
 def quality_gate(
     draft_path: Path,
     references: dict[str, Any],
     rubric_cfg: dict[str, Any],
     blacklist_phrases: list[str],
-    history_texts: list[str],
-    llm_client: LLMClient | None = None,
+    history: list[dict[str, Any]],
+    llm_client: ChatClient | None = None,
     model_cfg: dict[str, Any] | None = None,
     max_revisions: int = 2,
+    archive: ArchiveIndex | None = None,
+    archive_key: str = "",
 ) -> dict[str, Any]:
     draft_text = draft_path.read_text(encoding="utf-8")
-    if llm_client is not None and model_cfg is not None:
-        try:
-            result = score_draft_with_llm(
-                draft_text=draft_text,
-                references=references,
-                rubric_cfg=rubric_cfg,
-                blacklist_phrases=blacklist_phrases,
-                history_texts=history_texts,
-                llm_client=llm_client,
-                model_cfg=model_cfg,
-            )
-        except Exception:
-            result = score_draft(draft_text, references, rubric_cfg, blacklist_phrases, history_texts)
-    else:
-        result = score_draft(draft_text, references, rubric_cfg, blacklist_phrases, history_texts)
+    llm_available = llm_client is not None and model_cfg is not None
+    tiered = rubric_cfg.get("tiered_gate") or {}
+    speculate = llm_available and bool(tiered.get("enabled", False) and tiered.get("speculative_revision", True))
+    pool = ThreadPoolExecutor(max_workers=1) if speculate and max_revisions > 0 else None
 
     revision_count = 0
-    while not result["passed"] and revision_count < max_revisions:
-        if llm_client is not None and model_cfg is not None:
-            try:
-                draft_text = revise_draft_with_llm(
+    tiers: list[str] = []
+    judged: dict[str, Any] | None = None
+    changed: set[str] | None = None
+    try:
+        while True:
+            speculative: Future | None = None
+            speculated_reasons: set[str] = set()
+            with span("gate.score", post=draft_path.name, iteration=revision_count) as attrs:
+                scoring_history = history
+                if archive is not None:
+                    known = archive.known_phrases(draft_text, exclude=[archive_key])
+                    scoring_history = history + [{"phrases": known}]
+                heuristic = score_draft(draft_text, references, rubric_cfg, blacklist_phrases, scoring_history)
+                tier = _gate_tier(heuristic, rubric_cfg, llm_available)
+                if tier == "llm":
+                    if pool is not None and revision_count < max_revisions and not heuristic["passed"]:
+                        speculated_reasons = set(heuristic["fail_reasons"]) | SPECULATED_REASONS
+                        speculative = pool.submit(
+                            _revise, draft_text, sorted(speculated_reasons), llm_client, model_cfg, blacklist_phrases
+                        )
+                    result = _rescore(
+                        draft_text,
+                        changed,
+                        judged,
+                        references,
+                        rubric_cfg,
+                        blacklist_phrases,
+                        scoring_history,
+                        llm_client,
+                        model_cfg,
+                    )
+                    if "hard_gates" in result:
+                        judged = result
+                        changed = set()
+                else:
+                    result = heuristic
+                attrs["tier"] = tier
+                attrs["passed"] = result["passed"]
+            incr(f"gate.tier.{tier}")
+            tiers.append(tier)
+
+            if result["passed"] or revision_count >= max_revisions:
+                if speculative is not None:
+                    _discard_speculation(speculative, "gate.speculative_wasted")
+                break
+
+            before = split_sections(draft_text)
+            with span("gate.revise", post=draft_path.name, iteration=revision_count + 1) as attrs:
+                if speculative is not None and set(result["fail_reasons"]) <= speculated_reasons:
+                    draft_text = speculative.result()
+                    attrs["speculative"] = True
+                    incr("gate.speculative_used")
+                else:
+                    if speculative is not None:
+                        _discard_speculation(speculative, "gate.speculative_discarded")
+                    draft_text = _revise(draft_text, result["fail_reasons"], llm_client, model_cfg, blacklist_phrases)
+                revised = changed_sections(before, split_sections(draft_text))
+                attrs["sections"] = sorted(revised)
+                if changed is not None:
+                    changed |= revised
+            write_text_artifact(draft_path, draft_text, "gate")
+            revision_count += 1
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    incr("gate.revisions", revision_count)
+    incr("gate.passed" if result["passed"] else "gate.failed")
+    result["revision_count"] = revision_count
+    result["gate_tiers"] = tiers
+    score_path = draft_path.with_name(draft_path.stem + "_score.json")
+    write_json_artifact(score_path, result, "gate")
+    result["score_path"] = str(score_path)
+    return result
+
+
+def _rescore(
+    draft_text: str,
+    changed: set[str] | None,
+    judged: dict[str, Any] | None,
+    references: dict[str, Any],
+    rubric_cfg: dict[str, Any],
+    blacklist_phrases: list[str],
+    history: list[dict[str, Any]],
+    llm_client: ChatClient | None,
+    model_cfg: dict[str, Any] | None,
+) -> dict[str, Any]:
+    targeted = judged is not None and changed is not None and changed < set(split_sections(draft_text))
+    if targeted and llm_client is not None and model_cfg is not None:
+        if not changed:
+            incr("gate.rescore_skipped")
+            return judged
+        try:
+            return cascade(
+                llm_client,
+                "score_sections",
+                lambda escalated: score_sections_with_llm(
                     draft_text=draft_text,
-                    fail_reasons=result["fail_reasons"],
+                    changed=changed,
+                    previous=judged,
+                    references=references,
+                    rubric_cfg=rubric_cfg,
+                    blacklist_phrases=blacklist_phrases,
+                    history=history,
                     llm_client=llm_client,
                     model_cfg=model_cfg,
-                )
-            except Exception:
-                draft_text = revise_draft_once(draft_text, result["fail_reasons"])
-        else:
-            draft_text = revise_draft_once(draft_text, result["fail_reasons"])
-        draft_path.write_text(draft_text, encoding="utf-8")
-        if llm_client is not None and model_cfg is not None:
-            try:
-                result = score_draft_with_llm(
+                    escalated=escalated,
+                ),
+                lambda result: not _borderline(
+                    {k: result["scores"][k] for k in result["rechecked"]["scores"]}, rubric_cfg, model_cfg
+                ),
+            )
+        except Exception:
+            incr("gate.score_fallbacks")
+    return _score(draft_text, references, rubric_cfg, blacklist_phrases, history, llm_client, model_cfg)
+
+
+def _score(
+    draft_text: str,
+    references: dict[str, Any],
+    rubric_cfg: dict[str, Any],
+    blacklist_phrases: list[str],
+    history: list[dict[str, Any]],
+    llm_client: ChatClient | None,
+    model_cfg: dict[str, Any] | None,
+) -> dict[str, Any]:
+    if llm_client is not None and model_cfg is not None:
+        try:
+            return cascade(
+                llm_client,
+                "score",
+                lambda escalated: score_draft_with_llm(
                     draft_text=draft_text,
                     references=references,
                     rubric_cfg=rubric_cfg,
                     blacklist_phrases=blacklist_phrases,
-                    history_texts=history_texts,
+                    history=history,
                     llm_client=llm_client,
                     model_cfg=model_cfg,
-                )
-            except Exception:
-                result = score_draft(draft_text, references, rubric_cfg, blacklist_phrases, history_texts)
-        else:
-            result = score_draft(draft_text, references, rubric_cfg, blacklist_phrases, history_texts)
-        revision_count += 1
-
-    result["revision_count"] = revision_count
-    score_path = draft_path.with_name(draft_path.stem + "_score.json")
-    write_json(score_path, result)
-    result["score_path"] = str(score_path)
-    return result
+                    escalated=escalated,
+                ),
+                lambda result: not _borderline(result["scores"], rubric_cfg, model_cfg),
+            )
+        except Exception:
+            incr("gate.score_fallbacks")
+    return score_draft(draft_text, references, rubric_cfg, blacklist_phrases, history)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+from datetime import date
+from typing import Any
+from urllib.parse import urlencode
+
+
+ARXIV_API = "http://export.arxiv.org/api/query"
+ID_LIST_MAX = 100
+ENTRY_RE = re.compile(rb"<entry[\s>]")
+TOTAL_RE = re.compile(rb"<opensearch:totalResults[^>]*>\s*(\d+)\s*<")
+VERSION_RE = re.compile(r"v(\d+)$")
+
+
+class Pacer:
+    def __init__(self, interval_seconds: float) -> None:
+        self.interval = max(0.0, interval_seconds)
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            delay = self._next - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next = time.monotonic() + self.interval
+
+
+def date_filter(since: date, until: date) -> str:
+    return f"submittedDate:[{since:%Y%m%d}0000 TO {until:%Y%m%d}2359]"
+
+
+def search_query(query: str, since: date | None, until: date) -> str:
+    if since is None:
+        return query
+    return f"({query}) AND {date_filter(since, until)}"
+
+
+def query_url(api_url: str, search: str, start: int, max_results: int) -> str:
+    params = {
+        "search_query": search,
+        "start": start,
+        "max_results": max_results,
+        "sortBy": "submittedDate",
+        "sortOrder": "descending",
+    }
+    return f"{api_url}?{urlencode(params)}"
+
+
+def id_list_url(api_url: str, ids: list[str]) -> str:
+    return f"{api_url}?{urlencode({'id_list': ','.join(ids), 'max_results': len(ids)})}"
+
+
+def page_info(body: bytes) -> tuple[int, int | None]:
+    match = TOTAL_RE.search(body)
+    return len(ENTRY_RE.findall(body)), int(match.group(1)) if match else None
+
+
+def split_version(arxiv_id: str) -> tuple[str, int]:
+    match = VERSION_RE.search(arxiv_id)
+    if not match:
+        return arxiv_id, 0
+    return arxiv_id[: match.start()], int(match.group(1))
+
+
+def topic_arxiv_id(topic: dict[str, Any]) -> str:
+    return str(topic.get("id", "")).rsplit(":", 1)[-1]
+
+
+def dedupe_rows(rows: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], int]:
+    best: dict[str, tuple[int, int]] = {}
+    for i, row in enumerate(rows):
+        base, version = split_version(topic_arxiv_id(row))
+        if base not in best or version > best[base][1]:
+            best[base] = (i, version)
+    keep = sorted(i for i, _ in best.values())
+    return [rows[i] for i in keep], len(rows) - len(keep)
+
+
+def batches(ids: list[str], size: int) -> list[list[str]]:
+    size = max(1, min(size, ID_LIST_MAX))
+    return [ids[i : i + size] for i in range(0, len(ids), size)]
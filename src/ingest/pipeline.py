@@ -1,17 +1,61 @@
 from __future__ import annotations
 
-from datetime import date
+import asyncio
+import hashlib
+import os
+import time
+from contextlib import nullcontext
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
 from typing import Any
-from urllib.parse import quote_plus
 
 import feedparser
+import requests
 
-from src.common.io import write_jsonl
-from src.common.time_utils import iso_date
+from src.common.artifacts import write_json_artifact, write_jsonl_artifact
+from src.common.io import read_jsonl
+from src.ingest import arxiv
+from src.ingest.registry import load_registry, plan_fetches, prune_sources, record_fetch, save_registry
+from src.common.time_utils import day_start_ts, iso_date, parse_timestamp, struct_ts, ts_date
+from src.common.tracing import incr, span
 
 
-ARXIV_API = "http://export.arxiv.org/api/query"
+USER_AGENT = "linkedin-manager-bot/1.0 (+feedparser)"
+
+
+def fetch_url(url: str, timeout: float, headers: dict[str, str] | None = None) -> tuple[bytes, dict[str, str], str]:
+    with span("ingest.fetch", url=url) as attrs:
+        try:
+            resp = requests.get(url, timeout=timeout, headers={"User-Agent": USER_AGENT, **(headers or {})})
+            resp.raise_for_status()
+        except Exception as exc:
+            attrs["error"] = type(exc).__name__
+            incr("ingest.fetch_errors")
+            return b"", {}, type(exc).__name__
+        if resp.status_code == 304:
+            attrs["not_modified"] = True
+            incr("ingest.not_modified")
+            return b"", dict(resp.headers), "not_modified"
+        body = resp.content
+        attrs["bytes"] = len(body)
+        incr("ingest.bytes_fetched", len(body))
+        return body, dict(resp.headers), "ok"
+
+
+def _header(headers: dict[str, str], name: str) -> str:
+    for key, value in headers.items():
+        if key.lower() == name:
+            return str(value)
+    return ""
+
+
+def _fetch_timeout(sources_cfg: dict[str, Any]) -> float:
+    return float(sources_cfg.get("fetch_timeout_seconds", 30))
+
+
+def _stable_digest(key: str) -> str:
+    return str(int(hashlib.sha1(key.encode("utf-8")).hexdigest()[:12], 16))[:10]
 
 
 def _credibility_from_url(url: str) -> str:
@@ -28,74 +72,311 @@ def _theme_tags(text: str, themes: list[str]) -> list[str]:
     return [t for t in themes if t.replace("_", " ") in lowered or t in lowered]
 
 
-def ingest_arxiv(sources_cfg: dict[str, Any], themes: list[str], run_date: date) -> list[dict[str, Any]]:
-    if not sources_cfg.get("arxiv", {}).get("enabled", True):
-        return []
+def _published(entry: Any, keys: tuple[str, ...], run_date: date) -> tuple[str, int]:
+    for key in keys:
+        ts = struct_ts(entry.get(f"{key}_parsed")) or parse_timestamp(str(entry.get(key) or ""))
+        if ts is not None:
+            return ts_date(ts), ts
+    return iso_date(run_date), day_start_ts(run_date)
 
+
+def _arxiv_rows(feed: Any, themes: list[str], run_date: date) -> list[dict[str, Any]]:
     rows: list[dict[str, Any]] = []
-    queries = sources_cfg.get("arxiv", {}).get("queries", [])
-    max_results = int(sources_cfg.get("arxiv", {}).get("max_results_per_query", 25))
-
-    for q in queries:
-        url = f"{ARXIV_API}?search_query={quote_plus(q)}&start=0&max_results={max_results}"
-        feed = feedparser.parse(url)
-        for entry in feed.entries:
-            summary = (entry.get("summary") or "").replace("\n", " ").strip()
-            title = (entry.get("title") or "").replace("\n", " ").strip()
-            published = (entry.get("published") or "")[:10]
-            entry_id = entry.get("id", "")
-            arxiv_id = entry_id.split("/")[-1] if entry_id else "unknown"
-            text = f"{title} {summary}"
-            rows.append(
-                {
-                    "id": f"source:arxiv:{arxiv_id}",
-                    "title": title,
-                    "summary": summary,
-                    "url": entry.get("link", entry_id),
-                    "published_at": published or iso_date(run_date),
-                    "source_type": "arxiv",
-                    "credibility_tier": "A",
-                    "theme_tags": _theme_tags(text, themes),
-                    "key_claims": [],
-                    "why_it_matters": "",
-                    "risk_notes": "",
-                    "raw_text_snippets": [summary[:300]],
-                }
-            )
+    for entry in feed.entries:
+        summary = (entry.get("summary") or "").replace("\n", " ").strip()
+        title = (entry.get("title") or "").replace("\n", " ").strip()
+        published, published_ts = _published(entry, ("published", "updated"), run_date)
+        entry_id = entry.get("id", "")
+        arxiv_id = entry_id.split("/")[-1] if entry_id else "unknown"
+        text = f"{title} {summary}"
+        rows.append(
+            {
+                "id": f"source:arxiv:{arxiv_id}",
+                "title": title,
+                "summary": summary,
+                "url": entry.get("link", entry_id),
+                "published_at": published,
+                "published_ts": published_ts,
+                "source_type": "arxiv",
+                "credibility_tier": "A",
+                "theme_tags": _theme_tags(text, themes),
+                "key_claims": [],
+                "why_it_matters": "",
+                "risk_notes": "",
+                "raw_text_snippets": [summary[:300]],
+            }
+        )
     return rows
 
 
-def ingest_rss(sources_cfg: dict[str, Any], themes: list[str], run_date: date) -> list[dict[str, Any]]:
-    if not sources_cfg.get("rss", {}).get("enabled", True):
-        return []
-
+def _rss_rows(feed: Any, feed_url: str, themes: list[str], run_date: date) -> list[dict[str, Any]]:
     rows: list[dict[str, Any]] = []
-    feeds = sources_cfg.get("rss", {}).get("feeds", [])
-    for feed_url in feeds:
-        parsed = feedparser.parse(feed_url)
-        for entry in parsed.entries[:30]:
-            title = (entry.get("title") or "").strip()
-            summary = (entry.get("summary") or "").replace("\n", " ").strip()
-            text = f"{title} {summary}"
-            url = entry.get("link", feed_url)
-            published = (entry.get("published") or entry.get("updated") or "")[:10]
-            digest = str(abs(hash(f"{title}:{url}")))[:10]
-            rows.append(
-                {
-                    "id": f"source:rss:{digest}",
-                    "title": title,
-                    "summary": summary,
-                    "url": url,
-                    "published_at": published or iso_date(run_date),
-                    "source_type": "rss",
-                    "credibility_tier": _credibility_from_url(url),
-                    "theme_tags": _theme_tags(text, themes),
-                    "key_claims": [],
-                    "why_it_matters": "",
-                    "risk_notes": "",
-                    "raw_text_snippets": [summary[:300]],
-                }
+    for entry in feed.entries[:30]:
+        title = (entry.get("title") or "").strip()
+        summary = (entry.get("summary") or "").replace("\n", " ").strip()
+        text = f"{title} {summary}"
+        url = entry.get("link", feed_url)
+        published, published_ts = _published(entry, ("published", "updated", "created"), run_date)
+        digest = _stable_digest(f"{title}:{url}")
+        rows.append(
+            {
+                "id": f"source:rss:{digest}",
+                "title": title,
+                "summary": summary,
+                "url": url,
+                "published_at": published,
+                "published_ts": published_ts,
+                "source_type": "rss",
+                "credibility_tier": _credibility_from_url(url),
+                "theme_tags": _theme_tags(text, themes),
+                "key_claims": [],
+                "why_it_matters": "",
+                "risk_notes": "",
+                "raw_text_snippets": [summary[:300]],
+            }
+        )
+    return rows
+
+
+def _parse_job(
+    kind: str,
+    url: str,
+    body: bytes,
+    headers: dict[str, str],
+    themes: list[str],
+    run_date: date,
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    cpu_start = time.process_time()
+    feed = feedparser.parse(body, response_headers=headers)
+    rows = _arxiv_rows(feed, themes, run_date) if kind == "arxiv" else _rss_rows(feed, url, themes, run_date)
+    stats: dict[str, Any] = {
+        "entries": len(feed.entries),
+        "parse_cpu_ms": round((time.process_time() - cpu_start) * 1000.0, 3),
+    }
+    if feed.get("bozo"):
+        problem = type(feed.get("bozo_exception")).__name__
+        stats["error" if not feed.entries else "warning"] = f"parse:{problem}"
+    return rows, stats
+
+
+def feed_jobs(sources_cfg: dict[str, Any]) -> list[tuple[str, str]]:
+    jobs: list[tuple[str, str]] = []
+    arxiv_cfg = sources_cfg.get("arxiv", {})
+    if arxiv_cfg.get("enabled", True):
+        for q in arxiv_cfg.get("queries", []):
+            jobs.append(("arxiv", str(q)))
+    rss_cfg = sources_cfg.get("rss", {})
+    if rss_cfg.get("enabled", True):
+        for feed_url in rss_cfg.get("feeds", []):
+            jobs.append(("rss", str(feed_url)))
+    return jobs
+
+
+def _arxiv_pacer(arxiv_cfg: dict[str, Any]) -> arxiv.Pacer:
+    return arxiv.Pacer(float(arxiv_cfg.get("request_interval_seconds", 3)))
+
+
+def _paced_request(pacer: arxiv.Pacer, url: str, timeout: float) -> tuple[bytes, dict[str, str], str]:
+    pacer.wait()
+    return fetch_url(url, timeout)
+
+
+def _arxiv_since(
+    source: str,
+    registry: dict[str, Any] | None,
+    arxiv_cfg: dict[str, Any],
+    run_date: date,
+    freshness_days: int,
+) -> date:
+    since = run_date - timedelta(days=freshness_days)
+    rec = (registry or {}).get("sources", {}).get(source) or {}
+    if rec.get("last_success_at"):
+        last = min(datetime.fromtimestamp(float(rec["last_success_at"]), tz=timezone.utc).date(), run_date)
+        since = max(since, last - timedelta(days=int(arxiv_cfg.get("overlap_days", 3))))
+    return since
+
+
+async def _fetch_parse_pipeline(
+    jobs: list[tuple[str, str]],
+    sources_cfg: dict[str, Any],
+    themes: list[str],
+    run_date: date,
+    fetch_pool: ThreadPoolExecutor,
+    parse_pool: ProcessPoolExecutor,
+    parse_workers: int,
+    fetch_opts: dict[str, dict[str, Any]],
+) -> list[tuple[list[dict[str, Any]], dict[str, Any]]]:
+    loop = asyncio.get_running_loop()
+    timeout = _fetch_timeout(sources_cfg)
+    arxiv_cfg = sources_cfg.get("arxiv", {})
+    api_url = str(arxiv_cfg.get("api_url", arxiv.ARXIV_API))
+    page_size = max(1, int(arxiv_cfg.get("page_size", 50)))
+    max_results = int(arxiv_cfg.get("max_results_per_query", 25))
+    pacer = _arxiv_pacer(arxiv_cfg)
+    fetch_slots = asyncio.Semaphore(max(1, int(sources_cfg.get("fetch_concurrency", 8))))
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, int(sources_cfg.get("parse_queue_size", 2 * parse_workers))))
+    results: list[tuple[list[dict[str, Any]], dict[str, Any]]] = [
+        ([], {"kind": kind, "url": source, "bytes": 0, "fetch_ms": 0.0, "entries": 0, "parse_cpu_ms": 0.0})
+        for kind, source in jobs
+    ]
+
+    async def fetch_rss(i: int, url: str) -> None:
+        async with fetch_slots:
+            opts = fetch_opts.get(url, {})
+            start = time.perf_counter()
+            body, headers, status = await loop.run_in_executor(
+                fetch_pool, fetch_url, url, float(opts.get("timeout", timeout)), opts.get("headers")
             )
+            fetch_ms = round((time.perf_counter() - start) * 1000.0, 3)
+        await queue.put((i, "rss", url, body, headers, status, fetch_ms))
+
+    async def fetch_arxiv(i: int, query: str) -> None:
+        opts = fetch_opts.get(query, {})
+        search = arxiv.search_query(query, opts.get("since"), run_date)
+        offset = 0
+        while offset < max_results:
+            size = min(page_size, max_results - offset)
+            url = arxiv.query_url(api_url, search, offset, size)
+            async with fetch_slots:
+                start = time.perf_counter()
+                body, headers, status = await loop.run_in_executor(
+                    fetch_pool, _paced_request, pacer, url, float(opts.get("timeout", timeout))
+                )
+                fetch_ms = round((time.perf_counter() - start) * 1000.0, 3)
+            await queue.put((i, "arxiv", url, body, headers, status, fetch_ms))
+            entries, total = arxiv.page_info(body)
+            offset += entries
+            if not body or entries < size or (total is not None and offset >= total):
+                return
+        incr("ingest.arxiv_truncated")
+
+    async def parse() -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            i, kind, url, body, headers, status, fetch_ms = item
+            rows, stats = results[i]
+            stats["bytes"] += len(body)
+            stats["fetch_ms"] = round(stats["fetch_ms"] + fetch_ms, 3)
+            if kind == "arxiv":
+                stats["pages"] = stats.get("pages", 0) + 1
+            else:
+                for field, name in (("etag", "etag"), ("last_modified", "last-modified")):
+                    if _header(headers, name):
+                        stats[field] = _header(headers, name)
+            if status == "not_modified":
+                stats["status"] = status
+                continue
+            if not body:
+                stats["error"] = status if status != "ok" else "empty_body"
+                continue
+            with span("ingest.parse", url=url, bytes=len(body)) as attrs:
+                try:
+                    page_rows, parsed = await loop.run_in_executor(
+                        parse_pool, _parse_job, kind, url, body, headers, themes, run_date
+                    )
+                except Exception as exc:
+                    incr("ingest.parse_errors")
+                    page_rows, parsed = [], {"entries": 0, "parse_cpu_ms": 0.0, "error": type(exc).__name__}
+                attrs.update(parsed)
+            rows.extend(page_rows)
+            stats["entries"] += int(parsed.get("entries", 0))
+            stats["parse_cpu_ms"] = round(stats["parse_cpu_ms"] + float(parsed.get("parse_cpu_ms", 0.0)), 3)
+            for field in ("error", "warning"):
+                if parsed.get(field):
+                    stats[field] = parsed[field]
+            if str(parsed.get("error", "")).startswith("parse:"):
+                incr("ingest.parse_errors")
+            incr("ingest.parse_cpu_ms", float(parsed.get("parse_cpu_ms", 0.0)))
+
+    parsers = [asyncio.create_task(parse()) for _ in range(parse_workers)]
+    await asyncio.gather(
+        *(fetch_arxiv(i, src) if kind == "arxiv" else fetch_rss(i, src) for i, (kind, src) in enumerate(jobs))
+    )
+    for _ in parsers:
+        await queue.put(None)
+    await asyncio.gather(*parsers)
+    return results
+
+
+def ingest_feeds(
+    sources_cfg: dict[str, Any],
+    themes: list[str],
+    run_date: date,
+    registry: dict[str, Any] | None = None,
+    now: float | None = None,
+    freshness_days: int = 14,
+    parse_pool: ProcessPoolExecutor | None = None,
+) -> tuple[dict[str, list[dict[str, Any]]], list[dict[str, Any]]]:
+    jobs = feed_jobs(sources_cfg)
+    rows: dict[str, list[dict[str, Any]]] = {"arxiv": [], "rss": []}
+    now = time.time() if now is None else now
+    fetch_opts: dict[str, dict[str, Any]] = {}
+    skipped: list[dict[str, Any]] = []
+    if registry is not None:
+        prune_sources(registry, [source for _, source in jobs])
+        jobs, fetch_opts, skipped = plan_fetches(
+            jobs, registry, sources_cfg.get("schedule") or {}, now, _fetch_timeout(sources_cfg)
+        )
+        incr("ingest.feeds_skipped", len(skipped))
+    if not jobs:
+        return rows, skipped
+    arxiv_cfg = sources_cfg.get("arxiv", {})
+    for kind, source in jobs:
+        if kind == "arxiv":
+            opts = fetch_opts.setdefault(source, {})
+            opts["since"] = _arxiv_since(source, registry, arxiv_cfg, run_date, freshness_days)
+            opts.pop("headers", None)
+    parse_workers = int(sources_cfg.get("parse_workers", 0)) or (os.cpu_count() or 1)
+    parse_workers = max(1, min(parse_workers, len(jobs)))
+    fetch_workers = max(1, min(int(sources_cfg.get("fetch_concurrency", 8)), len(jobs)))
+    own_pool = nullcontext(parse_pool) if parse_pool is not None else ProcessPoolExecutor(max_workers=parse_workers)
+    with ThreadPoolExecutor(max_workers=fetch_workers) as fetch_pool, own_pool as pool:
+        results = asyncio.run(
+            _fetch_parse_pipeline(jobs, sources_cfg, themes, run_date, fetch_pool, pool, parse_workers, fetch_opts)
+        )
+    feed_stats = []
+    for (kind, source), (job_rows, stats) in zip(jobs, results):
+        for row in job_rows:
+            row["fetched_from"] = [source]
+        rows[kind].extend(job_rows)
+        feed_stats.append(stats)
+        if registry is not None:
+            record_fetch(registry, stats, job_rows, now)
+    origins: dict[str, set[str]] = {}
+    for row in rows["arxiv"]:
+        origins.setdefault(arxiv.split_version(arxiv.topic_arxiv_id(row))[0], set()).update(row["fetched_from"])
+    rows["arxiv"], duplicates = arxiv.dedupe_rows(rows["arxiv"])
+    for row in rows["arxiv"]:
+        row["fetched_from"] = sorted(origins[arxiv.split_version(arxiv.topic_arxiv_id(row))[0]])
+    incr("ingest.arxiv_duplicates", duplicates)
+    return rows, feed_stats + skipped
+
+
+def refresh_arxiv(
+    topic_ids: list[str],
+    sources_cfg: dict[str, Any],
+    themes: list[str],
+    run_date: date,
+) -> list[dict[str, Any]]:
+    arxiv_cfg = sources_cfg.get("arxiv", {})
+    if not topic_ids or not arxiv_cfg.get("enabled", True):
+        return []
+    api_url = str(arxiv_cfg.get("api_url", arxiv.ARXIV_API))
+    pacer = _arxiv_pacer(arxiv_cfg)
+    timeout = _fetch_timeout(sources_cfg)
+    bases = list(dict.fromkeys(arxiv.split_version(t_id)[0] for t_id in topic_ids))
+    rows: list[dict[str, Any]] = []
+    for batch in arxiv.batches(bases, int(arxiv_cfg.get("refresh_batch_size", arxiv.ID_LIST_MAX))):
+        url = arxiv.id_list_url(api_url, batch)
+        incr("ingest.arxiv_refresh_calls")
+        body, headers, _ = _paced_request(pacer, url, timeout)
+        if not body:
+            continue
+        with span("ingest.parse", url=url, bytes=len(body)):
+            batch_rows, _ = _parse_job("arxiv", url, body, headers, themes, run_date)
+        rows.extend(batch_rows)
     return rows
 
 
@@ -108,7 +389,7 @@ def ingest_standards(sources_cfg: dict[str, Any], themes: list[str], run_date: d
         title = item.get("title", "")
         url = item.get("url", "")
         text = f"{title} {url}"
-        digest = str(abs(hash(f"{title}:{url}")))[:10]
+        digest = _stable_digest(f"{title}:{url}")
         rows.append(
             {
                 "id": f"source:standard:{digest}",
@@ -116,6 +397,7 @@ def ingest_standards(sources_cfg: dict[str, Any], themes: list[str], run_date: d
                 "summary": "Governance or security standard relevant to trustworthy deployment.",
                 "url": url,
                 "published_at": iso_date(run_date),
+                "published_ts": day_start_ts(run_date),
                 "source_type": "standard",
                 "credibility_tier": item.get("credibility_tier", "A"),
                 "theme_tags": _theme_tags(text, themes),
@@ -123,29 +405,65 @@ def ingest_standards(sources_cfg: dict[str, Any], themes: list[str], run_date: d
                 "why_it_matters": "",
                 "risk_notes": "",
                 "raw_text_snippets": [title],
+                "fetched_from": [url],
             }
         )
     return rows
 
 
+def _merge_rows(path: Path, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    by_id = {row.get("id"): row for row in rows}
+    kept = []
+    for row in read_jsonl(path):
+        fresh = by_id.get(row.get("id"))
+        if fresh is None:
+            kept.append(row)
+        elif "fetched_from" in fresh:
+            fresh["fetched_from"] = sorted(set(fresh["fetched_from"]) | set(row.get("fetched_from") or ()))
+    return kept + rows
+
+
 def run_ingest(
     raw_dir: str,
     run_date: date,
     sources_cfg: dict[str, Any],
     user_cfg: dict[str, Any],
+    registry_path: Path | None = None,
+    parse_pool: ProcessPoolExecutor | None = None,
+    merge: bool = False,
 ) -> dict[str, str]:
     themes = user_cfg.get("themes", [])
-    arxiv_rows = ingest_arxiv(sources_cfg, themes, run_date)
-    rss_rows = ingest_rss(sources_cfg, themes, run_date)
-    standards_rows = ingest_standards(sources_cfg, themes, run_date)
+    registry = load_registry(registry_path) if registry_path is not None else None
+    with span("ingest.feeds") as attrs:
+        feed_rows, feed_stats = ingest_feeds(
+            sources_cfg,
+            themes,
+            run_date,
+            registry,
+            freshness_days=int(user_cfg.get("freshness_days", 14)),
+            parse_pool=parse_pool,
+        )
+        arxiv_rows = feed_rows["arxiv"]
+        rss_rows = feed_rows["rss"]
+        attrs["entries"] = len(arxiv_rows) + len(rss_rows)
+    with span("ingest.standards") as attrs:
+        standards_rows = ingest_standards(sources_cfg, themes, run_date)
+        attrs["entries"] = len(standards_rows)
+    incr("ingest.entries", len(arxiv_rows) + len(rss_rows) + len(standards_rows))
 
     arxiv_path = f"{raw_dir}/arxiv.jsonl"
     rss_path = f"{raw_dir}/rss.jsonl"
     standards_path = f"{raw_dir}/standards.jsonl"
 
-    write_jsonl(path=Path(arxiv_path), rows=arxiv_rows)
-    write_jsonl(path=Path(rss_path), rows=rss_rows)
-    write_jsonl(path=Path(standards_path), rows=standards_rows)
+    if merge:
+        arxiv_rows = _merge_rows(Path(arxiv_path), arxiv_rows)
+        rss_rows = _merge_rows(Path(rss_path), rss_rows)
+    write_jsonl_artifact(Path(arxiv_path), arxiv_rows, "ingest")
+    write_jsonl_artifact(Path(rss_path), rss_rows, "ingest")
+    write_jsonl_artifact(Path(standards_path), standards_rows, "ingest")
+    write_json_artifact(Path(raw_dir) / "ingest_stats.json", {"feeds": feed_stats}, "ingest")
+    if registry is not None:
+        save_registry(registry_path, registry)
 
     return {
         "arxiv": arxiv_path,
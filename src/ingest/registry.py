@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+from src.common.io import read_json, write_json
+
+
+LATENCY_ALPHA = 0.3
+CHURN_ALPHA = 0.5
+MAX_ENTRY_IDS = 100
+MIN_CHURN_WINDOW_DAYS = 1.0 / 24.0
+MIN_QUIET_WINDOW_DAYS = 1.0
+HOST_ERRORS = {"ConnectionError", "ConnectTimeout", "ReadTimeout", "Timeout", "SSLError", "ProxyError"}
+
+
+def empty_registry() -> dict[str, Any]:
+    return {"sources": {}}
+
+
+def load_registry(path: Path) -> dict[str, Any]:
+    data = read_json(path, default={})
+    registry = empty_registry()
+    if isinstance(data, dict) and isinstance(data.get("sources"), dict):
+        registry["sources"] = data["sources"]
+    return registry
+
+
+def save_registry(path: Path, registry: dict[str, Any]) -> None:
+    write_json(path, registry)
+
+
+def host_of(url: str) -> str:
+    return urlparse(url).netloc.lower()
+
+
+def prune_sources(registry: dict[str, Any], keys: list[str]) -> int:
+    keep = set(keys)
+    stale = [k for k in registry["sources"] if k not in keep]
+    for key in stale:
+        del registry["sources"][key]
+    return len(stale)
+
+
+def _new_record(kind: str, url: str, now: float) -> dict[str, Any]:
+    return {
+        "kind": kind,
+        "host": host_of(url) or kind,
+        "first_seen_at": round(now),
+        "last_attempt_at": None,
+        "last_success_at": None,
+        "last_change_at": None,
+        "last_error": "",
+        "error_streak": 0,
+        "attempts": 0,
+        "failures": 0,
+        "skips": 0,
+        "latency_ms": None,
+        "churn_per_day": None,
+        "entries": 0,
+        "entry_ids": [],
+        "etag": "",
+        "last_modified": "",
+        "next_due_at": None,
+    }
+
+
+def _hours(cfg: dict[str, Any], key: str, default: float) -> float:
+    return float(cfg.get(key, default)) * 3600.0
+
+
+def backoff_seconds(error_streak: int, schedule_cfg: dict[str, Any]) -> float:
+    if error_streak <= 0:
+        return 0.0
+    base = _hours(schedule_cfg, "backoff_base_hours", 12)
+    return min(_hours(schedule_cfg, "backoff_max_hours", 672), base * 2 ** (error_streak - 1))
+
+
+def expected_interval_seconds(record: dict[str, Any], schedule_cfg: dict[str, Any]) -> float:
+    lo = _hours(schedule_cfg, "min_interval_hours", 0)
+    hi = _hours(schedule_cfg, "max_interval_hours", 336)
+    churn = record.get("churn_per_day")
+    if churn is None:
+        return lo
+    gap = 86400.0 / churn if churn > 0 else hi
+    return max(lo, min(hi, gap))
+
+
+def _host_failures(registry: dict[str, Any]) -> dict[str, tuple[int, float]]:
+    hosts: dict[str, tuple[int, float]] = {}
+    for rec in registry["sources"].values():
+        streak = int(rec.get("error_streak", 0))
+        if streak <= 0 or rec.get("last_error") not in HOST_ERRORS:
+            continue
+        prev = hosts.get(rec.get("host", ""), (0, 0.0))
+        hosts[rec.get("host", "")] = (max(prev[0], streak), max(prev[1], float(rec.get("last_attempt_at") or 0)))
+    return hosts
+
+
+def plan_fetches(
+    jobs: list[tuple[str, str]],
+    registry: dict[str, Any],
+    schedule_cfg: dict[str, Any],
+    now: float,
+    timeout: float,
+) -> tuple[list[tuple[str, str]], dict[str, dict[str, Any]], list[dict[str, Any]]]:
+    enabled = bool(schedule_cfg.get("enabled", False))
+    slack = _hours(schedule_cfg, "due_slack_hours", 6)
+    failing_timeout = min(timeout, float(schedule_cfg.get("failing_timeout_seconds", 5)))
+    hosts = _host_failures(registry)
+    due: list[tuple[float, int, tuple[str, str]]] = []
+    opts: dict[str, dict[str, Any]] = {}
+    skipped: list[dict[str, Any]] = []
+    for i, (kind, url) in enumerate(jobs):
+        rec = registry["sources"].get(url)
+        if rec is None or not enabled:
+            due.append((float("-inf") if enabled else 0.0, i, (kind, url)))
+            opts[url] = {"timeout": timeout, "headers": {}}
+            continue
+        streak, failed_at = hosts.get(rec.get("host", ""), (0, 0.0))
+        if int(rec.get("error_streak", 0)) > streak:
+            streak, failed_at = int(rec["error_streak"]), float(rec.get("last_attempt_at") or 0)
+        retry_at = failed_at + backoff_seconds(streak, schedule_cfg)
+        if streak and now < retry_at:
+            rec["next_due_at"] = round(retry_at)
+            skipped.append({"kind": kind, "url": url, "skipped": "backoff", "next_due_at": round(retry_at)})
+            continue
+        last_success = rec.get("last_success_at")
+        if last_success is not None and not rec.get("error_streak"):
+            due_at = float(last_success) + expected_interval_seconds(rec, schedule_cfg)
+            if now + slack < due_at:
+                rec["next_due_at"] = round(due_at)
+                skipped.append({"kind": kind, "url": url, "skipped": "not_due", "next_due_at": round(due_at)})
+                continue
+        headers = {}
+        if rec.get("etag"):
+            headers["If-None-Match"] = rec["etag"]
+        if rec.get("last_modified"):
+            headers["If-Modified-Since"] = rec["last_modified"]
+        churn = rec.get("churn_per_day")
+        if rec.get("error_streak"):
+            priority = float("inf")
+        else:
+            priority = float("-inf") if churn is None else -float(churn)
+        due.append((priority, i, (kind, url)))
+        opts[url] = {"timeout": failing_timeout if rec.get("error_streak") else timeout, "headers": headers}
+    due.sort(key=lambda x: (x[0], x[1]))
+    for item in skipped:
+        rec = registry["sources"][item["url"]]
+        rec["skips"] = int(rec.get("skips", 0)) + 1
+    return [job for _, _, job in due], opts, skipped
+
+
+def _published_churn(stamps: list[Any]) -> float | None:
+    parsed = [int(ts) for ts in stamps if isinstance(ts, (int, float))]
+    if len(parsed) < 2:
+        return None
+    span_days = (max(parsed) - min(parsed)) // 86400
+    if span_days <= 0:
+        return None
+    return (len(parsed) - 1) / span_days
+
+
+def record_fetch(
+    registry: dict[str, Any],
+    stats: dict[str, Any],
+    rows: list[dict[str, Any]],
+    now: float,
+) -> None:
+    url = str(stats["url"])
+    rec = registry["sources"].setdefault(url, _new_record(str(stats.get("kind", "")), url, now))
+    prev_success = rec.get("last_success_at")
+    rec["attempts"] = int(rec.get("attempts", 0)) + 1
+    rec["last_attempt_at"] = round(now)
+    rec["next_due_at"] = None
+    if stats.get("error"):
+        rec["error_streak"] = int(rec.get("error_streak", 0)) + 1
+        rec["failures"] = int(rec.get("failures", 0)) + 1
+        rec["last_error"] = str(stats["error"])
+        return
+
+    fetch_ms = float(stats.get("fetch_ms", 0.0))
+    latency = rec.get("latency_ms")
+    if latency is not None:
+        fetch_ms = LATENCY_ALPHA * fetch_ms + (1 - LATENCY_ALPHA) * float(latency)
+    rec["latency_ms"] = round(fetch_ms, 1)
+    rec["error_streak"] = 0
+    rec["last_error"] = ""
+    rec["last_success_at"] = round(now)
+    if stats.get("etag"):
+        rec["etag"] = stats["etag"]
+    if stats.get("last_modified"):
+        rec["last_modified"] = stats["last_modified"]
+
+    if stats.get("status") == "not_modified":
+        new = 0
+    else:
+        ids = [str(r.get("id", "")) for r in rows]
+        seen = set(rec.get("entry_ids") or [])
+        new = sum(1 for i in ids if i not in seen)
+        rec["entry_ids"] = ids[:MAX_ENTRY_IDS]
+        rec["entries"] = len(ids)
+    if new:
+        rec["last_change_at"] = round(now)
+
+    if prev_success is None:
+        if rec.get("churn_per_day") is None:
+            estimate = _published_churn([r.get("published_ts") for r in rows])
+            rec["churn_per_day"] = None if estimate is None else round(estimate, 3)
+        return
+    days = (now - float(prev_success)) / 86400.0
+    if not new and days < MIN_QUIET_WINDOW_DAYS:
+        return
+    rate = new / max(days, MIN_CHURN_WINDOW_DAYS)
+    churn = rec.get("churn_per_day")
+    rec["churn_per_day"] = round(rate if churn is None else CHURN_ALPHA * rate + (1 - CHURN_ALPHA) * float(churn), 3)
+
+
+def _iso(ts: Any) -> str:
+    if ts is None:
+        return "never"
+    return datetime.fromtimestamp(float(ts), tz=timezone.utc).strftime("%Y-%m-%d %H:%M")
+
+
+def source_health(registry: dict[str, Any], urls: list[str] | None = None) -> list[dict[str, Any]]:
+    rows = []
+    for url, rec in registry["sources"].items():
+        if urls is not None and url not in urls:
+            continue
+        streak = int(rec.get("error_streak", 0))
+        if streak:
+            status = f"failing ({rec.get('last_error') or 'error'})"
+        elif rec.get("next_due_at"):
+            status = "idle"
+        else:
+            status = "ok"
+        rows.append(
+            {
+                "url": url,
+                "status": status,
+                "last_success": _iso(rec.get("last_success_at")),
+                "latency_ms": rec.get("latency_ms"),
+                "churn_per_day": rec.get("churn_per_day"),
+                "error_streak": streak,
+                "next_due": _iso(rec.get("next_due_at")) if rec.get("next_due_at") else "",
+            }
+        )
+    rows.sort(key=lambda r: (-r["error_streak"], r["url"]))
+    return rows
@@ -0,0 +1,457 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import struct
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+from src.common.io import append_jsonl, iter_jsonl, read_json, write_json
+from src.memory.digest import PHRASE_SIZE, STOPWORDS, _hash, _is_content_phrase, _ngrams, _words, repeated_phrases
+
+
+INDEX_VERSION = 1
+ARCHIVE_DIR = "archive_index"
+MAX_SEGMENTS = 8
+BM25_K1 = 1.2
+BM25_B = 0.75
+POSTING = struct.Struct("<II")
+GRAM = struct.Struct("<QI")
+PLACEHOLDER_REASON = "hosted_mode_placeholder"
+
+
+def _terms(text: str) -> list[str]:
+    return [w for w in _words(text) if w not in STOPWORDS and len(w) > 1]
+
+
+def _phrase_hashes(words: list[str]) -> set[int]:
+    return {_hash(g) for g in _ngrams(words, PHRASE_SIZE) if _is_content_phrase(g)}
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+class _Segment:
+    def __init__(self, root: Path, name: str) -> None:
+        self.name = name
+        self._maps: list[mmap.mmap] = []
+        self.terms: dict[str, list[int]] = read_json(root / f"{name}.terms.json", default={}).get("terms", {})
+        self.postings = self._map(root / f"{name}.post")
+        self.grams = self._map(root / f"{name}.grams")
+        self.gram_count = len(self.grams) // GRAM.size
+
+    def _map(self, path: Path) -> mmap.mmap | bytes:
+        if not path.exists() or path.stat().st_size == 0:
+            return b""
+        with path.open("rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return mapped
+
+    def term_postings(self, term: str) -> Iterator[tuple[int, int]]:
+        entry = self.terms.get(term)
+        if not entry:
+            return iter(())
+        start, count = entry
+        return POSTING.iter_unpack(self.postings[start * POSTING.size : (start + count) * POSTING.size])
+
+    def gram_docs(self, phrase_hash: int) -> list[int]:
+        lo, hi = 0, self.gram_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if GRAM.unpack_from(self.grams, mid * GRAM.size)[0] < phrase_hash:
+                lo = mid + 1
+            else:
+                hi = mid
+        docs = []
+        while lo < self.gram_count:
+            key, doc = GRAM.unpack_from(self.grams, lo * GRAM.size)
+            if key != phrase_hash:
+                break
+            docs.append(doc)
+            lo += 1
+        return docs
+
+    def all_terms(self) -> Iterator[tuple[str, list[tuple[int, int]]]]:
+        for term in self.terms:
+            yield term, list(self.term_postings(term))
+
+    def all_grams(self) -> Iterator[tuple[int, int]]:
+        return GRAM.iter_unpack(self.grams)
+
+    def close(self) -> None:
+        for mapped in self._maps:
+            mapped.close()
+        self._maps = []
+
+
+def _write_segment(
+    root: Path,
+    name: str,
+    postings: dict[str, list[tuple[int, int]]],
+    grams: list[tuple[int, int]],
+) -> None:
+    terms: dict[str, list[int]] = {}
+    buf = bytearray()
+    offset = 0
+    for term in sorted(postings):
+        rows = postings[term]
+        terms[term] = [offset, len(rows)]
+        for doc, tf in rows:
+            buf += POSTING.pack(doc, tf)
+        offset += len(rows)
+    (root / f"{name}.post").write_bytes(bytes(buf))
+    (root / f"{name}.grams").write_bytes(b"".join(GRAM.pack(h, d) for h, d in sorted(grams)))
+    (root / f"{name}.terms.json").write_text(json.dumps({"terms": terms}, separators=(",", ":")), encoding="utf-8")
+
+
+class ArchiveIndex:
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        meta = read_json(root / "meta.json", default={})
+        if not isinstance(meta, dict) or meta.get("version") != INDEX_VERSION:
+            meta = {}
+        self.segment_names: list[str] = list(meta.get("segments", []))
+        self.next_segment = int(meta.get("next_segment", 1))
+        doc_count = int(meta.get("docs", 0))
+        self.docs: list[dict[str, Any]] = []
+        for row in iter_jsonl(root / "docs.jsonl"):
+            if len(self.docs) >= doc_count:
+                break
+            self.docs.append(row)
+        self.live: dict[str, int] = {}
+        for doc_id, row in enumerate(self.docs):
+            self.live[row["key"]] = doc_id
+        self._segments: list[_Segment] | None = None
+        self._term_cache: dict[tuple[str, str | None], list[tuple[int, float]]] = {}
+        self._stats: dict[str | None, tuple[int, int]] = {}
+
+    def __enter__(self) -> ArchiveIndex:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for seg in self._segments or []:
+            seg.close()
+        self._segments = None
+        self._term_cache = {}
+        self._stats = {}
+
+    def warm(self) -> list[_Segment]:
+        if self._segments is None:
+            self._segments = [_Segment(self.root, name) for name in self.segment_names]
+        return self._segments
+
+    @property
+    def segments(self) -> list[_Segment]:
+        return self.warm()
+
+    def _collection(self, kind: str | None) -> tuple[int, int]:
+        stats = self._stats.get(kind)
+        if stats is None:
+            docs = [self.docs[d] for d in self.live.values()]
+            lengths = [int(doc["len"]) for doc in docs if kind is None or doc["kind"] == kind]
+            stats = self._stats[kind] = (len(lengths), sum(lengths))
+        return stats
+
+    def count(self, kind: str | None = None) -> int:
+        return self._collection(kind)[0]
+
+    def _is_live(self, doc_id: int) -> bool:
+        return self.live.get(self.docs[doc_id]["key"]) == doc_id
+
+    def _accept(self, doc_id: int, kind: str | None, exclude: set[str] | frozenset[str] = frozenset()) -> bool:
+        doc = self.docs[doc_id]
+        return self._is_live(doc_id) and (kind is None or doc["kind"] == kind) and doc["key"] not in exclude
+
+    def _weights(self, term: str, kind: str | None) -> list[tuple[int, float]]:
+        cached = self._term_cache.get((term, kind))
+        if cached is None:
+            postings = [p for seg in self.segments for p in seg.term_postings(term) if self._accept(p[0], kind)]
+            n, total_len = self._collection(kind)
+            avgdl = total_len / n if n and total_len else 1.0
+            idf = math.log(1.0 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            cached = []
+            for doc_id, tf in postings:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * int(self.docs[doc_id]["len"]) / avgdl)
+                cached.append((doc_id, idf * tf * (BM25_K1 + 1) / (tf + norm)))
+            self._term_cache[(term, kind)] = cached
+        return cached
+
+    def search(
+        self,
+        query: str,
+        k: int = 10,
+        kind: str | None = None,
+        exclude: Iterable[str] = (),
+    ) -> list[dict[str, Any]]:
+        terms = list(dict.fromkeys(_terms(query)))
+        if not terms or not self.count(kind):
+            return []
+        skip = set(exclude)
+        scores: dict[int, float] = {}
+        matched: Counter[int] = Counter()
+        for term in terms:
+            for doc_id, weight in self._weights(term, kind):
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+                matched[doc_id] += 1
+        candidates = (d for d in scores if not skip or self.docs[d]["key"] not in skip)
+        ranked = heapq.nlargest(k, candidates, key=scores.__getitem__)
+        return [
+            {
+                **{f: self.docs[d].get(f, "") for f in ("key", "kind", "title", "week", "path")},
+                "score": round(scores[d], 4),
+                "matched": round(matched[d] / len(terms), 4),
+            }
+            for d in ranked
+        ]
+
+    def coverage(self, query: str, kind: str = "draft", exclude: Iterable[str] = ()) -> tuple[float, str]:
+        hits = self.search(query, k=1, kind=kind, exclude=exclude)
+        if not hits:
+            return 0.0, ""
+        return hits[0]["matched"], hits[0]["key"]
+
+    def known_phrases(self, text: str, kind: str | None = "draft", exclude: Iterable[str] = ()) -> list[int]:
+        skip = set(exclude)
+        known = []
+        for phrase_hash in sorted(_phrase_hashes(_words(text))):
+            if any(self._accept(d, kind, skip) for seg in self.segments for d in seg.gram_docs(phrase_hash)):
+                known.append(phrase_hash)
+        return known
+
+    def overlap(
+        self,
+        text: str,
+        k: int = 5,
+        kind: str | None = "draft",
+        exclude: Iterable[str] = (),
+    ) -> dict[str, Any]:
+        skip = set(exclude)
+        hashes = _phrase_hashes(_words(text))
+        per_doc: Counter[int] = Counter()
+        known = []
+        for phrase_hash in hashes:
+            docs = {d for seg in self.segments for d in seg.gram_docs(phrase_hash) if self._accept(d, kind, skip)}
+            if docs:
+                known.append(phrase_hash)
+                per_doc.update(docs)
+        phrases, ratio = repeated_phrases(text, [{"phrases": known}])
+        return {
+            "ratio": round(ratio, 4),
+            "phrases": phrases,
+            "docs": [
+                {
+                    **{f: self.docs[d].get(f, "") for f in ("key", "kind", "title", "week", "path")},
+                    "shared": shared,
+                    "ratio": round(shared / len(hashes), 4),
+                }
+                for d, shared in per_doc.most_common(k)
+            ],
+        }
+
+    def add(self, docs: Iterable[dict[str, Any]]) -> int:
+        postings: dict[str, list[tuple[int, int]]] = {}
+        grams: list[tuple[int, int]] = []
+        rows = []
+        for doc in docs:
+            text = str(doc.get("text", ""))
+            digest = _content_hash(text)
+            key = str(doc["key"])
+            week = str(doc.get("week", ""))
+            prev = self.live.get(key)
+            if prev is not None and (self.docs[prev].get("hash") == digest or week < self.docs[prev]["week"]):
+                continue
+            words = _words(text)
+            terms = Counter(w for w in words if w not in STOPWORDS and len(w) > 1)
+            doc_id = len(self.docs)
+            for term, tf in terms.items():
+                postings.setdefault(term, []).append((doc_id, tf))
+            grams.extend((h, doc_id) for h in _phrase_hashes(words))
+            row = {
+                "key": key,
+                "kind": str(doc.get("kind", "")),
+                "title": str(doc.get("title", ""))[:200],
+                "week": week,
+                "path": str(doc.get("path", "")),
+                "len": sum(terms.values()),
+                "hash": digest,
+            }
+            self.docs.append(row)
+            self.live[key] = doc_id
+            rows.append(row)
+        if not rows:
+            return 0
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        name = f"seg_{self.next_segment:06d}"
+        _write_segment(self.root, name, postings, grams)
+        self._rewrite_docs_if_torn(len(self.docs) - len(rows))
+        for row in rows:
+            append_jsonl(self.root / "docs.jsonl", row)
+        self.close()
+        self.segment_names.append(name)
+        self.next_segment += 1
+        self._save_meta()
+        if len(self.segment_names) > MAX_SEGMENTS:
+            self.compact()
+        return len(rows)
+
+    def _rewrite_docs_if_torn(self, committed: int) -> None:
+        path = self.root / "docs.jsonl"
+        if not path.exists():
+            return
+        with path.open("rb") as f:
+            lines = sum(1 for line in f if line.strip())
+        if lines != committed:
+            path.unlink()
+            for row in self.docs[:committed]:
+                append_jsonl(path, row)
+
+    def _save_meta(self) -> None:
+        write_json(
+            self.root / "meta.json",
+            {
+                "version": INDEX_VERSION,
+                "segments": self.segment_names,
+                "next_segment": self.next_segment,
+                "docs": len(self.docs),
+            },
+        )
+
+    def compact(self) -> None:
+        if len(self.segment_names) <= 1:
+            return
+        postings: dict[str, list[tuple[int, int]]] = {}
+        grams: list[tuple[int, int]] = []
+        for seg in self.segments:
+            for term, rows in seg.all_terms():
+                live = [p for p in rows if self._is_live(p[0])]
+                if live:
+                    postings.setdefault(term, []).extend(live)
+            grams.extend(g for g in seg.all_grams() if self._is_live(g[1]))
+        old = list(self.segment_names)
+        self.close()
+        name = f"seg_{self.next_segment:06d}"
+        _write_segment(self.root, name, postings, grams)
+        self.segment_names = [name]
+        self.next_segment += 1
+        self._save_meta()
+        for stale in old:
+            for suffix in (".terms.json", ".post", ".grams"):
+                (self.root / f"{stale}{suffix}").unlink(missing_ok=True)
+
+
+def open_archive(state_dir: Path) -> ArchiveIndex:
+    return ArchiveIndex(state_dir / ARCHIVE_DIR)
+
+
+def _relative(path: Path, root: Path) -> str:
+    try:
+        return str(path.resolve().relative_to(root.resolve()))
+    except ValueError:
+        return str(path)
+
+
+def _is_placeholder(draft_path: Path) -> bool:
+    score = read_json(draft_path.with_name(draft_path.stem + "_score.json"), default={})
+    return isinstance(score, dict) and PLACEHOLDER_REASON in (score.get("fail_reasons") or [])
+
+
+def draft_docs(root: Path, week_label: str, draft_paths: list[Path]) -> list[dict[str, Any]]:
+    docs = []
+    for path in draft_paths:
+        if not path.exists() or _is_placeholder(path):
+            continue
+        text = path.read_text(encoding="utf-8")
+        title = next((ln.strip() for ln in text.splitlines() if ln.strip()), "")
+        key = _relative(path, root)
+        docs.append({"key": key, "kind": "draft", "title": title, "week": week_label, "path": key, "text": text})
+    return docs
+
+
+def topic_docs(topics_path: Path, week_label: str) -> list[dict[str, Any]]:
+    docs = []
+    for row in iter_jsonl(topics_path):
+        text = " ".join(
+            [str(row.get("title", "")), str(row.get("summary", "")), *[str(c) for c in row.get("key_claims") or []]]
+        )
+        docs.append(
+            {
+                "key": str(row.get("id", "")),
+                "kind": "topic",
+                "title": str(row.get("title", "")),
+                "week": week_label,
+                "path": str(row.get("url", "")),
+                "text": text,
+            }
+        )
+    return docs
+
+
+def index_week(index: ArchiveIndex, root: Path, week_label: str, draft_paths: list[Path], topics: bool = True) -> int:
+    docs = draft_docs(root, week_label, draft_paths)
+    if topics:
+        docs += topic_docs(root / "topics" / week_label / "filtered_topics.jsonl", week_label)
+    return index.add(docs)
+
+
+def index_archive(index: ArchiveIndex, root: Path) -> int:
+    added = 0
+    for week_dir in sorted((root / "weekly").glob("*-W*")):
+        added += index_week(index, root, week_dir.name, sorted((week_dir / "drafts").glob("post_[0-9][0-9].md")))
+    for topics_dir in sorted((root / "topics").glob("*-W*")):
+        if not (root / "weekly" / topics_dir.name).exists():
+            added += index.add(topic_docs(topics_dir / "filtered_topics.jsonl", topics_dir.name))
+    return added
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Search the archive of past drafts and topics")
+    parser.add_argument("--root", default=str(Path(__file__).resolve().parent.parent.parent), help="Workspace root.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("index", help="Index any drafts and topics not yet in the archive.")
+    search = sub.add_parser("search", help="BM25 search: have we covered X?")
+    search.add_argument("query")
+    search.add_argument("-k", type=int, default=10)
+    search.add_argument("--kind", choices=["draft", "topic"])
+    overlap = sub.add_parser("overlap", help="Phrase (n-gram) overlap of a text against every past draft.")
+    overlap.add_argument("path", help="Text or markdown file to check; '-' reads stdin.")
+    overlap.add_argument("-k", type=int, default=5)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    root = Path(args.root).resolve()
+    with open_archive(root / "state") as index:
+        if args.command == "index":
+            added = index_archive(index, root)
+            print(f"Indexed {added} new documents ({index.count('draft')} drafts, {index.count('topic')} topics).")
+        elif args.command == "search":
+            for hit in index.search(args.query, k=args.k, kind=args.kind):
+                print(f"{hit['score']:8.3f}  {hit['matched']:.0%}  [{hit['kind']}] {hit['week']}  {hit['title']}")
+                print(f"          {hit['path']}")
+        else:
+            text = sys.stdin.read() if args.path == "-" else Path(args.path).read_text(encoding="utf-8")
+            exclude = [] if args.path == "-" else [_relative(Path(args.path), root)]
+            result = index.overlap(text, k=args.k, exclude=exclude)
+            print(f"Repeated phrase ratio: {result['ratio']:.1%}")
+            for phrase in result["phrases"]:
+                print(f"- {phrase}")
+            for doc in result["docs"]:
+                print(f"{doc['shared']:5d} shared ({doc['ratio']:.0%})  {doc['week']}  {doc['path']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import re
+from pathlib import Path
+from typing import Any
+
+from src.common.io import append_jsonl
+
+
+WORD_RE = re.compile(r"[a-z0-9][a-z0-9'\-]*")
+SHINGLE_SIZE = 5
+PHRASE_SIZE = 4
+EMBEDDING_DIM = 64
+SUMMARY_MAX_CHARS = 320
+STOPWORDS = set(
+    "a an and are as at be but by for from in is it of on or that the this to was we with you your".split()
+)
+
+
+def _words(text: str) -> list[str]:
+    return WORD_RE.findall(text.lower())
+
+
+def _hash(token: str) -> int:
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big") >> 1
+
+
+def _ngrams(words: list[str], n: int) -> list[str]:
+    return [" ".join(words[i : i + n]) for i in range(len(words) - n + 1)]
+
+
+def _is_content_phrase(phrase: str) -> bool:
+    return sum(1 for w in phrase.split() if w not in STOPWORDS) >= 2
+
+
+def summary_line(text: str) -> str:
+    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+    return " ".join(lines[:3])[:SUMMARY_MAX_CHARS]
+
+
+def embed(words: list[str]) -> list[float]:
+    vec = [0.0] * EMBEDDING_DIM
+    for w in words:
+        if w in STOPWORDS:
+            continue
+        h = _hash(w)
+        vec[h % EMBEDDING_DIM] += 1.0 if (h >> 20) & 1 else -1.0
+    norm = math.sqrt(sum(x * x for x in vec)) or 1.0
+    return [round(x / norm, 5) for x in vec]
+
+
+def digest_text(text: str) -> dict[str, Any]:
+    words = _words(text)
+    return {
+        "summary": summary_line(text),
+        "shingles": sorted({_hash(s) for s in _ngrams(words, SHINGLE_SIZE)}),
+        "phrases": sorted({_hash(p) for p in _ngrams(words, PHRASE_SIZE) if _is_content_phrase(p)}),
+        "embedding": embed(words),
+    }
+
+
+def append_digest(path: Path, digest: dict[str, Any]) -> None:
+    append_jsonl(path, digest)
+
+
+def _tail_lines(path: Path, n: int, block_size: int = 65536) -> list[str]:
+    if n <= 0 or not path.exists():
+        return []
+    with path.open("rb") as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b""
+        while pos > 0 and data.count(b"\n") <= n:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    return [ln for ln in data.decode("utf-8", errors="replace").splitlines() if ln.strip()][-n:]
+
+
+def load_digests(path: Path, window: int) -> list[dict[str, Any]]:
+    digests = []
+    for line in _tail_lines(path, window):
+        try:
+            digests.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return digests
+
+
+def load_history(
+    digest_path: Path,
+    content_log: list[dict[str, Any]],
+    window: int,
+    root: Path,
+) -> list[dict[str, Any]]:
+    recent = content_log[-window:]
+    by_path = {d.get("draft_path"): d for d in load_digests(digest_path, window)}
+    history = []
+    for row in recent:
+        digest = by_path.get(row.get("draft_path"))
+        if digest is None:
+            draft = root / str(row.get("draft_path", ""))
+            if not row.get("draft_path") or not draft.exists():
+                continue
+            digest = digest_text(draft.read_text(encoding="utf-8"))
+        history.append(digest)
+    return history
+
+
+def jaccard(a: list[int] | set[int], b: list[int] | set[int]) -> float:
+    sa, sb = set(a), set(b)
+    if not sa or not sb:
+        return 0.0
+    return len(sa & sb) / len(sa | sb)
+
+
+def cosine(a: list[float], b: list[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+def repeated_phrases(text: str, history: list[dict[str, Any]]) -> tuple[list[str], float]:
+    seen = {h for d in history for h in d.get("phrases", [])}
+    words = _words(text)
+    grams = _ngrams(words, PHRASE_SIZE)
+    content = [i for i, g in enumerate(grams) if _is_content_phrase(g)]
+    if not content:
+        return [], 0.0
+    hits = [i for i in content if _hash(grams[i]) in seen]
+    spans: list[list[int]] = []
+    for i in hits:
+        if spans and i <= spans[-1][1] + 1:
+            spans[-1][1] = i
+        else:
+            spans.append([i, i])
+    phrases = list(dict.fromkeys(" ".join(words[a : b + PHRASE_SIZE]) for a, b in spans))
+    return phrases, len(hits) / len(content)
+
+
+def max_similarity(digest: dict[str, Any], history: list[dict[str, Any]]) -> float:
+    return max((jaccard(digest["shingles"], d.get("shingles", [])) for d in history), default=0.0)
+
+
+def most_similar(digest: dict[str, Any], history: list[dict[str, Any]], k: int) -> list[dict[str, Any]]:
+    ranked = sorted(history, key=lambda d: cosine(digest["embedding"], d.get("embedding", [])), reverse=True)
+    return ranked[:k]
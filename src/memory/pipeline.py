@@ -5,7 +5,12 @@ from datetime import date
 from pathlib import Path
 from typing import Any
 
-from src.common.io import append_jsonl, read_json, read_jsonl, write_json, write_jsonl
+from src.common.artifacts import write_json_artifact, write_text_artifact
+from src.common.io import append_jsonl, read_json, read_jsonl, write_jsonl
+from src.memory.digest import append_digest, digest_text, load_digests, repeated_phrases
+
+
+MAX_REPEATED_PHRASE_FLAGS = 5
 
 
 def extract_repeated_phrases(text: str, phrase_blacklist: list[str]) -> list[str]:
@@ -20,15 +25,19 @@ def update_content_log(
     plan_posts: list[dict[str, Any]],
     draft_paths: list[Path],
     phrase_blacklist: list[str],
+    digest_path: Path | None = None,
+    history_window: int = 10,
 ) -> list[dict[str, Any]]:
     records = []
     root = content_log_path.resolve().parent.parent
+    history = load_digests(digest_path, history_window) if digest_path is not None else []
     for plan_item, draft_path in zip(plan_posts, draft_paths):
         draft_text = draft_path.read_text(encoding="utf-8")
         try:
             draft_path_str = str(draft_path.resolve().relative_to(root))
         except ValueError:
             draft_path_str = str(draft_path)
+        repeated, _ = repeated_phrases(draft_text, history)
         record = {
             "date": run_date.isoformat(),
             "week": week_label,
@@ -38,14 +47,35 @@ def update_content_log(
             "topic_id": plan_item.get("topic_id"),
             "hook_type": "framework" if "framework" in plan_item.get("hook", "").lower() else "translation",
             "claims": [line for line in draft_text.splitlines() if line.lower().startswith("core claim:")],
-            "repeated_phrase_flags": extract_repeated_phrases(draft_text, phrase_blacklist),
+            "repeated_phrase_flags": extract_repeated_phrases(draft_text, phrase_blacklist)
+            + repeated[:MAX_REPEATED_PHRASE_FLAGS],
             "draft_path": draft_path_str,
         }
         append_jsonl(content_log_path, record)
+        if digest_path is not None:
+            digest = {
+                "date": record["date"],
+                "topic_id": record["topic_id"],
+                "draft_path": draft_path_str,
+                **digest_text(draft_text),
+            }
+            append_digest(digest_path, digest)
+            history.append(digest)
         records.append(record)
     return records
 
 
+def drop_draft_records(paths: list[Path], draft_paths: set[str]) -> int:
+    dropped = 0
+    for path in paths:
+        rows = read_jsonl(path)
+        kept = [row for row in rows if row.get("draft_path") not in draft_paths]
+        if len(kept) != len(rows):
+            write_jsonl(path, kept)
+            dropped += len(rows) - len(kept)
+    return dropped
+
+
 def update_topic_saturation(topic_saturation_path: Path, plan_posts: list[dict[str, Any]]) -> dict[str, int]:
     data = read_json(topic_saturation_path, default={})
     if not isinstance(data, dict):
@@ -53,7 +83,7 @@ def update_topic_saturation(topic_saturation_path: Path, plan_posts: list[dict[s
     for post in plan_posts:
         for theme in post.get("theme_tags", []):
             data[theme] = int(data.get(theme, 0)) + 1
-    write_json(topic_saturation_path, data)
+    write_json_artifact(topic_saturation_path, data, "memory")
     return {k: int(v) for k, v in data.items()}
 
 
@@ -96,5 +126,4 @@ def build_coverage_dashboard(
     else:
         lines.append("- No data")
 
-    dashboard_path.parent.mkdir(parents=True, exist_ok=True)
-    dashboard_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    write_text_artifact(dashboard_path, "\n".join(lines) + "\n", "memory")
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import math
+from collections import Counter, deque
+from typing import Any
+
+from src.common.topic import SourceType, Topic
+from src.common.tracing import incr
+
+
+PAPER_SOURCE_TYPES = {SourceType.ARXIV, SourceType.STANDARD}
+CRITIQUE_PILLARS = {"insight", "field"}
+
+SCORE_WEIGHT = 1.0
+DEFICIT_WEIGHT = 0.5
+SATURATION_WEIGHT = 0.25
+STABILITY_BONUS = 0.1
+CRITIQUE_BONUS = 100.0
+HISTORY_WINDOW = 12
+EPS = 1e-9
+
+
+class _FlowGraph:
+    def __init__(self, n: int):
+        self.adj: list[list[list[Any]]] = [[] for _ in range(n)]
+
+    def add_edge(self, u: int, v: int, cap: int, cost: float) -> None:
+        self.adj[u].append([v, cap, cost, len(self.adj[v]), True])
+        self.adj[v].append([u, 0, -cost, len(self.adj[u]) - 1, False])
+
+    def min_cost_flow(self, s: int, t: int, max_flow: int) -> tuple[int, float]:
+        n = len(self.adj)
+        flow = 0
+        total_cost = 0.0
+        while flow < max_flow:
+            dist = [math.inf] * n
+            in_queue = [False] * n
+            prev: list[tuple[int, int] | None] = [None] * n
+            dist[s] = 0.0
+            queue = deque([s])
+            while queue:
+                u = queue.popleft()
+                in_queue[u] = False
+                for i, (v, cap, cost, _, _) in enumerate(self.adj[u]):
+                    if cap > 0 and dist[u] + cost < dist[v] - EPS:
+                        dist[v] = dist[u] + cost
+                        prev[v] = (u, i)
+                        if not in_queue[v]:
+                            queue.append(v)
+                            in_queue[v] = True
+            if dist[t] == math.inf:
+                break
+            v = t
+            while v != s:
+                u, i = prev[v]  # type: ignore[misc]
+                edge = self.adj[u][i]
+                edge[1] -= 1
+                self.adj[v][edge[3]][1] += 1
+                v = u
+            flow += 1
+            total_cost += dist[t]
+        return flow, total_cost
+
+
+def pillar_deficits(allocations: dict[str, float], history: list[dict[str, Any]], slots: int) -> dict[str, float]:
+    recent = history[-HISTORY_WINDOW:]
+    counts = Counter(r.get("pillar") for r in recent)
+    total = len(recent) + slots
+    share_sum = sum(float(v) for v in allocations.values()) or 1.0
+    return {p: float(share) / share_sum * total - counts.get(p, 0) for p, share in allocations.items()}
+
+
+def saturation_penalty(topic: Topic, saturation: dict[str, int]) -> float:
+    tags = topic.theme_tags
+    total = sum(int(v) for v in saturation.values())
+    if not tags or total <= 0:
+        return 0.0
+    return sum(int(saturation.get(t, 0)) for t in tags) / (total * len(tags))
+
+
+def _fits(pillar: str, topic: Topic) -> bool:
+    if pillar == "research_translation":
+        return topic.source_type in PAPER_SOURCE_TYPES
+    return True
+
+
+def solve_assignment(
+    topics: list[Topic],
+    slots: int,
+    allocations: dict[str, float],
+    history: list[dict[str, Any]],
+    saturation: dict[str, int] | None = None,
+    max_per_pillar: int = 1,
+    require_critique: bool = True,
+    preferred_ids: set[str] | None = None,
+) -> list[tuple[str, Topic]]:
+    pillars = list(allocations.keys())
+    seen: set[str] = set()
+    candidates: list[Topic] = []
+    for t in topics:
+        if t.id and t.id not in seen:
+            seen.add(t.id)
+            candidates.append(t)
+    if slots <= 0 or not pillars or not candidates:
+        return []
+    saturation = saturation or {}
+    preferred_ids = preferred_ids or set()
+    deficits = pillar_deficits(allocations, history, slots)
+
+    p_count = len(pillars)
+    source, sink, gate = 0, 1, 2
+    pin = [3 + i for i in range(p_count)]
+    pout = [3 + p_count + i for i in range(p_count)]
+    topic_base = 3 + 2 * p_count
+    graph = _FlowGraph(topic_base + len(candidates))
+
+    critique = [i for i, p in enumerate(pillars) if p in CRITIQUE_PILLARS]
+    use_gate = require_critique and bool(critique)
+    if use_gate:
+        graph.add_edge(source, gate, 1, -CRITIQUE_BONUS)
+        for i in critique:
+            graph.add_edge(gate, pin[i], 1, 0.0)
+    for i, pillar in enumerate(pillars):
+        graph.add_edge(source, pin[i], slots, 0.0)
+        for unit in range(max_per_pillar):
+            graph.add_edge(pin[i], pout[i], 1, -DEFICIT_WEIGHT * (deficits[pillar] - unit))
+        for j, topic in enumerate(candidates):
+            if not _fits(pillar, topic):
+                continue
+            cost = -SCORE_WEIGHT * topic.composite + SATURATION_WEIGHT * saturation_penalty(topic, saturation)
+            if topic.id in preferred_ids:
+                cost -= STABILITY_BONUS
+            graph.add_edge(pout[i], topic_base + j, 1, cost)
+    for j in range(len(candidates)):
+        graph.add_edge(topic_base + j, sink, 1, 0.0)
+
+    graph.min_cost_flow(source, sink, slots)
+
+    pairs: list[tuple[str, Topic]] = []
+    for i, pillar in enumerate(pillars):
+        for v, cap, _, _, forward in graph.adj[pout[i]]:
+            if forward and cap == 0 and v >= topic_base:
+                pairs.append((pillar, candidates[v - topic_base]))
+    return pairs
+
+
+def order_posts(
+    pairs: list[tuple[str, Topic]],
+    last_pillar: str | None = None,
+    critique_first: bool = True,
+) -> list[tuple[str, Topic]]:
+    remaining = sorted(pairs, key=lambda x: x[1].composite, reverse=True)
+    ordered: list[tuple[str, Topic]] = []
+    if critique_first:
+        for pair in remaining:
+            if pair[0] in CRITIQUE_PILLARS:
+                ordered.append(pair)
+                remaining.remove(pair)
+                break
+    prev = ordered[-1][0] if ordered else last_pillar
+    while remaining:
+        pick = next((p for p in remaining if p[0] != prev), remaining[0])
+        ordered.append(pick)
+        remaining.remove(pick)
+        prev = pick[0]
+    return ordered
+
+
+def _pick_pillars(cadence: int, allocations: dict[str, float], history: list[dict[str, Any]]) -> list[str]:
+    ordered = [k for k, _ in sorted(allocations.items(), key=lambda x: x[1], reverse=True)]
+    history_counts = Counter(r.get("pillar") for r in history[-HISTORY_WINDOW:])
+    ordered = sorted(ordered, key=lambda p: (history_counts.get(p, 0), -allocations.get(p, 0)))
+    pillars = ordered[: max(1, cadence)]
+
+    if cadence >= 2 and len(set(pillars[:2])) == 1:
+        for p in ordered:
+            if p != pillars[0]:
+                pillars[1] = p
+                break
+
+    return pillars[:cadence]
+
+
+def _needs_systems_critique(selected_pillars: list[str]) -> bool:
+    return not any(p in CRITIQUE_PILLARS for p in selected_pillars)
+
+
+def greedy_assignment(
+    topics: list[Topic],
+    cadence: int,
+    allocations: dict[str, float],
+    history: list[dict[str, Any]],
+    used_ids: set[str] | None = None,
+) -> list[tuple[str, Topic]]:
+    selected_pillars = _pick_pillars(cadence, allocations, history)
+    if _needs_systems_critique(selected_pillars) and selected_pillars:
+        selected_pillars[0] = "insight"
+
+    used = set(used_ids or set())
+    pairs: list[tuple[str, Topic]] = []
+    for idx in range(cadence):
+        pillar = selected_pillars[idx] if idx < len(selected_pillars) else "insight"
+        chosen: Topic | None = None
+        for topic in topics:
+            if not topic.id or topic.id in used:
+                continue
+            if not _fits(pillar, topic):
+                continue
+            chosen = topic
+            break
+        if chosen is None:
+            for topic in topics:
+                if topic.id and topic.id not in used:
+                    chosen = topic
+                    break
+        if chosen is None:
+            break
+        used.add(chosen.id)
+        pairs.append((pillar, chosen))
+    return pairs
+
+
+def assign_posts(
+    topics: list[Topic],
+    cadence: int,
+    allocations: dict[str, float],
+    history: list[dict[str, Any]],
+    saturation: dict[str, int] | None = None,
+    preferred_ids: set[str] | None = None,
+) -> list[tuple[str, Topic]]:
+    max_per_pillar = max(1, math.ceil(cadence / max(1, len(allocations))))
+    try:
+        pairs = solve_assignment(
+            topics, cadence, allocations, history, saturation, max_per_pillar, preferred_ids=preferred_ids
+        )
+    except Exception:
+        incr("plan.solver_fallbacks")
+        pairs = []
+
+    if len(pairs) < cadence:
+        if pairs:
+            incr("plan.greedy_fill")
+        used = {t.id for _, t in pairs}
+        remaining_history = history + [{"pillar": p} for p, _ in pairs]
+        pairs += greedy_assignment(topics, cadence - len(pairs), allocations, remaining_history, used)
+
+    last_pillar = history[-1].get("pillar") if history else None
+    return order_posts(pairs, last_pillar=last_pillar)
+
+
+def plan_horizon(
+    topics: list[Topic],
+    cadence: int,
+    weeks: int,
+    allocations: dict[str, float],
+    history: list[dict[str, Any]],
+    saturation: dict[str, int] | None = None,
+    preferred_ids: set[str] | None = None,
+) -> list[list[tuple[str, Topic]]]:
+    saturation = dict(saturation or {})
+    history = list(history)
+    used: set[str] = set()
+    horizon: list[list[tuple[str, Topic]]] = []
+    for _ in range(max(1, weeks)):
+        remaining = [t for t in topics if t.id not in used]
+        week = assign_posts(remaining, cadence, allocations, history, saturation, preferred_ids)
+        horizon.append(week)
+        for pillar, topic in week:
+            used.add(topic.id)
+            history.append({"pillar": pillar, "topic_id": topic.id})
+            for theme in topic.theme_tags:
+                saturation[theme] = int(saturation.get(theme, 0)) + 1
+    return horizon
@@ -1,84 +1,48 @@
 from __future__ import annotations
 
-from collections import Counter
-from datetime import date
+from datetime import date, timedelta
 from pathlib import Path
 from typing import Any
 
-
-def _pick_pillars(cadence: int, allocations: dict[str, float], history: list[dict[str, Any]]) -> list[str]:
-    ordered = [k for k, _ in sorted(allocations.items(), key=lambda x: x[1], reverse=True)]
-    history_counts = Counter(r.get("pillar") for r in history[-12:])
-    ordered = sorted(ordered, key=lambda p: (history_counts.get(p, 0), -allocations.get(p, 0)))
-    pillars = ordered[: max(1, cadence)]
-
-    if cadence >= 2 and len(set(pillars[:2])) == 1:
-        for p in ordered:
-            if p != pillars[0]:
-                pillars[1] = p
-                break
-
-    return pillars[:cadence]
-
-
-def _needs_systems_critique(selected_pillars: list[str]) -> bool:
-    return not any(p in {"insight", "field"} for p in selected_pillars)
+from src.common.artifacts import write_text_artifact
+from src.common.time_utils import iso_week_label
+from src.common.topic import Topic
+from src.plan.assign import plan_horizon
 
 
 def build_week_plan(
     week_label: str,
     run_date: date,
-    topics: list[dict[str, Any]],
+    topics: list[Topic],
     user_cfg: dict[str, Any],
     content_log: list[dict[str, Any]],
     out_path: Path,
+    topic_saturation: dict[str, int] | None = None,
 ) -> list[dict[str, Any]]:
+    posts, _ = build_horizon_plan(week_label, run_date, topics, user_cfg, content_log, out_path, topic_saturation)
+    return posts
+
+
+def build_horizon_plan(
+    week_label: str,
+    run_date: date,
+    topics: list[Topic],
+    user_cfg: dict[str, Any],
+    content_log: list[dict[str, Any]],
+    out_path: Path,
+    topic_saturation: dict[str, int] | None = None,
+    reserved_ids: set[str] | None = None,
+) -> tuple[list[dict[str, Any]], dict[str, list[dict[str, Any]]]]:
     cadence = int(user_cfg.get("cadence", 2))
     allocations = user_cfg.get("pillars_allocation", {"insight": 0.3, "research_translation": 0.25})
-    selected_pillars = _pick_pillars(cadence, allocations, content_log)
+    weeks = max(1, int(user_cfg.get("planning_horizon_weeks", 1)))
+    horizon = plan_horizon(topics, cadence, weeks, allocations, content_log, topic_saturation, reserved_ids)
 
-    if _needs_systems_critique(selected_pillars) and selected_pillars:
-        selected_pillars[0] = "insight"
-
-    posts: list[dict[str, Any]] = []
-    used_ids: set[str] = set()
-
-    for idx in range(cadence):
-        pillar = selected_pillars[idx] if idx < len(selected_pillars) else "insight"
-        chosen = None
-        for topic in topics:
-            t_id = topic.get("id")
-            if not t_id or t_id in used_ids:
-                continue
-            if pillar == "research_translation" and topic.get("source_type") not in {"arxiv", "standard"}:
-                continue
-            chosen = topic
-            break
-        if chosen is None:
-            for topic in topics:
-                t_id = topic.get("id")
-                if t_id and t_id not in used_ids:
-                    chosen = topic
-                    break
-
-        if chosen is None:
-            break
-
-        used_ids.add(chosen["id"])
-        posts.append(
-            {
-                "post_index": idx + 1,
-                "pillar": pillar,
-                "topic_id": chosen.get("id"),
-                "topic_title": chosen.get("title"),
-                "topic_url": chosen.get("url"),
-                "theme_tags": chosen.get("theme_tags", []),
-                "angle": _angle_for_pillar(pillar),
-                "hook": _hook_for_topic(chosen, pillar),
-                "cta": "What would you change in your deployment or eval stack based on this?",
-                "requires_systems_critique": idx == 0,
-            }
-        )
+    posts = _post_specs(horizon[0])
+    upcoming = {
+        iso_week_label(run_date + timedelta(weeks=offset)): _post_specs(assignments)
+        for offset, assignments in enumerate(horizon[1:], start=1)
+    }
 
     lines = [
         f"# Weekly Plan - {week_label}",
@@ -100,10 +64,36 @@ def build_week_plan(
                 "",
             ]
         )
+    if upcoming:
+        lines.extend(["## Upcoming (tentative)", ""])
+        for label, week_posts in upcoming.items():
+            lines.append(f"### {label}")
+            for post in week_posts:
+                lines.append(f"- {post['pillar']}: {post['topic_title']} ({post['topic_id']})")
+            lines.append("")
+
+    write_text_artifact(out_path, "\n".join(lines), "plan")
+
+    return posts, upcoming
 
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text("\n".join(lines), encoding="utf-8")
 
+def _post_specs(assignments: list[tuple[str, Topic]]) -> list[dict[str, Any]]:
+    posts: list[dict[str, Any]] = []
+    for idx, (pillar, chosen) in enumerate(assignments):
+        posts.append(
+            {
+                "post_index": idx + 1,
+                "pillar": pillar,
+                "topic_id": chosen.id,
+                "topic_title": chosen.title,
+                "topic_url": chosen.url,
+                "theme_tags": list(chosen.theme_tags),
+                "angle": _angle_for_pillar(pillar),
+                "hook": _hook_for_topic(chosen, pillar),
+                "cta": "What would you change in your deployment or eval stack based on this?",
+                "requires_systems_critique": idx == 0,
+            }
+        )
     return posts
 
 
@@ -118,8 +108,8 @@ def _angle_for_pillar(pillar: str) -> str:
     return mapping.get(pillar, "systems critique with technical anchor")
 
 
-def _hook_for_topic(topic: dict[str, Any], pillar: str) -> str:
-    title = topic.get("title", "this week's signal")
+def _hook_for_topic(topic: Topic, pillar: str) -> str:
+    title = topic.title or "this week's signal"
     if pillar == "research_translation":
         return f"Most people will cite {title} for results. The real lesson is in the eval assumptions."
     if pillar == "field":
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import hashlib
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from src.common.io import read_json, write_json
+from src.common.topic import Topic
+from src.ingest.arxiv import split_version, topic_arxiv_id
+
+
+BOOKKEEPING_KEYS = ("backlog", "arxiv_version")
+
+
+def empty_backlog() -> dict[str, Any]:
+    return {"history_fingerprint": "", "seen": {}, "topics": {}, "reservations": {}}
+
+
+def load_backlog(path: Path) -> dict[str, Any]:
+    data = read_json(path, default={})
+    backlog = empty_backlog()
+    if isinstance(data, dict):
+        for key in backlog:
+            if isinstance(data.get(key), type(backlog[key])):
+                backlog[key] = data[key]
+    return backlog
+
+
+def save_backlog(path: Path, backlog: dict[str, Any]) -> None:
+    write_json(path, backlog)
+
+
+def history_fingerprint(content_log: list[dict[str, Any]], window: int) -> str:
+    h = hashlib.sha1()
+    for row in content_log[-window:]:
+        h.update(str(row.get("topic_id", "")).encode("utf-8"))
+        for claim in row.get("claims", []):
+            h.update(str(claim).encode("utf-8"))
+        h.update(b"\x00")
+    return h.hexdigest()[:16]
+
+
+def _as_date(raw: Any) -> date | None:
+    try:
+        return datetime.strptime(str(raw)[:10], "%Y-%m-%d").date()
+    except Exception:
+        return None
+
+
+def topic_age_days(topic: dict[str, Any], run_date: date) -> int:
+    meta = topic.get("backlog") or {}
+    published = _as_date(topic.get("published_at"))
+    first_seen = _as_date(meta.get("first_seen")) or run_date
+    anchor = min(published, first_seen) if published else first_seen
+    return max(0, (run_date - anchor).days)
+
+
+def decay_factor(age_days: int, half_life_days: float) -> float:
+    if half_life_days <= 0:
+        return 1.0
+    return 0.5 ** (age_days / half_life_days)
+
+
+def mark_seen(backlog: dict[str, Any], topic_ids: list[str], run_date: date) -> None:
+    seen = backlog["seen"]
+    for t_id in topic_ids:
+        seen.setdefault(t_id, run_date.isoformat())
+
+
+def merge_topics(backlog: dict[str, Any], topics: list[Topic], run_date: date) -> None:
+    stored = backlog["topics"]
+    for t in topics:
+        if not t.id:
+            continue
+        record = t.to_dict()
+        record["backlog"] = {"first_seen": run_date.isoformat()}
+        stored[t.id] = record
+
+
+def prune(backlog: dict[str, Any], run_date: date, max_age_days: int, max_topics: int) -> None:
+    cutoff = (run_date - timedelta(days=2 * max_age_days)).isoformat()
+    backlog["seen"] = {k: v for k, v in backlog["seen"].items() if str(v) >= cutoff}
+    topics = backlog["topics"]
+    for t_id in [k for k, t in topics.items() if topic_age_days(t, run_date) > max_age_days]:
+        del topics[t_id]
+    if len(topics) > max_topics:
+        keep = sorted(
+            topics.values(),
+            key=lambda t: float((t.get("scores") or {}).get("composite", 0.0)),
+            reverse=True,
+        )[:max_topics]
+        backlog["topics"] = {t["id"]: t for t in keep}
+    this_week = run_date.isocalendar()[:2]
+    for week in list(backlog["reservations"]):
+        if tuple(int(x) for x in week.split("-W")) < this_week:
+            for t_id in backlog["reservations"].pop(week):
+                backlog["topics"].pop(t_id, None)
+
+
+def arxiv_ids(backlog: dict[str, Any]) -> list[str]:
+    return [topic_arxiv_id(t) for t in backlog["topics"].values() if t.get("source_type") == "arxiv"]
+
+
+def apply_refresh(backlog: dict[str, Any], rows: list[dict[str, Any]]) -> int:
+    latest = {}
+    for row in rows:
+        base, version = split_version(topic_arxiv_id(row))
+        latest[base] = (version, row)
+    updated = 0
+    for t in backlog["topics"].values():
+        if t.get("source_type") != "arxiv":
+            continue
+        base, version = split_version(topic_arxiv_id(t))
+        current = max(version, int(t.get("arxiv_version", 0)))
+        if base not in latest or latest[base][0] <= current:
+            continue
+        new_version, row = latest[base]
+        for key in ("title", "summary", "url", "raw_text_snippets"):
+            if row.get(key):
+                t[key] = row[key]
+        t["arxiv_version"] = new_version
+        updated += 1
+    return updated
+
+
+def set_reservations(backlog: dict[str, Any], plan: dict[str, list[str]]) -> None:
+    backlog["reservations"].update({week: list(ids) for week, ids in plan.items()})
+
+
+def reserved_ids(backlog: dict[str, Any]) -> set[str]:
+    return {t_id for ids in backlog["reservations"].values() for t_id in ids}
+
+
+def candidates(backlog: dict[str, Any], run_date: date, half_life_days: float) -> list[dict[str, Any]]:
+    out = []
+    for t in backlog["topics"].values():
+        scores = dict(t.get("scores") or {})
+        base = float(scores.get("composite", 0.0))
+        age = topic_age_days(t, run_date)
+        view = {k: v for k, v in t.items() if k not in BOOKKEEPING_KEYS}
+        scores["base_composite"] = base
+        scores["age_days"] = age
+        scores["composite"] = round(base * decay_factor(age, half_life_days), 4)
+        view["scores"] = scores
+        out.append(view)
+    return sorted(out, key=lambda x: x["scores"]["composite"], reverse=True)
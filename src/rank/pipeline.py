@@ -1,20 +1,24 @@
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
+from datetime import date, timedelta
 from pathlib import Path
 from typing import Any
 
-from src.common.io import read_jsonl, write_jsonl
+from src.common.artifacts import write_text_artifact
+from src.common.io import iter_jsonl
+from src.common.time_utils import day_start_ts, parse_timestamp
+from src.common.topic import TIER_RANK, Tier, Topic, write_topics
+from src.common.tracing import incr
+from src.memory.archive import ArchiveIndex
+from src.rank import backlog as topic_backlog
 
 
-CRED_ORDER = {"A": 3, "B": 2, "C": 1}
-
-
-def _parse_date(s: str, fallback: date) -> date:
-    try:
-        return datetime.strptime(s[:10], "%Y-%m-%d").date()
-    except Exception:
-        return fallback
+def _published_ts(row: dict[str, Any], fallback: int) -> int:
+    ts = row.get("published_ts")
+    if isinstance(ts, (int, float)):
+        return int(ts)
+    parsed = parse_timestamp(str(row.get("published_at") or ""))
+    return fallback if parsed is None else parsed
 
 
 def _keyword_score(text: str, keywords: list[str]) -> float:
@@ -30,10 +34,15 @@ def _history_topic_ids(content_log: list[dict[str, Any]], n: int) -> set[str]:
     return {r.get("topic_id", "") for r in rows if r.get("topic_id")}
 
 
-def _novelty_score(topic: dict[str, Any], recent_topic_ids: set[str], recent_claims: set[str]) -> float:
-    if topic.get("id") in recent_topic_ids:
+def _novelty_score(
+    topic_id: str,
+    key_claims: tuple[str, ...] | list[str],
+    recent_topic_ids: set[str],
+    recent_claims: set[str],
+) -> float:
+    if topic_id in recent_topic_ids:
         return 0.0
-    claims = set(topic.get("key_claims") or [])
+    claims = set(key_claims)
     overlap = len(claims & recent_claims)
     if not claims:
         return 0.8
@@ -54,6 +63,48 @@ def _strategic_leverage_score(text: str) -> float:
     return _keyword_score(text, keywords)
 
 
+def _composite(relevance: float, novelty: float, strategic: float, credibility: float) -> float:
+    return round(0.35 * relevance + 0.25 * novelty + 0.25 * strategic + 0.15 * credibility, 4)
+
+
+def _archive_coverage(title: str, archive: ArchiveIndex | None, threshold: float) -> float:
+    if archive is None:
+        return 0.0
+    coverage, _ = archive.coverage(title)
+    return coverage if coverage >= threshold else 0.0
+
+
+def _rescore_backlog(
+    backlog: dict[str, Any],
+    recent_ids: set[str],
+    recent_claims: set[str],
+    archive: ArchiveIndex | None = None,
+    coverage_threshold: float = 1.0,
+) -> int:
+    rescored = 0
+    for t in backlog["topics"].values():
+        scores = t.get("scores") or {}
+        coverage = float(scores.get("archive_coverage", 0.0))
+        if archive is not None:
+            coverage = _archive_coverage(str(t.get("title", "")), archive, coverage_threshold)
+        novelty = _novelty_score(str(t.get("id", "")), t.get("key_claims") or [], recent_ids, recent_claims)
+        novelty *= 1.0 - coverage
+        if round(novelty, 4) == scores.get("novelty"):
+            continue
+        scores["novelty"] = round(novelty, 4)
+        if archive is not None:
+            scores["archive_coverage"] = round(coverage, 4)
+        scores["composite"] = _composite(
+            float(scores.get("relevance", 0.0)),
+            novelty,
+            float(scores.get("strategic_leverage", 0.0)),
+            float(scores.get("credibility", 0.0)),
+        )
+        t["scores"] = scores
+        rescored += 1
+    return rescored
+
+
 def filter_and_rank(
     raw_paths: list[Path],
     content_log: list[dict[str, Any]],
@@ -61,18 +112,20 @@ def filter_and_rank(
     run_date: date,
     out_topics_path: Path,
     report_path: Path,
-) -> list[dict[str, Any]]:
-    all_topics: list[dict[str, Any]] = []
-    for path in raw_paths:
-        all_topics.extend(read_jsonl(path))
-
+    backlog: dict[str, Any] | None = None,
+    source_health: list[dict[str, Any]] | None = None,
+    archive: ArchiveIndex | None = None,
+    sources: set[str] | None = None,
+) -> list[Topic]:
     freshness_days = int(user_cfg.get("freshness_days", 14))
-    min_tier = str(user_cfg.get("min_credibility_tier", "B")).upper()
+    min_rank = TIER_RANK[Tier.parse(user_cfg.get("min_credibility_tier", "B"))]
     top_k = int(user_cfg.get("top_k_topics", 30))
     themes = user_cfg.get("themes", [])
     history_window = int(user_cfg.get("history_window_posts", 10))
+    coverage_threshold = float(user_cfg.get("archive_coverage_threshold", 0.6))
 
-    min_date = run_date - timedelta(days=freshness_days)
+    run_ts = day_start_ts(run_date)
+    min_ts = day_start_ts(run_date - timedelta(days=freshness_days))
     recent_ids = _history_topic_ids(content_log, history_window)
     recent_claims = {
         claim
@@ -81,58 +134,102 @@ def filter_and_rank(
         if isinstance(claim, str)
     }
 
-    filtered: list[dict[str, Any]] = []
+    input_count = 0
+    skipped_seen = 0
+    rescored = 0
+    seen: dict[str, Any] = {}
+    fresh_ids: list[str] = []
+    if backlog is not None:
+        fingerprint = topic_backlog.history_fingerprint(content_log, history_window)
+        if fingerprint != backlog.get("history_fingerprint"):
+            rescored = _rescore_backlog(backlog, recent_ids, recent_claims, archive, coverage_threshold)
+            backlog["history_fingerprint"] = fingerprint
+        seen = backlog["seen"]
+
+    filtered: list[Topic] = []
+    covered = 0
     dropped = {"freshness": 0, "credibility": 0, "theme": 0}
+    theme_set = set(themes)
 
-    for t in all_topics:
-        published = _parse_date(str(t.get("published_at", "")), run_date)
-        if published < min_date:
+    for row in (r for path in raw_paths for r in iter_jsonl(path)):
+        origins = row.pop("fetched_from", None)
+        if sources is not None and origins is not None and sources.isdisjoint(origins):
+            continue
+        input_count += 1
+        topic_id = row.get("id") or ""
+        if backlog is not None:
+            if topic_id in seen:
+                skipped_seen += 1
+                continue
+            if topic_id:
+                fresh_ids.append(topic_id)
+
+        if _published_ts(row, run_ts) < min_ts:
             dropped["freshness"] += 1
             continue
 
-        tier = str(t.get("credibility_tier", "C")).upper()
-        if CRED_ORDER.get(tier, 0) < CRED_ORDER.get(min_tier, 0):
+        tier_rank = TIER_RANK[Tier.parse(row.get("credibility_tier", "C"))]
+        if tier_rank < min_rank:
             dropped["credibility"] += 1
             continue
 
-        text = f"{t.get('title', '')} {t.get('summary', '')}".lower()
-        theme_tags = t.get("theme_tags") or []
+        t = Topic.from_dict(row)
+        text = f"{t.title} {t.summary}".lower()
+        theme_tags = tuple(th for th in t.theme_tags if not theme_set or th in theme_set)
         if not theme_tags:
-            theme_tags = [th for th in themes if th.replace("_", " ") in text or th in text]
-            t["theme_tags"] = theme_tags
+            theme_tags = tuple(th for th in themes if th.replace("_", " ") in text or th in text)
+        t.theme_tags = theme_tags
         if not theme_tags:
             dropped["theme"] += 1
             continue
 
         relevance = _keyword_score(text, [x.replace("_", " ") for x in themes])
-        novelty = _novelty_score(t, recent_ids, recent_claims)
+        coverage = _archive_coverage(t.title, archive, coverage_threshold)
+        if coverage:
+            covered += 1
+        novelty = _novelty_score(t.id, t.key_claims, recent_ids, recent_claims) * (1.0 - coverage)
         strategic = _strategic_leverage_score(text)
-        credibility = CRED_ORDER.get(tier, 1) / 3.0
+        credibility = tier_rank / 3.0
 
-        score = round(
-            0.35 * relevance + 0.25 * novelty + 0.25 * strategic + 0.15 * credibility,
-            4,
-        )
+        score = _composite(relevance, novelty, strategic, credibility)
 
-        t["scores"] = {
+        t.scores = {
             "relevance": round(relevance, 4),
             "novelty": round(novelty, 4),
             "strategic_leverage": round(strategic, 4),
             "credibility": round(credibility, 4),
             "composite": score,
         }
+        if archive is not None:
+            t.scores["archive_coverage"] = round(coverage, 4)
         filtered.append(t)
 
-    ranked = sorted(filtered, key=lambda x: x.get("scores", {}).get("composite", 0.0), reverse=True)
-    selected = ranked[:top_k]
+    incr("rank.input_topics", input_count)
+    incr("rank.scored_topics", len(filtered))
+    incr("rank.archive_covered", covered)
+    if backlog is not None:
+        topic_backlog.mark_seen(backlog, fresh_ids, run_date)
+        incr("rank.backlog_skipped", skipped_seen)
+        incr("rank.backlog_rescored", rescored)
+        topic_backlog.merge_topics(backlog, filtered, run_date)
+        topic_backlog.prune(
+            backlog,
+            run_date,
+            max_age_days=freshness_days,
+            max_topics=int(user_cfg.get("backlog_max_topics", 300)),
+        )
+        candidates = topic_backlog.candidates(backlog, run_date, float(user_cfg.get("backlog_half_life_days", 14)))
+        selected = [Topic.from_dict(row) for row in candidates[:top_k]]
+    else:
+        selected = sorted(filtered, key=lambda x: x.composite, reverse=True)[:top_k]
 
-    write_jsonl(out_topics_path, selected)
+    write_topics(out_topics_path, selected)
 
     report_lines = [
         "# Filter Report",
         "",
         f"Run date: {run_date.isoformat()}",
-        f"Input topics: {len(all_topics)}",
+        f"Input topics: {input_count}",
         f"Selected topics: {len(selected)}",
         "",
         "## Dropped",
@@ -140,7 +237,31 @@ def filter_and_rank(
         f"- Credibility: {dropped['credibility']}",
         f"- Theme mismatch: {dropped['theme']}",
     ]
-    report_path.parent.mkdir(parents=True, exist_ok=True)
-    report_path.write_text("\n".join(report_lines) + "\n", encoding="utf-8")
+    if archive is not None:
+        report_lines.extend(["", "## Archive", f"- Already covered by past drafts (novelty reduced): {covered}"])
+    if backlog is not None:
+        report_lines.extend(
+            [
+                "",
+                "## Backlog",
+                f"- Already ranked (skipped): {skipped_seen}",
+                f"- Newly scored: {len(filtered)}",
+                f"- Rescored after history change: {rescored}",
+                f"- Backlog size: {len(backlog['topics'])}",
+            ]
+        )
+    if source_health:
+        report_lines.extend(["", "## Source health"])
+        for row in source_health:
+            latency = "n/a" if row.get("latency_ms") is None else f"{row['latency_ms']:.0f} ms"
+            churn = "n/a" if row.get("churn_per_day") is None else f"{row['churn_per_day']:.2f}/day"
+            line = (
+                f"- {row['url']}: {row['status']}, last success {row['last_success']}, latency {latency}, "
+                f"churn {churn}, error streak {row['error_streak']}"
+            )
+            if row.get("next_due"):
+                line += f", next fetch {row['next_due']}"
+            report_lines.append(line)
+    write_text_artifact(report_path, "\n".join(report_lines) + "\n", "rank")
 
     return selected
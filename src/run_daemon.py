@@ -0,0 +1,314 @@
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from src.common.artifacts import reset_artifacts, save_manifest
+from src.common.budget import reservation_report
+from src.common.config import ConfigError, config_fingerprint
+from src.common.daemon import (
+    clear_request,
+    daemon_alive,
+    daemon_dir,
+    load_status,
+    pending_requests,
+    request_draft,
+    save_status,
+)
+from src.common.io import read_jsonl, read_yaml
+from src.common.llm import LLMClient, LLMRouter
+from src.common.time_utils import iso_week_label, resolve_run_date
+from src.common.tracing import incr, reset_tracer, span
+from src.evaluate.pipeline import gate_tier_rates
+from src.ingest.pipeline import run_ingest
+from src.ingest.registry import load_registry, source_health
+from src.rank import backlog as topic_backlog
+from src.run_weekly import (
+    connect_llm,
+    draft_posts,
+    enrich_ranked,
+    load_configs,
+    managed_llm_server,
+    print_summary,
+    queue_hosted_drafts,
+    rank_and_plan,
+    rank_topics,
+    refresh_backlog_arxiv,
+    update_memory,
+)
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DEFAULTS: dict[str, Any] = {
+    "poll_interval_seconds": 900,
+    "wake_interval_seconds": 5,
+    "draft_lead_hours": 12,
+}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Keep the pipeline warm: poll sources, re-rank, draft on schedule")
+    parser.add_argument("--root", dest="root", help="Workspace root. Defaults to this checkout.")
+    parser.add_argument("--once", action="store_true", help="Run a single poll/draft cycle and exit.")
+    parser.add_argument(
+        "--request",
+        action="store_true",
+        help="Ask a running daemon to (re)draft the week of --date now, then exit.",
+    )
+    parser.add_argument("--date", dest="run_date", help="Run date (YYYY-MM-DD) for --request. Defaults to today.")
+    return parser.parse_args(argv)
+
+
+def load_daemon_cfg(repo_root: Path) -> dict[str, Any]:
+    return {**DEFAULTS, **read_yaml(repo_root / "config" / "daemon.yaml")}
+
+
+def config_stamp(repo_root: Path) -> tuple[tuple[str, int], ...]:
+    return tuple(sorted((p.name, p.stat().st_mtime_ns) for p in (repo_root / "config").glob("*.yaml")))
+
+
+def draft_target(now: datetime, lead_hours: float) -> date:
+    ahead = (now + timedelta(hours=lead_hours)).date()
+    return ahead - timedelta(days=ahead.weekday())
+
+
+def _raw_paths(repo_root: Path, run_date: date) -> list[Path]:
+    raw_dir = repo_root / "topics" / "RAW" / run_date.isoformat()
+    return [raw_dir / "arxiv.jsonl", raw_dir / "rss.jsonl", raw_dir / "standards.jsonl"]
+
+
+class Daemon:
+    def __init__(self, repo_root: Path) -> None:
+        self.repo_root = repo_root
+        self.stop = False
+        self.configs: dict[str, dict[str, Any]] = {}
+        self.daemon_cfg: dict[str, Any] = {}
+        self.stamp: tuple[tuple[str, int], ...] = ()
+        self.llm: LLMClient | LLMRouter | None = None
+        self.status = load_status(repo_root)
+        self.next_poll = 0.0
+
+    def reload_if_changed(self) -> bool:
+        stamp = config_stamp(self.repo_root)
+        if stamp == self.stamp:
+            return False
+        self.stamp = stamp
+        try:
+            configs = load_configs(self.repo_root)
+        except ConfigError as exc:
+            if not self.configs:
+                raise
+            print(f"Warning: keeping the previous configuration: {exc}")
+            return False
+        if config_fingerprint(configs["model"]) != config_fingerprint(self.configs.get("model") or {}):
+            self.llm = None
+        self.configs = configs
+        self.daemon_cfg = load_daemon_cfg(self.repo_root)
+        self.next_poll = 0.0
+        return True
+
+    def heartbeat(self, **fields: Any) -> None:
+        self.status.update(fields)
+        self.status["pid"] = os.getpid()
+        self.status["heartbeat_at"] = round(time.time(), 3)
+        save_status(self.repo_root, self.status)
+
+    def poll(self, parse_pool: ProcessPoolExecutor) -> dict[str, Any]:
+        today = date.today()
+        user_cfg = self.configs["user_profile"]
+        state_dir = self.repo_root / "state"
+        registry_path = state_dir / "source_registry.json"
+        raw_dir = self.repo_root / "topics" / "RAW" / today.isoformat()
+        raw_dir.mkdir(parents=True, exist_ok=True)
+        tracer = reset_tracer()
+        reset_artifacts()
+        with span("daemon.poll"):
+            with span("stage.ingest"):
+                run_ingest(
+                    str(raw_dir),
+                    today,
+                    self.configs["sources"],
+                    user_cfg,
+                    registry_path,
+                    parse_pool=parse_pool,
+                    merge=True,
+                )
+            backlog_path = state_dir / "topic_backlog.json"
+            backlog = topic_backlog.load_backlog(backlog_path)
+            rank_topics(
+                self.repo_root,
+                today,
+                _raw_paths(self.repo_root, today),
+                user_cfg,
+                read_jsonl(state_dir / "content_log.jsonl"),
+                backlog,
+                daemon_dir(self.repo_root),
+                source_health(load_registry(registry_path)),
+            )
+            topic_backlog.save_backlog(backlog_path, backlog)
+        counters = tracer.counters
+        tracer.write_metrics(daemon_dir(self.repo_root) / "poll_metrics.json", extra={"run_date": today.isoformat()})
+        return {
+            "at": round(time.time(), 3),
+            "run_date": today.isoformat(),
+            "entries": int(counters.get("ingest.entries", 0)),
+            "feeds_skipped": int(counters.get("ingest.feeds_skipped", 0)),
+            "new_topics": int(counters.get("rank.input_topics", 0) - counters.get("rank.backlog_skipped", 0)),
+            "backlog_size": len(backlog["topics"]),
+        }
+
+    def _connect(self, model_cfg: dict[str, Any]) -> tuple[LLMClient | LLMRouter | None, bool]:
+        if self.llm is not None and self.llm.healthcheck():
+            incr("daemon.llm_reused")
+            return self.llm, True
+        self.llm, ok = connect_llm(model_cfg, self.repo_root / "state")
+        return self.llm, ok
+
+    def draft_week(self, run_date: date) -> dict[str, Any]:
+        week_label = iso_week_label(run_date)
+        configs = self.configs
+        user_cfg = configs["user_profile"]
+        model_cfg = configs["model"]
+        weekly_dir = self.repo_root / "weekly" / week_label
+        registry_path = self.repo_root / "state" / "source_registry.json"
+        tracer = reset_tracer()
+        reset_artifacts()
+        code = 0
+        changes: dict[str, Any] = {}
+        with span("run.total", week=week_label, daemon=True):
+            refresh_backlog_arxiv(
+                [self.repo_root / "state" / "topic_backlog.json"],
+                configs["sources"],
+                user_cfg.get("themes", []),
+                run_date,
+            )
+            ranked_topics, plan_posts = rank_and_plan(
+                self.repo_root,
+                run_date,
+                week_label,
+                _raw_paths(self.repo_root, date.today()),
+                user_cfg,
+                source_health(load_registry(registry_path)),
+            )
+            if model_cfg.get("runner_mode", "hosted") == "hosted":
+                ranked_topics = enrich_ranked(self.repo_root, week_label, ranked_topics, configs, None)
+                draft_paths = queue_hosted_drafts(
+                    self.repo_root, self.repo_root, run_date, week_label, plan_posts, ranked_topics, model_cfg
+                )
+            else:
+                with managed_llm_server(self.repo_root, model_cfg):
+                    llm_client, ok = self._connect(model_cfg)
+                    if ok:
+                        ranked_topics = enrich_ranked(self.repo_root, week_label, ranked_topics, configs, llm_client)
+                        draft_paths = draft_posts(
+                            self.repo_root, week_label, plan_posts, ranked_topics, configs, llm_client
+                        )
+                        if llm_client is not None:
+                            llm_client.flush()
+                    else:
+                        code = 1
+            if code == 0:
+                update_memory(self.repo_root, run_date, week_label, plan_posts, draft_paths, user_cfg)
+                changes = save_manifest(self.repo_root, week_label, run_date.isoformat())
+        tracer.write_metrics(
+            weekly_dir / "run_metrics.json",
+            extra={
+                "week": week_label,
+                "run_date": run_date.isoformat(),
+                "exit_code": code,
+                "daemon": True,
+                "config_fingerprint": config_fingerprint(configs),
+                "gate_tiers": gate_tier_rates(tracer.counters),
+                "max_tokens": reservation_report(tracer.counters),
+            },
+        )
+        return {
+            "run_date": run_date.isoformat(),
+            "drafted_at": round(time.time(), 3),
+            "exit_code": code,
+            "plan": str(weekly_dir / "plan.md"),
+            "drafts": [str(p) for p in draft_paths] if code == 0 else [],
+            "changed": changes.get("changed", []) + changes.get("added", []),
+        }
+
+    def due_drafts(self, now: datetime) -> list[tuple[date, bool]]:
+        due = [(d, True) for d in pending_requests(self.repo_root)]
+        target = draft_target(now, float(self.daemon_cfg["draft_lead_hours"]))
+        label = iso_week_label(target)
+        if label not in self.status["weeks"] and all(iso_week_label(d) != label for d, _ in due):
+            if (self.repo_root / "weekly" / label / "run_metrics.json").exists():
+                self.status["weeks"][label] = {"run_date": target.isoformat(), "exit_code": 0, "external": True}
+            else:
+                due.append((target, False))
+        return due
+
+    def cycle(self, parse_pool: ProcessPoolExecutor) -> None:
+        if self.reload_if_changed():
+            print(f"Loaded configuration {config_fingerprint(self.configs)[:12]} from {self.repo_root / 'config'}")
+        if time.time() >= self.next_poll:
+            try:
+                self.heartbeat(last_poll=self.poll(parse_pool), last_error="")
+            except Exception as exc:
+                self.heartbeat(last_error=f"poll: {type(exc).__name__}: {exc}")
+                print(f"Warning: poll failed: {exc}")
+            self.next_poll = time.time() + float(self.daemon_cfg["poll_interval_seconds"])
+        for run_date, requested in self.due_drafts(datetime.now()):
+            label = iso_week_label(run_date)
+            self.heartbeat(busy={"week": label, "since": round(time.time(), 3)})
+            try:
+                self.status["weeks"][label] = self.draft_week(run_date)
+                print_summary(self.repo_root, label)
+            except Exception as exc:
+                self.status["weeks"][label] = {"run_date": run_date.isoformat(), "exit_code": 1, "error": str(exc)}
+                print(f"Warning: drafting {label} failed: {exc}")
+            finally:
+                if requested:
+                    clear_request(self.repo_root, run_date)
+                self.heartbeat(busy=None)
+        self.heartbeat()
+
+    def run(self, once: bool = False) -> int:
+        if daemon_alive(self.status) and self.status.get("pid") != os.getpid():
+            print(f"Error: a daemon is already running (pid {self.status.get('pid')}).")
+            return 1
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(sig, lambda *_: setattr(self, "stop", True))
+        self.reload_if_changed()
+        sources_cfg = self.configs["sources"]
+        parse_workers = int(sources_cfg.get("parse_workers", 0)) or (os.cpu_count() or 1)
+        self.heartbeat(started_at=round(time.time(), 3), busy=None)
+        with ProcessPoolExecutor(max_workers=parse_workers) as parse_pool:
+            while not self.stop:
+                self.cycle(parse_pool)
+                if once:
+                    break
+                deadline = time.time() + float(self.daemon_cfg["wake_interval_seconds"])
+                while not self.stop and time.time() < deadline:
+                    time.sleep(0.2)
+        self.status["pid"] = None
+        save_status(self.repo_root, self.status)
+        return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    repo_root = Path(args.root).resolve() if args.root else REPO_ROOT
+    if args.request:
+        run_date = resolve_run_date(args.run_date)
+        path = request_draft(repo_root, run_date)
+        if not daemon_alive(load_status(repo_root)):
+            print("Warning: no daemon is running; the request will be picked up when one starts.")
+        print(f"Requested drafting for {iso_week_label(run_date)}: {path}")
+        return 0
+    return Daemon(repo_root).run(once=args.once)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from src.common.artifacts import artifact_records, merge_artifact_records, reset_artifacts, save_manifest
+from src.common.budget import reservation_report
+from src.common.config import config_fingerprint, load_snapshot
+from src.common.io import read_yaml
+from src.common.llm import FairLLMPool
+from src.common.time_utils import iso_week_label, resolve_run_date
+from src.common.topic import Topic
+from src.common.tracing import incr, reset_tracer, span
+from src.evaluate.pipeline import gate_tier_rates
+from src.ingest.pipeline import feed_jobs, run_ingest
+from src.ingest.registry import load_registry, source_health
+from src.run_weekly import (
+    connect_llm,
+    draft_posts,
+    enrich_ranked,
+    load_configs,
+    managed_llm_server,
+    queue_hosted_drafts,
+    rank_and_plan,
+    refresh_backlog_arxiv,
+    update_memory,
+)
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the weekly pipeline for several author profiles at once")
+    parser.add_argument("--date", dest="run_date", help="Run date (YYYY-MM-DD). Defaults to today.")
+    parser.add_argument(
+        "--root",
+        dest="root",
+        help="Shared workspace root (shared config/, RAW ingest and model.yaml). Defaults to this checkout.",
+    )
+    parser.add_argument(
+        "--profiles",
+        help="YAML file listing profiles (name + workspace root). Defaults to <root>/config/profiles.yaml.",
+    )
+    parser.add_argument("--workers", type=int, default=0, help="Rank/plan worker processes (0 = one per profile).")
+    parser.add_argument("--trace-file", dest="trace_file", help="Optional Chrome-trace JSON output path.")
+    return parser.parse_args(argv)
+
+
+def load_profiles(path: Path, repo_root: Path) -> list[dict[str, Any]]:
+    cfg = read_yaml(path)
+    profiles = []
+    for item in cfg.get("profiles", []) or []:
+        name = str(item.get("name", "")).strip()
+        if not name:
+            continue
+        root = Path(str(item.get("root", ".")))
+        profiles.append({"name": name, "root": (root if root.is_absolute() else repo_root / root).resolve()})
+    if not profiles:
+        profiles.append({"name": "default", "root": repo_root})
+    return profiles
+
+
+def _dedupe(values: list[Any]) -> list[Any]:
+    seen: set[str] = set()
+    out = []
+    for v in values:
+        key = str(v)
+        if key not in seen:
+            seen.add(key)
+            out.append(v)
+    return out
+
+
+def union_sources(source_cfgs: list[dict[str, Any]]) -> dict[str, Any]:
+    arxiv = [c.get("arxiv", {}) for c in source_cfgs]
+    rss = [c.get("rss", {}) for c in source_cfgs]
+    standards = [c.get("standards", {}) for c in source_cfgs]
+    merged: dict[str, Any] = {
+        "fetch_timeout_seconds": max(float(c.get("fetch_timeout_seconds", 30)) for c in source_cfgs),
+        "arxiv": {
+            "enabled": any(a.get("enabled", True) for a in arxiv),
+            "queries": _dedupe([q for a in arxiv if a.get("enabled", True) for q in a.get("queries", [])]),
+            "max_results_per_query": max(int(a.get("max_results_per_query", 25)) for a in arxiv),
+        },
+        "rss": {
+            "enabled": any(r.get("enabled", True) for r in rss),
+            "feeds": _dedupe([f for r in rss if r.get("enabled", True) for f in r.get("feeds", [])]),
+        },
+        "standards": {
+            "enabled": any(s.get("enabled", True) for s in standards),
+            "items": [],
+        },
+    }
+    for key in ["fetch_concurrency", "parse_workers", "parse_queue_size"]:
+        values = [int(c[key]) for c in source_cfgs if key in c]
+        if values:
+            merged[key] = max(values)
+    for key in ["page_size", "request_interval_seconds", "overlap_days", "refresh_batch_size"]:
+        values = [a[key] for a in arxiv if key in a]
+        if values:
+            merged["arxiv"][key] = min(values) if key == "refresh_batch_size" else max(values)
+    merged["arxiv"]["refresh_backlog"] = any(a.get("refresh_backlog", False) for a in arxiv)
+    schedules = [c["schedule"] for c in source_cfgs if c.get("schedule")]
+    if schedules:
+        merged["schedule"] = schedules[0]
+    api_urls = _dedupe([a["api_url"] for a in arxiv if a.get("api_url")])
+    if api_urls:
+        merged["arxiv"]["api_url"] = api_urls[0]
+    seen_urls: set[str] = set()
+    for s in standards:
+        if not s.get("enabled", True):
+            continue
+        for item in s.get("items", []):
+            url = str(item.get("url", ""))
+            if url not in seen_urls:
+                seen_urls.add(url)
+                merged["standards"]["items"].append(item)
+    return merged
+
+
+def _profile_raw_paths(raw_paths: dict[str, str], sources_cfg: dict[str, Any]) -> list[Path]:
+    return [Path(path) for kind, path in raw_paths.items() if sources_cfg.get(kind, {}).get("enabled", True)]
+
+
+def _profile_sources(sources_cfg: dict[str, Any]) -> set[str]:
+    sources = {source for _, source in feed_jobs(sources_cfg)}
+    standards = sources_cfg.get("standards", {})
+    if standards.get("enabled", True):
+        sources.update(str(item.get("url", "")) for item in standards.get("items", []))
+    return sources
+
+
+def _rank_and_plan_job(
+    root: Path,
+    run_date: date,
+    week_label: str,
+    raw_paths: list[Path],
+    user_cfg: dict[str, Any],
+    health: list[dict[str, Any]],
+    sources: set[str],
+) -> tuple[list[Topic], list[dict[str, Any]], dict[str, float], dict[str, dict[str, Any]]]:
+    tracer = reset_tracer()
+    reset_artifacts()
+    ranked_topics, plan_posts = rank_and_plan(root, run_date, week_label, raw_paths, user_cfg, health, sources)
+    return ranked_topics, plan_posts, dict(tracer.counters), artifact_records()
+
+
+def _enrich_and_draft(
+    root: Path,
+    week_label: str,
+    result: tuple[list[Topic], list[dict[str, Any]]],
+    configs: dict[str, dict[str, Any]],
+    llm_client: Any,
+    enrich_cache: Path,
+) -> list[Path]:
+    ranked_topics, plan_posts = result
+    ranked_topics = enrich_ranked(root, week_label, ranked_topics, configs, llm_client, enrich_cache)
+    return draft_posts(root, week_label, plan_posts, ranked_topics, configs, llm_client)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    run_date = resolve_run_date(args.run_date)
+    week_label = iso_week_label(run_date)
+    repo_root = Path(args.root).resolve() if args.root else REPO_ROOT
+    tracer = reset_tracer()
+    reset_artifacts()
+
+    profiles_path = Path(args.profiles) if args.profiles else repo_root / "config" / "profiles.yaml"
+    profiles = load_profiles(profiles_path, repo_root)
+    configs = {p["name"]: load_configs(p["root"], fallback_root=repo_root) for p in profiles}
+    model_cfg = load_snapshot(repo_root)["model"]
+
+    with span("run.total", week=week_label, profiles=len(profiles)):
+        raw_dir = repo_root / "topics" / "RAW" / run_date.isoformat()
+        raw_dir.mkdir(parents=True, exist_ok=True)
+        shared_sources = union_sources([c["sources"] for c in configs.values()])
+        shared_user = {
+            "themes": _dedupe([t for c in configs.values() for t in c["user_profile"].get("themes", [])]),
+            "freshness_days": max(int(c["user_profile"].get("freshness_days", 14)) for c in configs.values()),
+        }
+        registry_path = repo_root / "state" / "source_registry.json"
+        with span("stage.ingest"):
+            raw_paths = run_ingest(str(raw_dir), run_date, shared_sources, shared_user, registry_path)
+        registry = load_registry(registry_path)
+        refresh_backlog_arxiv(
+            [p["root"] / "state" / "topic_backlog.json" for p in profiles],
+            shared_sources,
+            shared_user["themes"],
+            run_date,
+        )
+
+        results: dict[str, tuple[list[Topic], list[dict[str, Any]]]] = {}
+        workers = args.workers or len(profiles)
+        with span("stage.rank_plan", workers=workers):
+            with ProcessPoolExecutor(max_workers=max(1, min(workers, os.cpu_count() or 1))) as pool:
+                futures = {
+                    p["name"]: pool.submit(
+                        _rank_and_plan_job,
+                        p["root"],
+                        run_date,
+                        week_label,
+                        _profile_raw_paths(raw_paths, configs[p["name"]]["sources"]),
+                        configs[p["name"]]["user_profile"],
+                        source_health(registry, [url for _, url in feed_jobs(configs[p["name"]]["sources"])]),
+                        _profile_sources(configs[p["name"]]["sources"]),
+                    )
+                    for p in profiles
+                }
+                for name, future in futures.items():
+                    ranked_topics, plan_posts, counters, records = future.result()
+                    results[name] = (ranked_topics, plan_posts)
+                    for key, value in counters.items():
+                        incr(key, value)
+                    merge_artifact_records(records)
+
+        draft_paths: dict[str, list[Path]] = {}
+        enrich_cache = repo_root / "state" / "enrich_cache"
+        if model_cfg.get("runner_mode", "hosted") == "hosted":
+            for p in profiles:
+                ranked_topics, plan_posts = results[p["name"]]
+                ranked_topics = enrich_ranked(
+                    p["root"], week_label, ranked_topics, configs[p["name"]], None, enrich_cache
+                )
+                draft_paths[p["name"]] = queue_hosted_drafts(
+                    p["root"], repo_root, run_date, week_label, plan_posts, ranked_topics, model_cfg
+                )
+        else:
+            with managed_llm_server(repo_root, model_cfg):
+                llm_client, ok = connect_llm(model_cfg, repo_root / "state")
+                if not ok:
+                    return 1
+                llm_pool = FairLLMPool(llm_client, int(model_cfg.get("pool_concurrency", 8))) if llm_client else None
+                try:
+                    with ThreadPoolExecutor(max_workers=len(profiles)) as pool:
+                        futures = {
+                            p["name"]: pool.submit(
+                                _enrich_and_draft,
+                                p["root"],
+                                week_label,
+                                results[p["name"]],
+                                configs[p["name"]],
+                                llm_pool.client_for(p["name"]) if llm_pool else None,
+                                enrich_cache,
+                            )
+                            for p in profiles
+                        }
+                        for name, future in futures.items():
+                            draft_paths[name] = future.result()
+                finally:
+                    if llm_pool is not None:
+                        llm_pool.close()
+
+        for p in profiles:
+            update_memory(
+                p["root"],
+                run_date,
+                week_label,
+                results[p["name"]][1],
+                draft_paths[p["name"]],
+                configs[p["name"]]["user_profile"],
+            )
+            save_manifest(p["root"], week_label, run_date.isoformat())
+
+    tracer.write_metrics(
+        repo_root / "weekly" / week_label / "run_metrics.json",
+        extra={
+            "week": week_label,
+            "run_date": run_date.isoformat(),
+            "profiles": [p["name"] for p in profiles],
+            "config_fingerprints": {name: config_fingerprint(cfg) for name, cfg in configs.items()},
+            "gate_tiers": gate_tier_rates(tracer.counters),
+            "max_tokens": reservation_report(tracer.counters),
+        },
+    )
+    if args.trace_file:
+        tracer.write_chrome_trace(Path(args.trace_file))
+
+    print(f"Multi-profile pipeline complete for {week_label}")
+    for p in profiles:
+        print(f"- {p['name']}: {p['root'] / 'weekly' / week_label}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
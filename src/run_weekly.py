@@ -2,36 +2,78 @@ from __future__ import annotations
 
 import argparse
 import sys
-from datetime import date, datetime
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date
 from pathlib import Path
-from typing import Any
-
-from src.common.io import read_jsonl, read_yaml, write_json
-from src.common.llm import maybe_make_vllm_client
-from src.common.time_utils import iso_week_label
-from src.draft.pipeline import generate_draft, generate_references, write_draft_bundle
-from src.evaluate.pipeline import quality_gate
-from src.ingest.pipeline import run_ingest
+from typing import Any, Iterator
+
+from src.common.artifacts import (
+    changed_artifacts,
+    load_manifest,
+    reset_artifacts,
+    save_manifest,
+    write_json_artifact,
+    write_text_artifact,
+)
+from src.common.budget import reservation_report
+from src.common.config import ConfigError, config_fingerprint, load_snapshot
+from src.common.daemon import daemon_alive, load_status, request_draft, week_result
+from src.common.io import read_json, read_jsonl
+from src.common.jobs import enqueue_job, job_id, jobs_cfg, queue_dir
+from src.common.llm import ChatClient, LLMClient, LLMRouter, maybe_make_vllm_client
+from src.common.time_utils import iso_week_label, resolve_run_date
+from src.common.topic import Topic, write_topics
+from src.common.tracing import incr, reset_tracer, span
+from src.common.vllm_server import ServerManager
+from src.draft.pipeline import generate_draft, write_draft_bundle
+from src.draft.references import build_references
+from src.enrich.pipeline import enrich_topics
+from src.evaluate.pipeline import gate_tier_rates, quality_gate
+from src.ingest.pipeline import refresh_arxiv, run_ingest
+from src.ingest.registry import load_registry, source_health
+from src.memory.archive import index_week, open_archive
+from src.memory.digest import load_history
 from src.memory.pipeline import build_coverage_dashboard, update_content_log, update_topic_saturation
-from src.plan.pipeline import build_week_plan
+from src.plan.pipeline import build_horizon_plan
+from src.rank import backlog as topic_backlog
 from src.rank.pipeline import filter_and_rank
 
 
-def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Run weekly LinkedIn manager pipeline")
-    parser.add_argument("--date", dest="run_date", help="Run date (YYYY-MM-DD). Defaults to today.")
-    return parser.parse_args()
+HISTORY_WINDOW = 10
 
 
-def _resolve_run_date(raw: str | None) -> date:
-    if not raw:
-        return date.today()
-    return datetime.strptime(raw, "%Y-%m-%d").date()
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run weekly LinkedIn manager pipeline")
+    parser.add_argument("--date", dest="run_date", help="Run date (YYYY-MM-DD). Defaults to today.")
+    parser.add_argument(
+        "--trace-file",
+        dest="trace_file",
+        help="Optional path for a Chrome-trace JSON file (open in chrome://tracing or Perfetto).",
+    )
+    parser.add_argument(
+        "--root",
+        dest="root",
+        help="Workspace root holding config/, topics/, weekly/ and state/. Defaults to this checkout.",
+    )
+    parser.add_argument(
+        "--from-daemon",
+        action="store_true",
+        help="Reuse the week already drafted by a running daemon (or ask it to draft now) instead of a cold run.",
+    )
+    parser.add_argument(
+        "--daemon-wait",
+        type=float,
+        default=600.0,
+        help="Seconds to wait for the daemon to finish an on-demand draft before falling back to a full run.",
+    )
+    return parser.parse_args(argv)
 
 
-def _topic_by_id(topics: list[dict[str, Any]], topic_id: str) -> dict[str, Any] | None:
+def _topic_by_id(topics: list[Topic], topic_id: str) -> Topic | None:
     for t in topics:
-        if t.get("id") == topic_id:
+        if t.id == topic_id:
             return t
     return None
 
@@ -42,125 +84,341 @@ def _load_blacklist(path: Path) -> list[str]:
     return [line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
 
 
-def main() -> int:
-    args = parse_args()
-    run_date = _resolve_run_date(args.run_date)
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    run_date = resolve_run_date(args.run_date)
     week_label = iso_week_label(run_date)
+    repo_root = Path(args.root).resolve() if args.root else Path(__file__).resolve().parent.parent
+    if args.from_daemon and _wait_for_daemon(repo_root, run_date, week_label, args.daemon_wait):
+        print_summary(repo_root, week_label)
+        return 0
+    tracer = reset_tracer()
+    reset_artifacts()
+    try:
+        configs = load_configs(repo_root)
+    except ConfigError as exc:
+        print(f"Error: {exc}")
+        return 1
+    with span("run.total", week=week_label):
+        code = _run(repo_root, run_date, week_label, configs)
 
-    repo_root = Path(__file__).resolve().parent.parent
-    cfg_dir = repo_root / "config"
-    topics_dir = repo_root / "topics"
+    tracer.write_metrics(
+        repo_root / "weekly" / week_label / "run_metrics.json",
+        extra={
+            "week": week_label,
+            "run_date": run_date.isoformat(),
+            "exit_code": code,
+            "config_fingerprint": config_fingerprint(configs),
+            "gate_tiers": gate_tier_rates(tracer.counters),
+            "max_tokens": reservation_report(tracer.counters),
+        },
+    )
+    if args.trace_file:
+        tracer.write_chrome_trace(Path(args.trace_file))
+    return code
+
+
+def _wait_for_daemon(repo_root: Path, run_date: date, week_label: str, timeout: float) -> bool:
+    status = load_status(repo_root)
+    if week_result(status, week_label) is not None:
+        return True
+    if not daemon_alive(status):
+        print("No running daemon found; falling back to a full run.")
+        return False
+    request_draft(repo_root, run_date)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        time.sleep(1.0)
+        status = load_status(repo_root)
+        result = week_result(status, week_label)
+        if result is not None and float(result.get("drafted_at") or 0) >= deadline - timeout:
+            return True
+        if not daemon_alive(status):
+            break
+    print("Daemon did not finish drafting in time; falling back to a full run.")
+    return False
+
+
+def print_summary(repo_root: Path, week_label: str) -> None:
     weekly_dir = repo_root / "weekly" / week_label
-    state_dir = repo_root / "state"
+    print(f"Weekly pipeline complete for {week_label}")
+    print(f"Plan: {weekly_dir / 'plan.md'}")
+    print(f"Drafts: {weekly_dir / 'drafts'}")
+    print(f"Topics: {repo_root / 'topics' / week_label / 'filtered_topics.jsonl'}")
+    print(f"Metrics: {weekly_dir / 'run_metrics.json'}")
+    print(f"Manifest: {weekly_dir / 'manifest.json'}")
 
-    user_cfg = read_yaml(cfg_dir / "user_profile.yaml")
-    sources_cfg = read_yaml(cfg_dir / "sources.yaml")
-    model_cfg = read_yaml(cfg_dir / "model.yaml")
-    rubric_cfg = read_yaml(cfg_dir / "rubric.yaml")
 
-    raw_dir = topics_dir / "RAW" / run_date.isoformat()
-    raw_dir.mkdir(parents=True, exist_ok=True)
-    raw_paths = run_ingest(str(raw_dir), run_date, sources_cfg, user_cfg)
+def report_changes(changes: dict[str, Any]) -> None:
+    print(
+        f"Artifacts: {len(changes['changed'])} changed, {len(changes['added'])} added, "
+        f"{len(changes['removed'])} removed, {changes['unchanged']} unchanged"
+    )
+    for key in changes["changed"] + changes["added"]:
+        print(f"  {key}")
 
-    content_log_path = state_dir / "content_log.jsonl"
-    content_log = read_jsonl(content_log_path)
-
-    week_topics_dir = topics_dir / week_label
-    filtered_path = week_topics_dir / "filtered_topics.jsonl"
-    filter_report_path = week_topics_dir / "filter_report.md"
-
-    ranked_topics = filter_and_rank(
-        raw_paths=[Path(raw_paths["arxiv"]), Path(raw_paths["rss"]), Path(raw_paths["standards"])],
-        content_log=content_log,
-        user_cfg=user_cfg,
-        run_date=run_date,
-        out_topics_path=filtered_path,
-        report_path=filter_report_path,
+
+def load_configs(repo_root: Path, fallback_root: Path | None = None) -> dict[str, dict[str, Any]]:
+    return dict(load_snapshot(repo_root, fallback_root))
+
+
+def rank_topics(
+    repo_root: Path,
+    run_date: date,
+    raw_paths: list[Path],
+    user_cfg: dict[str, Any],
+    content_log: list[dict[str, Any]],
+    backlog: dict[str, Any],
+    out_dir: Path,
+    health: list[dict[str, Any]] | None = None,
+    sources: set[str] | None = None,
+) -> list[Topic]:
+    with span("stage.rank"), open_archive(repo_root / "state") as archive:
+        return filter_and_rank(
+            raw_paths=raw_paths,
+            content_log=content_log,
+            user_cfg=user_cfg,
+            run_date=run_date,
+            out_topics_path=out_dir / "filtered_topics.jsonl",
+            report_path=out_dir / "filter_report.md",
+            backlog=backlog,
+            source_health=health,
+            archive=archive if archive.count("draft") else None,
+            sources=sources,
+        )
+
+
+def rank_and_plan(
+    repo_root: Path,
+    run_date: date,
+    week_label: str,
+    raw_paths: list[Path],
+    user_cfg: dict[str, Any],
+    health: list[dict[str, Any]] | None = None,
+    sources: set[str] | None = None,
+) -> tuple[list[Topic], list[dict[str, Any]]]:
+    state_dir = repo_root / "state"
+    content_log = read_jsonl(state_dir / "content_log.jsonl")
+    backlog_path = state_dir / "topic_backlog.json"
+    backlog = topic_backlog.load_backlog(backlog_path)
+    ranked_topics = rank_topics(
+        repo_root,
+        run_date,
+        raw_paths,
+        user_cfg,
+        content_log,
+        backlog,
+        repo_root / "topics" / week_label,
+        health,
+        sources,
     )
 
-    plan_path = weekly_dir / "plan.md"
-    plan_posts = build_week_plan(
-        week_label=week_label,
-        run_date=run_date,
-        topics=ranked_topics,
-        user_cfg=user_cfg,
-        content_log=content_log,
-        out_path=plan_path,
+    with span("stage.plan"):
+        plan_posts, upcoming = build_horizon_plan(
+            week_label=week_label,
+            run_date=run_date,
+            topics=ranked_topics,
+            user_cfg=user_cfg,
+            content_log=content_log,
+            out_path=repo_root / "weekly" / week_label / "plan.md",
+            topic_saturation=read_json(state_dir / "topic_saturation.json", default={}),
+            reserved_ids=topic_backlog.reserved_ids(backlog),
+        )
+        reservations = {week_label: [str(p["topic_id"]) for p in plan_posts]}
+        for label, week_posts in upcoming.items():
+            reservations[label] = [str(p["topic_id"]) for p in week_posts]
+        topic_backlog.set_reservations(backlog, reservations)
+        topic_backlog.save_backlog(backlog_path, backlog)
+
+    return ranked_topics, plan_posts
+
+
+def refresh_backlog_arxiv(
+    backlog_paths: list[Path],
+    sources_cfg: dict[str, Any],
+    themes: list[str],
+    run_date: date,
+) -> None:
+    if not sources_cfg.get("arxiv", {}).get("refresh_backlog", False):
+        return
+    backlogs = {path: topic_backlog.load_backlog(path) for path in backlog_paths}
+    ids = [t_id for b in backlogs.values() for t_id in topic_backlog.arxiv_ids(b)]
+    if not ids:
+        return
+    with span("stage.arxiv_refresh", ids=len(ids)) as attrs:
+        rows = refresh_arxiv(ids, sources_cfg, themes, run_date)
+        updated = 0
+        for path, b in backlogs.items():
+            changed = topic_backlog.apply_refresh(b, rows)
+            if changed:
+                topic_backlog.save_backlog(path, b)
+            updated += changed
+        attrs["updated"] = updated
+        incr("ingest.arxiv_refreshed", updated)
+
+
+def enrich_ranked(
+    repo_root: Path,
+    week_label: str,
+    ranked_topics: list[Topic],
+    configs: dict[str, dict[str, Any]],
+    llm_client: ChatClient | None,
+    cache_dir: Path | None = None,
+) -> list[Topic]:
+    enrich_cfg = configs["sources"].get("enrich") or {}
+    if not enrich_cfg.get("enabled", False):
+        return ranked_topics
+    with span("stage.enrich"):
+        enriched = enrich_topics(
+            ranked_topics,
+            enrich_cfg,
+            cache_dir or repo_root / "state" / "enrich_cache",
+            llm_client=llm_client,
+            model_cfg=configs["model"],
+        )
+    write_topics(repo_root / "topics" / week_label / "filtered_topics.jsonl", enriched, "enrich")
+    return enriched
+
+
+def write_hosted_placeholders(drafts_dir: Path, plan_posts: list[dict[str, Any]]) -> list[Path]:
+    draft_paths: list[Path] = []
+    for post in plan_posts:
+        post_index = int(post["post_index"])
+        placeholder = drafts_dir / f"post_{post_index:02d}.md"
+        write_text_artifact(
+            placeholder,
+            "Hosted mode placeholder.\n\n"
+            "Draft generation is intended for local or self-hosted runs.\n",
+            "hosted",
+        )
+        write_json_artifact(
+            drafts_dir / f"post_{post_index:02d}.references.json",
+            {
+                "sources": [],
+                "evidence": [],
+                "confidence": "low",
+                "risk_flags": ["hosted_mode_no_draft_generation"],
+            },
+            "hosted",
+        )
+        write_json_artifact(
+            drafts_dir / f"post_{post_index:02d}_score.json",
+            {
+                "scores": {
+                    "systems_strategic": 0,
+                    "technical_rigor": 0,
+                    "clarity": 0,
+                    "novelty": 0,
+                },
+                "passed": False,
+                "fail_reasons": ["hosted_mode_placeholder"],
+                "revision_count": 0,
+            },
+            "hosted",
+        )
+        draft_paths.append(placeholder)
+    return draft_paths
+
+
+def queue_hosted_drafts(
+    repo_root: Path,
+    queue_root: Path,
+    run_date: date,
+    week_label: str,
+    plan_posts: list[dict[str, Any]],
+    ranked_topics: list[Topic],
+    model_cfg: dict[str, Any],
+) -> list[Path]:
+    draft_paths = write_hosted_placeholders(repo_root / "weekly" / week_label / "drafts", plan_posts)
+    if not plan_posts or not jobs_cfg(model_cfg)["enabled"]:
+        return draft_paths
+    path = enqueue_job(
+        queue_dir(queue_root, model_cfg),
+        {
+            "id": job_id(repo_root, week_label),
+            "root": str(repo_root.resolve()),
+            "run_date": run_date.isoformat(),
+            "week": week_label,
+            "plan_posts": plan_posts,
+            "topics": [t.to_dict() for t in ranked_topics],
+        },
     )
+    incr("jobs.enqueued")
+    print(f"Queued drafting for a self-hosted worker: {path}")
+    return draft_paths
+
 
-    drafts_dir = weekly_dir / "drafts"
+def connect_llm(
+    model_cfg: dict[str, Any], state_dir: Path | None = None
+) -> tuple[LLMClient | LLMRouter | None, bool]:
+    llm_client = maybe_make_vllm_client(model_cfg, state_dir)
+    llm_available = bool(llm_client and llm_client.healthcheck())
+    if llm_client and not llm_available:
+        if bool(model_cfg.get("require_live_llm", False)):
+            print("Error: vLLM endpoint unavailable and require_live_llm=true.")
+            return None, False
+        print("Warning: vLLM endpoint unavailable; using deterministic fallback for this run.")
+        llm_client = None
+    return llm_client, True
+
+
+@contextmanager
+def managed_llm_server(repo_root: Path, model_cfg: dict[str, Any]) -> Iterator[None]:
+    backend = str(model_cfg.get("backend", "")).lower()
+    if backend != "vllm" or not bool(model_cfg.get("manage_server", False)):
+        yield
+        return
+    manager = ServerManager(model_cfg, repo_root / "state")
+    try:
+        manager.ensure()
+    except RuntimeError as exc:
+        print(f"Warning: {exc}")
+        yield
+        return
+    with manager.lease():
+        yield
+
+
+def draft_posts(
+    repo_root: Path,
+    week_label: str,
+    plan_posts: list[dict[str, Any]],
+    ranked_topics: list[Topic],
+    configs: dict[str, dict[str, Any]],
+    llm_client: ChatClient | None,
+    workers: int = 1,
+) -> list[Path]:
+    user_cfg = configs["user_profile"]
+    model_cfg = configs["model"]
+    drafts_dir = repo_root / "weekly" / week_label / "drafts"
     tone = user_cfg.get("tone", ["direct", "evaluative", "non-hype"])
-    history_texts = []
-    for rec in content_log[-10:]:
-        dpath = repo_root / rec.get("draft_path", "")
-        if dpath.exists():
-            history_texts.append(dpath.read_text(encoding="utf-8"))
+    content_log = read_jsonl(repo_root / "state" / "content_log.jsonl")
+    history = load_history(repo_root / "state" / "history_digest.jsonl", content_log, HISTORY_WINDOW, repo_root)
 
-    blacklist = _load_blacklist(state_dir / "phrase_blacklist.txt")
-    draft_paths: list[Path] = []
+    blacklist = _load_blacklist(repo_root / "state" / "phrase_blacklist.txt")
+    planned = []
+    for post in plan_posts:
+        topic = _topic_by_id(ranked_topics, post.get("topic_id", ""))
+        if topic is not None:
+            planned.append((post, topic))
+    with span("stage.references", posts=len(planned)):
+        all_references = build_references([topic for _, topic in planned], llm_client, model_cfg)
 
-    runner_mode = model_cfg.get("runner_mode", "hosted")
-    if runner_mode == "hosted":
-        drafts_dir.mkdir(parents=True, exist_ok=True)
-        for post in plan_posts:
-            post_index = int(post["post_index"])
-            placeholder = drafts_dir / f"post_{post_index:02d}.md"
-            placeholder.write_text(
-                "Hosted mode placeholder.\n\n"
-                "Draft generation is intended for local or self-hosted runs.\n",
-                encoding="utf-8",
-            )
-            write_json(
-                drafts_dir / f"post_{post_index:02d}.references.json",
-                {
-                    "sources": [],
-                    "evidence": [],
-                    "confidence": "low",
-                    "risk_flags": ["hosted_mode_no_draft_generation"],
-                },
-            )
-            write_json(
-                drafts_dir / f"post_{post_index:02d}_score.json",
-                {
-                    "scores": {
-                        "systems_strategic": 0,
-                        "technical_rigor": 0,
-                        "clarity": 0,
-                        "novelty": 0,
-                    },
-                    "passed": False,
-                    "fail_reasons": ["hosted_mode_placeholder"],
-                    "revision_count": 0,
-                },
-            )
-            draft_paths.append(placeholder)
-    else:
-        llm_client = maybe_make_vllm_client(model_cfg)
-        llm_available = bool(llm_client and llm_client.healthcheck())
-        if llm_client and not llm_available:
-            if bool(model_cfg.get("require_live_llm", False)):
-                print("Error: vLLM endpoint unavailable and require_live_llm=true.")
-                return 1
-            print("Warning: vLLM endpoint unavailable; using deterministic fallback for this run.")
-            llm_client = None
-
-        for post in plan_posts:
-            topic = _topic_by_id(ranked_topics, post.get("topic_id", ""))
-            if topic is None:
-                continue
-
-            draft_text = generate_draft(
-                post_spec=post,
-                topic=topic,
-                tone=tone,
-                llm_client=llm_client,
-                model_cfg=model_cfg,
-            )
-            references = generate_references(
-                topic=topic,
-                llm_client=llm_client,
-                model_cfg=model_cfg,
-            )
+    with open_archive(repo_root / "state") as archive:
+        known = archive if archive.count("draft") else None
+        if known is not None and workers > 1:
+            known.warm()
+
+        def draft_one(item: tuple[tuple[dict[str, Any], Topic], dict[str, Any]]) -> Path:
+            (post, topic), references = item
+            with span("stage.draft", post=int(post["post_index"])):
+                draft_text = generate_draft(
+                    post_spec=post,
+                    topic=topic,
+                    tone=tone,
+                    llm_client=llm_client,
+                    model_cfg=model_cfg,
+                )
             draft_path, _ = write_draft_bundle(
                 out_dir=drafts_dir,
                 post_index=int(post["post_index"]),
@@ -168,38 +426,116 @@ def main() -> int:
                 references=references,
             )
 
-            quality_gate(
-                draft_path=draft_path,
-                references=references,
-                rubric_cfg=rubric_cfg,
-                blacklist_phrases=blacklist,
-                history_texts=history_texts,
-                llm_client=llm_client,
-                model_cfg=model_cfg,
-                max_revisions=2,
-            )
-            draft_paths.append(draft_path)
-
-    update_content_log(
-        content_log_path=content_log_path,
-        run_date=run_date,
-        week_label=week_label,
-        plan_posts=plan_posts,
-        draft_paths=draft_paths,
-        phrase_blacklist=blacklist,
+            with span("stage.gate", post=int(post["post_index"])):
+                quality_gate(
+                    draft_path=draft_path,
+                    references=references,
+                    rubric_cfg=configs["rubric"],
+                    blacklist_phrases=blacklist,
+                    history=history,
+                    llm_client=llm_client,
+                    model_cfg=model_cfg,
+                    max_revisions=2,
+                    archive=known,
+                    archive_key=str(draft_path.resolve().relative_to(repo_root.resolve())),
+                )
+            return draft_path
+
+        items = list(zip(planned, all_references))
+        if workers > 1 and len(items) > 1:
+            with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+                draft_paths = list(pool.map(draft_one, items))
+        else:
+            draft_paths = [draft_one(item) for item in items]
+    return draft_paths
+
+
+def update_memory(
+    repo_root: Path,
+    run_date: date,
+    week_label: str,
+    plan_posts: list[dict[str, Any]],
+    draft_paths: list[Path],
+    user_cfg: dict[str, Any],
+) -> None:
+    state_dir = repo_root / "state"
+    content_log_path = state_dir / "content_log.jsonl"
+    topics_path = repo_root / "topics" / week_label / "filtered_topics.jsonl"
+    previous = load_manifest(repo_root, week_label)
+    changed = set(changed_artifacts(repo_root, [repo_root / "weekly" / week_label / "plan.md", *draft_paths], previous))
+    if previous and not changed:
+        incr("memory.skipped_unchanged")
+        return
+    with span("stage.memory"):
+        update_content_log(
+            content_log_path=content_log_path,
+            run_date=run_date,
+            week_label=week_label,
+            plan_posts=plan_posts,
+            draft_paths=draft_paths,
+            phrase_blacklist=_load_blacklist(state_dir / "phrase_blacklist.txt"),
+            digest_path=state_dir / "history_digest.jsonl",
+            history_window=HISTORY_WINDOW,
+        )
+        update_topic_saturation(state_dir / "topic_saturation.json", plan_posts)
+        build_coverage_dashboard(
+            dashboard_path=state_dir / "coverage_dashboard.md",
+            content_log_path=content_log_path,
+            allocations=user_cfg.get("pillars_allocation", {}),
+            topic_saturation_path=state_dir / "topic_saturation.json",
+        )
+    with span("stage.archive_index") as attrs, open_archive(state_dir) as archive:
+        attrs["added"] = index_week(
+            archive,
+            repo_root,
+            week_label,
+            [p for p in draft_paths if p in changed],
+            topics=bool(changed_artifacts(repo_root, [topics_path], previous)),
+        )
+
+
+def _run(repo_root: Path, run_date: date, week_label: str, configs: dict[str, dict[str, Any]]) -> int:
+    user_cfg = configs["user_profile"]
+    model_cfg = configs["model"]
+
+    raw_dir = repo_root / "topics" / "RAW" / run_date.isoformat()
+    raw_dir.mkdir(parents=True, exist_ok=True)
+    registry_path = repo_root / "state" / "source_registry.json"
+    with span("stage.ingest"):
+        raw_paths = run_ingest(str(raw_dir), run_date, configs["sources"], user_cfg, registry_path)
+    refresh_backlog_arxiv(
+        [repo_root / "state" / "topic_backlog.json"], configs["sources"], user_cfg.get("themes", []), run_date
     )
-    update_topic_saturation(state_dir / "topic_saturation.json", plan_posts)
-    build_coverage_dashboard(
-        dashboard_path=state_dir / "coverage_dashboard.md",
-        content_log_path=content_log_path,
-        allocations=user_cfg.get("pillars_allocation", {}),
-        topic_saturation_path=state_dir / "topic_saturation.json",
+
+    ranked_topics, plan_posts = rank_and_plan(
+        repo_root,
+        run_date,
+        week_label,
+        [Path(raw_paths["arxiv"]), Path(raw_paths["rss"]), Path(raw_paths["standards"])],
+        user_cfg,
+        source_health(load_registry(registry_path)),
     )
 
-    print(f"Weekly pipeline complete for {week_label}")
-    print(f"Plan: {plan_path}")
-    print(f"Drafts: {drafts_dir}")
-    print(f"Topics: {filtered_path}")
+    runner_mode = model_cfg.get("runner_mode", "hosted")
+    if runner_mode == "hosted":
+        ranked_topics = enrich_ranked(repo_root, week_label, ranked_topics, configs, None)
+        draft_paths = queue_hosted_drafts(
+            repo_root, repo_root, run_date, week_label, plan_posts, ranked_topics, model_cfg
+        )
+    else:
+        with managed_llm_server(repo_root, model_cfg):
+            llm_client, ok = connect_llm(model_cfg, repo_root / "state")
+            if not ok:
+                return 1
+            ranked_topics = enrich_ranked(repo_root, week_label, ranked_topics, configs, llm_client)
+            draft_paths = draft_posts(repo_root, week_label, plan_posts, ranked_topics, configs, llm_client)
+            if llm_client is not None:
+                llm_client.flush()
+
+    update_memory(repo_root, run_date, week_label, plan_posts, draft_paths, user_cfg)
+    report_changes(save_manifest(repo_root, week_label, run_date.isoformat()))
+
+    print_summary(repo_root, week_label)
     return 0
 
 
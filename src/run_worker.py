@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import argparse
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from src.common.artifacts import reset_artifacts, save_manifest
+from src.common.budget import reservation_report
+from src.common.config import config_fingerprint, load_snapshot
+from src.common.jobs import claim_jobs, finish_job, jobs_cfg, queue_counts, queue_dir, requeue_stale
+from src.common.llm import FairLLMPool, TenantLLMClient
+from src.common.topic import Topic
+from src.common.tracing import incr, reset_tracer, span
+from src.evaluate.pipeline import gate_tier_rates
+from src.memory.archive import index_week, open_archive
+from src.memory.pipeline import build_coverage_dashboard, drop_draft_records, update_content_log
+from src.run_weekly import (
+    HISTORY_WINDOW,
+    _load_blacklist,
+    connect_llm,
+    draft_posts,
+    load_configs,
+    managed_llm_server,
+)
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+_memory_lock = threading.Lock()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Drain drafting jobs queued by hosted runs on a self-hosted LLM box")
+    parser.add_argument("--root", dest="root", help="Worker root holding config/model.yaml. Defaults to this checkout.")
+    parser.add_argument("--watch", action="store_true", help="Keep polling for new jobs instead of exiting when idle.")
+    parser.add_argument("--poll-interval", type=float, default=30.0, help="Seconds between queue polls with --watch.")
+    parser.add_argument("--batch", type=int, default=0, help="Jobs drafted concurrently (0 = jobs.batch_size).")
+    parser.add_argument("--trace-file", dest="trace_file", help="Optional Chrome-trace JSON output path.")
+    return parser.parse_args(argv)
+
+
+def job_root(job: dict[str, Any], fallback: Path) -> Path:
+    root = Path(str(job.get("root") or ""))
+    return root if (root / "config").is_dir() else fallback
+
+
+def refresh_memory(root: Path, job: dict[str, Any], draft_paths: list[Path], user_cfg: dict[str, Any]) -> None:
+    state_dir = root / "state"
+    content_log_path = state_dir / "content_log.jsonl"
+    digest_path = state_dir / "history_digest.jsonl"
+    keys = set()
+    for path in draft_paths:
+        try:
+            keys.add(str(path.resolve().relative_to(root.resolve())))
+        except ValueError:
+            keys.add(str(path))
+    with span("stage.memory"):
+        drop_draft_records([content_log_path, digest_path], keys)
+        update_content_log(
+            content_log_path=content_log_path,
+            run_date=date.fromisoformat(job["run_date"]),
+            week_label=job["week"],
+            plan_posts=job["plan_posts"],
+            draft_paths=draft_paths,
+            phrase_blacklist=_load_blacklist(state_dir / "phrase_blacklist.txt"),
+            digest_path=digest_path,
+            history_window=HISTORY_WINDOW,
+        )
+        build_coverage_dashboard(
+            dashboard_path=state_dir / "coverage_dashboard.md",
+            content_log_path=content_log_path,
+            allocations=user_cfg.get("pillars_allocation", {}),
+            topic_saturation_path=state_dir / "topic_saturation.json",
+        )
+    with span("stage.archive_index") as attrs, open_archive(state_dir) as archive:
+        attrs["added"] = index_week(archive, root, job["week"], draft_paths)
+
+
+def run_job(
+    job: dict[str, Any],
+    worker_root: Path,
+    model_cfg: dict[str, Any],
+    llm_client: TenantLLMClient,
+    draft_workers: int,
+) -> list[Path]:
+    root = job_root(job, worker_root)
+    configs = load_configs(root, fallback_root=worker_root)
+    configs["model"] = model_cfg
+    week_label = job["week"]
+    with span("worker.job", job=job["id"], posts=len(job["plan_posts"])):
+        topics = [Topic.from_dict(row) for row in job["topics"]]
+        draft_paths = draft_posts(
+            root, week_label, job["plan_posts"], topics, configs, llm_client, workers=draft_workers
+        )
+        with _memory_lock:
+            refresh_memory(root, job, draft_paths, configs["user_profile"])
+            save_manifest(root, week_label, job["run_date"])
+    return draft_paths
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    repo_root = Path(args.root).resolve() if args.root else REPO_ROOT
+    snapshot = load_snapshot(repo_root)
+    model_cfg = snapshot["model"]
+    cfg = jobs_cfg(model_cfg)
+    qdir = queue_dir(repo_root, model_cfg)
+    batch = max(1, args.batch or int(cfg["batch_size"]))
+    lease = float(cfg["lease_seconds"])
+    requeue_stale(qdir, lease)
+    if not args.watch and not queue_counts(qdir)["pending"]:
+        print(f"No queued jobs in {qdir}")
+        return 0
+
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    tracer = reset_tracer()
+    reset_artifacts()
+    code = 0
+    with span("worker.total"), managed_llm_server(repo_root, model_cfg):
+        llm_client, ok = connect_llm(model_cfg, repo_root / "state")
+        if not ok or llm_client is None:
+            print("Error: no live LLM endpoint; leaving jobs queued.")
+            return 1
+        pool = FairLLMPool(llm_client, int(model_cfg.get("pool_concurrency", 8)))
+        try:
+            while not stop.is_set():
+                jobs = claim_jobs(qdir, batch, lease)
+                if not jobs:
+                    if not args.watch:
+                        break
+                    stop.wait(args.poll_interval)
+                    continue
+                with span("worker.batch", jobs=len(jobs)), ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+                    futures = [
+                        (
+                            job,
+                            executor.submit(
+                                run_job,
+                                job,
+                                repo_root,
+                                model_cfg,
+                                pool.client_for(job["id"]),
+                                int(cfg["draft_workers"]),
+                            ),
+                        )
+                        for job in jobs
+                    ]
+                    for job, future in futures:
+                        try:
+                            draft_paths = future.result()
+                            error = ""
+                        except Exception as exc:
+                            draft_paths = []
+                            error = f"{type(exc).__name__}: {exc}"
+                        state = finish_job(qdir, job, error, int(cfg["max_attempts"]))
+                        incr(f"jobs.{state}")
+                        if error:
+                            print(f"Warning: job {job['id']} failed ({state}): {error}")
+                            code = 1 if state == "failed" else code
+                        else:
+                            print(f"Drafted {len(draft_paths)} posts for {job['id']}: {job_root(job, repo_root)}")
+        finally:
+            pool.close()
+
+    tracer.write_metrics(
+        qdir / "worker_metrics.json",
+        extra={
+            "finished_at": round(time.time(), 3),
+            "exit_code": code,
+            "config_fingerprint": config_fingerprint(snapshot),
+            "queue": queue_counts(qdir),
+            "gate_tiers": gate_tier_rates(tracer.counters),
+            "max_tokens": reservation_report(tracer.counters),
+        },
+    )
+    if args.trace_file:
+        tracer.write_chrome_trace(Path(args.trace_file))
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
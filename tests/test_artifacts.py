@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from src.common.artifacts import (
+    load_manifest,
+    reset_artifacts,
+    save_manifest,
+    write_jsonl_artifact,
+    write_text_artifact,
+)
+from src.common.tracing import reset_tracer
+
+
+def test_unchanged_artifact_is_not_rewritten(tmp_path: Path) -> None:
+    reset_artifacts()
+    tracer = reset_tracer()
+    path = tmp_path / "weekly" / "2026-W08" / "plan.md"
+    assert write_text_artifact(path, "plan\n", "plan")
+    mtime = path.stat().st_mtime_ns
+    assert not write_text_artifact(path, "plan\n", "plan")
+    assert path.stat().st_mtime_ns == mtime
+    assert tracer.counters == {"artifacts.written": 1, "artifacts.unchanged": 1}
+
+
+def test_manifest_covers_raw_ingest_and_skips_other_weeks(tmp_path: Path) -> None:
+    reset_artifacts()
+    write_jsonl_artifact(tmp_path / "topics" / "RAW" / "2026-02-16" / "rss.jsonl", [{"id": "a"}], "ingest")
+    write_jsonl_artifact(tmp_path / "topics" / "2026-W08" / "filtered_topics.jsonl", [{"id": "a"}], "rank")
+    write_jsonl_artifact(tmp_path / "topics" / "2026-W07" / "filtered_topics.jsonl", [{"id": "b"}], "rank")
+    changes = save_manifest(tmp_path, "2026-W08", "2026-02-16")
+    artifacts = load_manifest(tmp_path, "2026-W08")
+    assert sorted(artifacts) == ["topics/2026-W08/filtered_topics.jsonl", "topics/RAW/2026-02-16/rss.jsonl"]
+    assert artifacts["topics/RAW/2026-02-16/rss.jsonl"]["stage"] == "ingest"
+    assert changes["added"] == sorted(artifacts)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from datetime import date
+
+from src.common.topic import Topic
+from src.rank.backlog import apply_refresh, candidates, empty_backlog, merge_topics
+
+
+RUN_DATE = date(2026, 2, 16)
+
+
+def _topic(topic_id: str, composite: float) -> Topic:
+    return Topic.from_dict(
+        {
+            "id": topic_id,
+            "title": topic_id,
+            "url": "https://arxiv.org/abs/2602.00001v1",
+            "source_type": "arxiv",
+            "published_at": "2026-02-09",
+            "scores": {"composite": composite},
+        }
+    )
+
+
+def test_candidates_decay_scores_and_hide_backlog_bookkeeping() -> None:
+    backlog = empty_backlog()
+    merge_topics(backlog, [_topic("arxiv:2602.00001v1", 0.8), _topic("arxiv:2602.00002v1", 0.5)], RUN_DATE)
+    apply_refresh(backlog, [{"id": "arxiv:2602.00001v2", "title": "revised"}])
+    assert backlog["topics"]["arxiv:2602.00001v1"]["backlog"] == {"first_seen": "2026-02-16"}
+
+    ranked = candidates(backlog, RUN_DATE, half_life_days=7)
+    assert [row["id"] for row in ranked] == ["arxiv:2602.00001v1", "arxiv:2602.00002v1"]
+    assert ranked[0]["title"] == "revised"
+    assert ranked[0]["scores"] == {"composite": 0.4, "base_composite": 0.8, "age_days": 7}
+    for row in ranked:
+        assert "backlog" not in row and "arxiv_version" not in row
+        published = Topic.from_dict(row).to_dict()
+        assert "backlog" not in published and "arxiv_version" not in published
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import pytest
+import requests
+
+from benchmarks.llm_stub import LLMStubServer, start_llm_stub
+from src.common import llm
+from src.common.concurrency import AIMDController, metrics_url_for, parse_prometheus
+from src.common.llm import LLMClient
+from src.common.tracing import reset_tracer
+
+
+CALL = {"system_prompt": "s", "user_prompt": "u", "temperature": 0.0, "max_tokens": 64}
+
+
+def _client(server: LLMStubServer, **concurrency: Any) -> LLMClient:
+    cfg = {"adaptive": True, "use_server_metrics": False, **concurrency}
+    return LLMClient({"api_base": server.base_url, "model_name": "stub", "max_retries": 0, "concurrency": cfg})
+
+
+def _call(client: LLMClient) -> bool:
+    try:
+        return bool(client.chat_completion(**CALL))
+    except requests.HTTPError:
+        return False
+
+
+def _run(client: LLMClient, calls: int, threads: int) -> list[bool]:
+    with ThreadPoolExecutor(threads) as pool:
+        return list(pool.map(lambda _: _call(client), range(calls)))
+
+
+def _stop(server: LLMStubServer) -> None:
+    server.shutdown()
+    server.server_close()
+
+
+def test_parse_prometheus_sums_labelled_series() -> None:
+    text = '# HELP x\nvllm:num_requests_waiting{model_name="a"} 2\nvllm:num_requests_waiting{model_name="b"} 3\nbad\n'
+    assert parse_prometheus(text) == {"vllm:num_requests_waiting": 5.0}
+    assert metrics_url_for("http://127.0.0.1:8000/v1/") == "http://127.0.0.1:8000/metrics"
+
+
+def test_limit_grows_additively_while_healthy() -> None:
+    tracer = reset_tracer()
+    server = start_llm_stub(ttft_ms=5, per_token_ms=0.0, max_batch=16)
+    try:
+        client = _client(server, initial=2, max=6, ttft_tolerance=50.0)
+        assert all(_run(client, 60, 8))
+    finally:
+        _stop(server)
+    assert client.controller is not None
+    assert int(client.controller.limit) == 6
+    assert 2 < server.stats()["peak_active"] <= 6
+    assert tracer.counters["llm.aimd.increases"] > 0
+    assert "llm.aimd.decreases" not in tracer.counters
+
+
+def test_limit_backs_off_on_ttft_spike() -> None:
+    server = start_llm_stub(ttft_ms=5, per_token_ms=0.0)
+    try:
+        client = _client(server, initial=8, max=8, decrease_factor=0.5, ttft_tolerance=3.0)
+        assert all(_run(client, 5, 1))
+        assert client.controller is not None and int(client.controller.limit) == 8
+        server.ttft_ms = 100
+        assert _call(client)
+    finally:
+        _stop(server)
+    assert int(client.controller.limit) == 4
+    assert client.controller.baselines["chat"] < 50
+
+
+def test_limit_backs_off_on_overload_errors() -> None:
+    tracer = reset_tracer()
+    server = start_llm_stub(ttft_ms=1, per_token_ms=0.0, fail_every=3)
+    try:
+        client = _client(server, initial=8, min=2, max=8, max_error_rate=0.1, ttft_tolerance=50.0)
+        results = _run(client, 15, 1)
+    finally:
+        _stop(server)
+    assert results.count(False) == 5
+    assert client.controller is not None
+    assert int(client.controller.limit) == 2
+    assert tracer.counters["llm.aimd.decreases"] >= 2
+
+
+def test_limit_backs_off_on_server_queue() -> None:
+    server = start_llm_stub(ttft_ms=30, per_token_ms=0.0, max_batch=1)
+    try:
+        client = _client(
+            server,
+            initial=6,
+            max=6,
+            max_queue=1,
+            ttft_tolerance=50.0,
+            use_server_metrics=True,
+            metrics_interval_seconds=0,
+        )
+        assert all(_run(client, 12, 6))
+    finally:
+        _stop(server)
+    assert client.controller is not None
+    assert int(client.controller.limit) < 6
+    assert client.controller.summary()["server_metrics"]
+    assert "vllm:num_requests_waiting" in client.controller.server
+
+
+def test_stale_epoch_does_not_decrease_twice() -> None:
+    controller = AIMDController({"initial": 8, "max": 8, "use_server_metrics": False, "max_error_rate": 0.0})
+    first = controller.acquire()
+    second = controller.acquire()
+    controller.release(first, "chat", None, False, True)
+    controller.release(second, "chat", None, False, True)
+    assert int(controller.limit) == 4
+    assert controller.epoch == 1
+
+
+def test_unreadable_stream_is_not_counted_as_success(monkeypatch: pytest.MonkeyPatch) -> None:
+    def malformed(resp: requests.Response) -> Any:
+        return json.loads("data: {not json")
+
+    monkeypatch.setattr(llm, "_read_stream", malformed)
+    server = start_llm_stub(ttft_ms=1, per_token_ms=0.0)
+    try:
+        client = _client(server, initial=4, max=4)
+        with pytest.raises(json.JSONDecodeError):
+            client.chat_completion(**CALL)
+    finally:
+        _stop(server)
+    assert client.controller is not None
+    assert client.controller.inflight == 0
+    assert True not in client.controller.outcomes
+    assert not client.controller.baselines
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import json
+import pickle
+import shutil
+from pathlib import Path
+
+import pytest
+import yaml
+
+from src.common import config
+from src.common.structured import STRUCTURED_OUTPUT_MODES
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+DOCUMENTED_MODES = ["json_schema", "guided_json", "json_object"]
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    shutil.copytree(REPO_ROOT / "config", tmp_path / "config")
+    config.clear_snapshot_cache()
+    yield tmp_path
+    config.clear_snapshot_cache()
+
+
+def _set_model(root: Path, **values: object) -> None:
+    path = root / "config" / "model.yaml"
+    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    data.update(values)
+    path.write_text(yaml.safe_dump(data), encoding="utf-8")
+
+
+def test_shipped_configs_validate(workspace: Path) -> None:
+    configs = config.load_snapshot(workspace)
+    assert set(configs) == set(config.CONFIG_NAMES)
+
+
+def test_documented_modes_match_structured_output() -> None:
+    readme = (REPO_ROOT / "README.md").read_text(encoding="utf-8")
+    assert set(DOCUMENTED_MODES) == set(STRUCTURED_OUTPUT_MODES)
+    assert all(f"`{mode}`" in readme for mode in DOCUMENTED_MODES)
+
+
+@pytest.mark.parametrize("mode", DOCUMENTED_MODES)
+def test_structured_output_modes_validate(workspace: Path, mode: str) -> None:
+    _set_model(workspace, structured_output=mode)
+    assert config.load_snapshot(workspace)["model"]["structured_output"] == mode
+
+
+def test_unknown_and_mistyped_keys_are_all_reported(workspace: Path) -> None:
+    _set_model(workspace, structured_output="xml", timeout_secs=3, max_retries="two")
+    with pytest.raises(config.ConfigError) as exc:
+        config.load_snapshot(workspace)
+    text = str(exc.value)
+    assert "structured_output: expected one of" in text
+    assert "timeout_secs: unknown key (did you mean 'timeout_seconds'?)" in text
+    assert "max_retries: expected int, got str" in text
+
+
+def test_routing_must_reference_defined_tiers() -> None:
+    problems = config.validate("model", {"routing": {"tiers": {"small": {}}, "call_types": {"score": "tiny"}}})
+    assert any("routing.call_types.score: undefined tier 'tiny'" in p for p in problems)
+    assert any("routing.default_tier: undefined tier 'large'" in p for p in problems)
+
+
+def test_snapshot_is_read_only_and_picklable(workspace: Path) -> None:
+    configs = config.load_snapshot(workspace)
+    with pytest.raises(TypeError):
+        configs["model"]["api_base"] = "http://elsewhere"
+    assert isinstance(configs["sources"]["rss"]["feeds"], tuple)
+    restored = pickle.loads(pickle.dumps(configs))
+    assert config.config_fingerprint(restored) == config.config_fingerprint(configs)
+
+
+def test_fingerprint_ignores_formatting(workspace: Path) -> None:
+    before = config.config_fingerprint(config.load_snapshot(workspace))
+    path = workspace / "config" / "rubric.yaml"
+    path.write_text("# comment\n" + path.read_text(encoding="utf-8"), encoding="utf-8")
+    config.clear_snapshot_cache()
+    assert config.config_fingerprint(config.load_snapshot(workspace)) == before
+
+
+def test_disk_cache_is_json_and_keyed_by_content(workspace: Path) -> None:
+    first = config.load_snapshot(workspace)
+    cache = workspace / "state" / config.CACHE_FILE
+    cached = json.loads(cache.read_text(encoding="utf-8"))
+    config.clear_snapshot_cache()
+    assert config.load_snapshot(workspace) == first
+
+    cache.write_text(json.dumps({"key": "stale", "configs": {**cached["configs"], "model": {}}}), encoding="utf-8")
+    config.clear_snapshot_cache()
+    assert config.load_snapshot(workspace) == first
+
+    _set_model(workspace, timeout_seconds=5)
+    config.clear_snapshot_cache()
+    assert config.load_snapshot(workspace)["model"]["timeout_seconds"] == 5
+
+
+def test_corrupt_cache_is_ignored(workspace: Path) -> None:
+    cache = workspace / "state" / config.CACHE_FILE
+    cache.parent.mkdir(parents=True)
+    cache.write_bytes(b"\x80\x04not json")
+    assert config.load_snapshot(workspace)["model"]["backend"] == "vllm"
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import functools
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+from src.common.topic import Topic
+from src.common.tracing import reset_tracer
+from src.enrich.pipeline import enrich_topics, extract_main_text, heuristic_enrichment
+
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "enrich"
+ENRICH_CFG = {"enabled": True, "top_k": 10, "fetch_concurrency": 4, "fetch_timeout_seconds": 5, "use_llm": False}
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+@pytest.fixture
+def fixture_server() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_QuietHandler, directory=str(FIXTURES)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _topic(topic_id: str, url: str) -> Topic:
+    return Topic.from_dict({"id": topic_id, "title": topic_id, "summary": "Short feed summary.", "url": url})
+
+
+def test_extract_main_text_prefers_article_body() -> None:
+    text = extract_main_text((FIXTURES / "article.html").read_text(encoding="utf-8"), 20000)
+    assert text.startswith("Tool-use agents on long-horizon help desk tasks")
+    assert "42% of multi-step tickets" in text
+    for boilerplate in ("newsletter", "banner", "Related reading", "Copyright"):
+        assert boilerplate not in text
+
+
+def test_extract_main_text_uses_arxiv_abstract() -> None:
+    text = extract_main_text((FIXTURES / "arxiv_abs.html").read_text(encoding="utf-8"), 20000)
+    assert text.startswith("We introduce a verifier")
+    assert "Comments:" not in text
+    assert extract_main_text((FIXTURES / "arxiv_abs.html").read_text(encoding="utf-8"), 40) == text[:40]
+
+
+def test_heuristic_enrichment_finds_claims_why_and_risks() -> None:
+    result = heuristic_enrichment(extract_main_text((FIXTURES / "article.html").read_text(encoding="utf-8"), 20000))
+    assert len(result["key_claims"]) == 1
+    assert result["key_claims"][0].endswith("42% of multi-step tickets when each step is checked by a verifier.")
+    assert result["why_it_matters"].startswith("This matters for teams")
+    assert result["risk_notes"].startswith("The main limitation")
+
+
+def test_enrich_topics_fetches_top_k_and_caches(fixture_server: str, tmp_path: Path) -> None:
+    topics = [
+        _topic("article", f"{fixture_server}/article.html"),
+        _topic("abstract", f"{fixture_server}/arxiv_abs.html"),
+        _topic("missing", f"{fixture_server}/missing.html"),
+        _topic("offline", "urn:not-fetched"),
+        _topic("beyond_k", f"{fixture_server}/article.html"),
+    ]
+    cfg = {**ENRICH_CFG, "top_k": 4}
+    tracer = reset_tracer()
+    enriched = enrich_topics(topics, cfg, tmp_path / "cache")
+    by_id = {t.id: t for t in enriched}
+
+    assert [t.id for t in enriched] == [t.id for t in topics]
+    assert by_id["article"].key_claims and by_id["article"].risk_notes
+    assert by_id["article"].extra["enrichment"]["mode"] == "heuristic"
+    assert by_id["abstract"].key_claims[0].startswith("We introduce a verifier")
+    for untouched in ("missing", "offline", "beyond_k"):
+        assert by_id[untouched] is topics[[t.id for t in topics].index(untouched)]
+    assert tracer.counters["enrich.cache_misses"] == 2
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 2
+
+    tracer = reset_tracer()
+    again = enrich_topics(topics, cfg, tmp_path / "cache")
+    assert tracer.counters["enrich.cache_hits"] == 2
+    assert "enrich.cache_misses" not in tracer.counters
+    assert [t.key_claims for t in again] == [t.key_claims for t in enriched]
+
+
+def test_cache_is_bounded(fixture_server: str, tmp_path: Path) -> None:
+    topics = [_topic("article", f"{fixture_server}/article.html"), _topic("abs", f"{fixture_server}/arxiv_abs.html")]
+    tracer = reset_tracer()
+    enrich_topics(topics, {**ENRICH_CFG, "cache_max_entries": 1}, tmp_path / "cache")
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 1
+    assert tracer.counters["enrich.evicted"] == 1
+
+
+def test_disabled_stage_returns_topics_unchanged(tmp_path: Path) -> None:
+    topics = [_topic("article", "http://127.0.0.1:9/article.html")]
+    assert enrich_topics(topics, {**ENRICH_CFG, "enabled": False}, tmp_path / "cache") is topics
+    assert not (tmp_path / "cache").exists()
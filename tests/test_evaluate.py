@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from typing import Any, Iterator
+
+import pytest
+
+from benchmarks.llm_stub import STUB_DRAFT, STUB_JSON, LLMStubServer, start_llm_stub
+from src.common.llm import LLMClient
+from src.evaluate.pipeline import _gate_tier, score_draft_with_llm, score_sections_with_llm
+
+
+RUBRIC = {"thresholds": {"systems_strategic": 4, "technical_rigor": 4, "clarity": 3, "novelty": 3}}
+MODEL_CFG = {"model_name": "stub", "max_retries": 0}
+
+
+@pytest.fixture
+def stub() -> Iterator[LLMStubServer]:
+    server = start_llm_stub(ttft_ms=1, per_token_ms=0.0)
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _judge(server: LLMStubServer, passes: bool, reasons: list[str]) -> None:
+    server.stub_json = {**STUB_JSON, "pass_fail": {"passes": passes, "reasons": reasons}}
+
+
+def _previous(fail_reasons: list[str]) -> dict[str, Any]:
+    return {
+        "scores": dict(STUB_JSON["scores"]),
+        "hard_gates": dict(STUB_JSON["hard_gates"]),
+        "passed": False,
+        "fail_reasons": fail_reasons,
+    }
+
+
+def _rescore(server: LLMStubServer, previous: dict[str, Any]) -> dict[str, Any]:
+    return score_sections_with_llm(
+        draft_text=STUB_DRAFT,
+        changed={"hook"},
+        previous=previous,
+        references={},
+        rubric_cfg=RUBRIC,
+        blacklist_phrases=[],
+        history=[],
+        llm_client=LLMClient({**MODEL_CFG, "api_base": server.base_url}),
+        model_cfg=MODEL_CFG,
+    )
+
+
+def test_section_rescore_respects_judge_verdict(stub: LLMStubServer) -> None:
+    _judge(stub, False, [])
+    result = _rescore(stub, _previous([]))
+    assert not result["passed"]
+    assert result["rechecked"]["sections"] == ["hook"]
+
+    _judge(stub, True, [])
+    assert _rescore(stub, _previous([]))["passed"]
+
+
+def test_section_rescore_keeps_failures_in_unchanged_sections(stub: LLMStubServer) -> None:
+    _judge(stub, True, [])
+    result = _rescore(stub, _previous(["technical anchor lacks a mechanism"]))
+    assert not result["passed"]
+    assert result["fail_reasons"] == ["technical anchor lacks a mechanism"]
+
+
+def test_section_rescore_matches_full_scorer_rule(stub: LLMStubServer) -> None:
+    client = LLMClient({**MODEL_CFG, "api_base": stub.base_url})
+    for passes in (True, False):
+        _judge(stub, passes, [])
+        full = score_draft_with_llm(STUB_DRAFT, {}, RUBRIC, [], [], client, MODEL_CFG)
+        assert full["passed"] is passes
+        assert _rescore(stub, _previous([]))["passed"] is passes
+
+
+def test_tiered_gate_is_opt_in() -> None:
+    clean = {"passed": True, "fail_reasons": [], "scores": {"systems_strategic": 5, "technical_rigor": 5}}
+    rejected = {"passed": False, "fail_reasons": ["blacklist_phrase_detected"], "scores": {}}
+    tiered = {**RUBRIC, "tiered_gate": {"enabled": True, "heuristic_pass_margin": 1}}
+    assert _gate_tier(clean, RUBRIC, True) == "llm"
+    assert _gate_tier(rejected, RUBRIC, True) == "llm"
+    assert _gate_tier(clean, tiered, True) == "heuristic_pass"
+    assert _gate_tier(rejected, tiered, True) == "heuristic_reject"
+    assert _gate_tier(clean, RUBRIC, False) == "heuristic"
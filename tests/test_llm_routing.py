@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import socket
+import time
+from typing import Iterator
+
+import pytest
+import requests
+
+from benchmarks.llm_stub import LLMStubServer, start_llm_stub
+from src.common.llm import FairLLMPool, LLMClient, LLMRouter
+from src.common.tracing import reset_tracer
+
+
+CALL = {"system_prompt": "s", "user_prompt": "u", "temperature": 0.0, "max_tokens": 64}
+
+
+def _dead_url() -> str:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{sock.getsockname()[1]}/v1"
+
+
+@pytest.fixture
+def stubs() -> Iterator[list[LLMStubServer]]:
+    servers = [start_llm_stub(ttft_ms=1, per_token_ms=0.0) for _ in range(2)]
+    try:
+        yield servers
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+
+def _router(tiers: dict[str, list[str]], call_types: dict[str, str] | None = None) -> LLMRouter:
+    cfg = {
+        "model_name": "stub",
+        "max_retries": 0,
+        "timeout_seconds": 5,
+        "routing": {
+            "default_tier": "large",
+            "escalate_to": "large",
+            "call_types": call_types or {},
+            "tiers": {name: {"endpoints": urls} for name, urls in tiers.items()},
+        },
+    }
+    return LLMRouter(cfg, seed=7)
+
+
+def test_router_spreads_calls_across_healthy_endpoints(stubs: list[LLMStubServer]) -> None:
+    router = _router({"large": [s.base_url for s in stubs]})
+    for _ in range(20):
+        assert router.chat_completion(**CALL)
+    served = [s.stats()["requests_served"] for s in stubs]
+    assert sum(served) == 20
+    assert all(served)
+
+
+def test_router_fails_over_and_marks_endpoint_down(stubs: list[LLMStubServer]) -> None:
+    tracer = reset_tracer()
+    router = _router({"large": [_dead_url(), stubs[0].base_url]})
+    for _ in range(5):
+        assert router.chat_completion(**CALL)
+    assert stubs[0].stats()["requests_served"] == 5
+    assert tracer.counters["llm.router.failovers"] == 1
+    dead, live = router.stats()["large"]
+    assert dead["down"] and dead["failures"] == 1
+    assert not live["down"] and live["latency_ms"] > 0
+
+
+def test_router_falls_back_from_small_tier_to_default(stubs: list[LLMStubServer]) -> None:
+    tracer = reset_tracer()
+    router = _router({"small": [_dead_url()], "large": [stubs[1].base_url]}, {"score": "small"})
+    assert router.escalates("score")
+    assert router.chat_completion(call_type="score", **CALL)
+    assert stubs[1].stats()["requests_served"] == 1
+    assert tracer.counters["llm.router.tier_fallbacks"] == 1
+    assert tracer.counters["llm.tier.large.calls"] == 1
+
+
+def test_router_does_not_fail_over_on_client_errors(stubs: list[LLMStubServer]) -> None:
+    router = _router({"large": [f"{s.base_url}/missing" for s in stubs]})
+    with pytest.raises(requests.HTTPError):
+        router.chat_completion(**CALL)
+    assert not any(ep["down"] or ep["failures"] for ep in router.stats()["large"])
+
+
+def test_fair_pool_round_robins_between_tenants() -> None:
+    server = start_llm_stub(ttft_ms=50, per_token_ms=0.0)
+    pool = FairLLMPool(LLMClient({"api_base": server.base_url, "model_name": "stub"}), max_concurrency=1)
+    order: list[str] = []
+    try:
+        futures = []
+        for tenant, count in (("busy", 6), ("quiet", 2)):
+            for _ in range(count):
+                future = pool.submit(tenant, dict(CALL))
+                future.add_done_callback(lambda _, tenant=tenant: order.append(tenant))
+                futures.append(future)
+                while not server.received:
+                    time.sleep(0.001)
+        for future in futures:
+            assert future.result(timeout=30)
+    finally:
+        pool.close()
+        server.shutdown()
+        server.server_close()
+    assert order == ["busy", "busy", "quiet", "busy", "quiet", "busy", "busy", "busy"]
+
+
+def test_fair_pool_tenant_client_propagates_errors_and_rejects_after_close() -> None:
+    pool = FairLLMPool(LLMClient({"api_base": _dead_url(), "model_name": "stub", "max_retries": 0}), max_concurrency=2)
+    client = pool.client_for("profile-a")
+    with pytest.raises(requests.ConnectionError):
+        client.chat_completion(**CALL)
+    pool.close()
+    with pytest.raises(RuntimeError, match="closed"):
+        pool.submit("profile-a", dict(CALL))
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import Any
+
+from src.ingest.registry import _new_record, empty_registry, plan_fetches
+
+
+NOW = 1_700_000_000.0
+QUIET = "https://quiet.example/feed"
+FAILING = "https://down.example/feed"
+FRESH = "https://fresh.example/feed"
+JOBS = [("rss", QUIET), ("rss", FAILING), ("rss", FRESH)]
+
+
+def _registry() -> dict[str, Any]:
+    registry = empty_registry()
+    quiet = _new_record("rss", QUIET, NOW - 86400)
+    quiet.update({"last_success_at": NOW - 3600, "churn_per_day": 0.5, "etag": '"v1"'})
+    failing = _new_record("rss", FAILING, NOW - 86400)
+    failing.update({"last_attempt_at": NOW - 60, "error_streak": 2, "last_error": "HTTPError"})
+    registry["sources"] = {QUIET: quiet, FAILING: failing}
+    return registry
+
+
+def test_schedule_off_fetches_everything_unconditionally() -> None:
+    for cfg in ({}, {"enabled": False}):
+        registry = _registry()
+        due, opts, skipped = plan_fetches(JOBS, registry, cfg, NOW, 30.0)
+        assert due == JOBS
+        assert not skipped
+        assert all(o == {"timeout": 30.0, "headers": {}} for o in opts.values())
+        assert registry["sources"][QUIET]["skips"] == 0
+
+
+def test_schedule_on_skips_quiet_and_backed_off_feeds() -> None:
+    registry = _registry()
+    due, opts, skipped = plan_fetches(JOBS, registry, {"enabled": True}, NOW, 30.0)
+    assert due == [("rss", FRESH)]
+    assert {s["url"]: s["skipped"] for s in skipped} == {QUIET: "not_due", FAILING: "backoff"}
+    assert registry["sources"][QUIET]["skips"] == 1
+
+    due, opts, _ = plan_fetches(JOBS, registry, {"enabled": True}, NOW + 3 * 86400, 30.0)
+    assert due == [("rss", FRESH), ("rss", QUIET), ("rss", FAILING)]
+    assert opts[QUIET]["headers"] == {"If-None-Match": '"v1"'}
+    assert opts[FAILING]["timeout"] == 5.0
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import socket
+import sys
+from pathlib import Path
+
+import pytest
+
+from benchmarks.llm_stub import start_llm_stub
+from src.common.vllm_server import ServerManager, _pid_alive
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _manager(state_dir: Path, port: int, command: list[str], idle_shutdown: int = 0) -> ServerManager:
+    cfg = {
+        "api_base": f"http://127.0.0.1:{port}/v1",
+        "model_name": "stub",
+        "server_command": command,
+        "startup_timeout_seconds": 30,
+        "idle_shutdown_seconds": idle_shutdown,
+        "auto_select_gpus": False,
+    }
+    return ServerManager(cfg, state_dir)
+
+
+def _stub_command(port: int) -> list[str]:
+    return [sys.executable, "-m", "benchmarks.llm_stub", "--port", str(port), "--ttft-ms", "1"]
+
+
+def test_start_probe_reuse_and_stop(tmp_path: Path) -> None:
+    port = _free_port()
+    manager = _manager(tmp_path, port, _stub_command(port))
+    try:
+        record = manager.ensure(warm_up=False)
+        pid = int(record["pid"])
+        assert _pid_alive(pid)
+        assert record["ready_at"] >= record["started_at"]
+        assert manager.probe()
+
+        again = _manager(tmp_path, port, _stub_command(port)).ensure(warm_up=False)
+        assert again["pid"] == pid
+    finally:
+        stopped = manager.stop()
+    assert stopped
+    assert not _pid_alive(pid)
+    assert not manager.registry_path.exists()
+    assert not manager.probe(timeout=1.0)
+    assert not manager.stop()
+
+
+def test_watchdog_stops_idle_server(tmp_path: Path) -> None:
+    port = _free_port()
+    manager = _manager(tmp_path, port, _stub_command(port))
+    pid = int(manager.ensure(warm_up=False)["pid"])
+    try:
+        with manager.lease():
+            assert manager.active_leases() == 1
+        assert manager.active_leases() == 0
+        manager.watchdog(poll_seconds=0.05)
+        assert not _pid_alive(pid)
+        assert not manager.registry_path.exists()
+    finally:
+        manager.stop()
+
+
+def test_external_server_is_used_without_spawning(tmp_path: Path) -> None:
+    stub = start_llm_stub(ttft_ms=1.0, per_token_ms=0.0)
+    try:
+        port = stub.server_address[1]
+        manager = _manager(tmp_path, port, [sys.executable, "-c", "raise SystemExit(1)"])
+        assert manager.ensure(warm_up=False) == {"external": True, "api_base": manager.api_base}
+        assert not manager.registry_path.exists()
+        manager.warm_up(["system prompt"])
+        assert stub.stats()["requests_served"] == 2
+    finally:
+        stub.shutdown()
+        stub.server_close()
+
+
+def test_server_exiting_during_startup_raises(tmp_path: Path) -> None:
+    manager = _manager(tmp_path, _free_port(), [sys.executable, "-c", "raise SystemExit(3)"])
+    with pytest.raises(RuntimeError, match="exited during startup"):
+        manager.ensure(warm_up=False)
+    assert not manager.registry_path.exists()